@@ -7,9 +7,36 @@
 
 import bpy
 import re
-import math
-from mathutils import Matrix
+import sys
+import importlib
 from bpy.types import Operator, Panel
+from bpy_extras.io_utils import ExportHelper
+from bpy.app.handlers import persistent
+from .modal import ModalJobMixin, run_job
+from .instrumentation import instrument_operator, is_instrumentation_enabled, get_timing_log_path, timing_records, get_addon_preferences
+
+# Functions of the submodules holding the actual work, reachable as attributes of this package (used by
+# batch.py and the benchmarks). Only the module owning a requested name is imported, on first use.
+_LAZY_ATTRIBUTES = {
+    "get_frame_number_from_path": "footage", "index_image_sequence": "footage", "clear_sequence_index_cache": "footage",
+    "get_intrinsics": "lens",
+    "get_tracking_world_matrix": "reconstruction", "get_camera_path": "reconstruction", "clear_camera_path_cache": "reconstruction",
+    "setup_camera_solver": "solvers",
+    "markers_to_empty": "markers", "sync_track_empties": "markers",
+    "create_projection_node_group": "projection", "get_projection_node_group": "projection", "setup_projection": "projection",
+    "create_image_plane": "image_plane", "setup_image_plane_drivers": "image_plane", "bake_image_plane_animation": "image_plane",
+    "export_markers": "export", "export_camera_solve": "export",
+    "batch_scene_setup": "scene_setup",
+    "analyze_solve": "solve_analysis",
+    "compute_st_map": "distortion_map",
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module_name}", __name__), name)
+
 
 # --- Helper Functions ---
 
@@ -18,98 +45,84 @@ def is_clip_editor_with_active_clip(context):
     space = context.space_data
     return space and space.type == 'CLIP_EDITOR' and space.clip is not None
 
-def get_frame_number_from_path(filepath):
-    """Extracts the frame number sequence from the end of a filepath string."""
-    if not filepath:
-        return None
-    # This regex specifically looks for a number sequence right before the file extension.
-    match = re.search(r'(\d+)\.\w+$', filepath)
-    return int(match.group(1)) if match else None
-
-def create_projection_node_group(camera_obj):
-    """
-    Creates a shader node group for camera projection.
-    If a group for the given camera already exists, it will be replaced.
-    """
-    group_name = f"Camera Project | {camera_obj.name}"
-    if group_name in bpy.data.node_groups:
-        bpy.data.node_groups.remove(bpy.data.node_groups[group_name])
-        
-    group = bpy.data.node_groups.new(name=group_name, type='ShaderNodeTree')
-    group.interface.new_socket(name="Vector", in_out="OUTPUT", socket_type='NodeSocketVector')
-    
-    nodes = group.nodes
-    links = group.links
-    
-    # Node layout columns
-    col1, col2, col3, col4, col5, col6, col7, col8 = -600, -400, -200, 0, 250, 500, 750, 950
-
-    # Node creation (Layout remains improved for readability)
-    tex_coord = nodes.new("ShaderNodeTexCoord"); tex_coord.label = "Camera Transform"; tex_coord.location = (col1, 200); tex_coord.object = camera_obj
-    val_lens = nodes.new("ShaderNodeValue"); val_lens.label = "Lens"; val_lens.location = (col1, 0)
-    val_sensor = nodes.new("ShaderNodeValue"); val_sensor.label = "Sensor Width"; val_sensor.location = (col1, -150)
-    val_shift_x = nodes.new("ShaderNodeValue"); val_shift_x.label = "Lens Shift X"; val_shift_x.location = (col1, -300)
-    val_shift_y = nodes.new("ShaderNodeValue"); val_shift_y.label = "Lens Shift Y"; val_shift_y.location = (col1, -450)
-    val_resolution = nodes.new("ShaderNodeValue"); val_resolution.label = "Resolution"; val_resolution.location = (col1, -600)
-    sep_xyz_persp = nodes.new("ShaderNodeSeparateXYZ"); sep_xyz_persp.label = "Perspective 1"; sep_xyz_persp.location = (col2, 200)
-    math_zoom1 = nodes.new("ShaderNodeMath"); math_zoom1.label = "Zoom 1"; math_zoom1.operation = 'DIVIDE'; math_zoom1.location = (col2, 0)
-    combo_shift1 = nodes.new("ShaderNodeCombineXYZ"); combo_shift1.label = "Lens Shift 1"; combo_shift1.location = (col2, -300)
-    math_aspect_div = nodes.new("ShaderNodeMath"); math_aspect_div.label = "Divide"; math_aspect_div.operation = 'DIVIDE'; math_aspect_div.inputs[0].default_value = 1.0; math_aspect_div.location = (col2, -600)
-    math_persp2 = nodes.new("ShaderNodeMath"); math_persp2.label = "Perspective 2"; math_persp2.operation = 'DIVIDE'; math_persp2.location = (col3, 250)
-    math_persp3 = nodes.new("ShaderNodeMath"); math_persp3.label = "Perspective 3"; math_persp3.operation = 'DIVIDE'; math_persp3.location = (col3, 100)
-    math_zoom2 = nodes.new("ShaderNodeMath"); math_zoom2.label = "Zoom 2"; math_zoom2.operation = 'MULTIPLY'; math_zoom2.inputs[1].default_value = -1.0; math_zoom2.location = (col3, 0)
-    combo_persp4 = nodes.new("ShaderNodeCombineXYZ"); combo_persp4.label = "Perspective 4"; combo_persp4.location = (col4, 150)
-    math_aspect_lt = nodes.new("ShaderNodeMath"); math_aspect_lt.label = "Less Than"; math_aspect_lt.operation = 'LESS_THAN'; math_aspect_lt.inputs[1].default_value = 1.0; math_aspect_lt.location = (col4, -450)
-    combo_aspect1 = nodes.new("ShaderNodeCombineXYZ"); combo_aspect1.label = "Aspect Ratio 1"; combo_aspect1.inputs[0].default_value = 1.0; combo_aspect1.location = (col4, -600)
-    combo_aspect2 = nodes.new("ShaderNodeCombineXYZ"); combo_aspect2.label = "Aspect Ratio 2"; combo_aspect2.inputs[1].default_value = 1.0; combo_aspect2.location = (col4, -750)
-    mix_aspect_switch = nodes.new("ShaderNodeMix"); mix_aspect_switch.label = "Aspect Ratio Switch"; mix_aspect_switch.data_type = 'RGBA'; mix_aspect_switch.location = (col5, -600)
-    vec_math_zoom3 = nodes.new("ShaderNodeVectorMath"); vec_math_zoom3.label = "Zoom 3"; vec_math_zoom3.operation = 'MULTIPLY'; vec_math_zoom3.location = (col5, 150)
-    vec_math_shift2 = nodes.new("ShaderNodeVectorMath"); vec_math_shift2.label = "Lens Shift 2"; vec_math_shift2.operation = 'SUBTRACT'; vec_math_shift2.location = (col6, 100)
-    vec_math_user_transforms = nodes.new("ShaderNodeVectorMath"); vec_math_user_transforms.label = "User Transforms"; vec_math_user_transforms.operation = 'MULTIPLY'; vec_math_user_transforms.location = (col7, 0)
-    vec_math_recenter = nodes.new("ShaderNodeVectorMath"); vec_math_recenter.label = "Recenter"; vec_math_recenter.operation = 'ADD'; vec_math_recenter.inputs[1].default_value = (0.5, 0.5, 0.0); vec_math_recenter.location = (col8, 0)
-    output_node = nodes.new('NodeGroupOutput'); output_node.location = (col8 + 200, 0)
-    
-    # Linking nodes
-    links.new(tex_coord.outputs['Object'], sep_xyz_persp.inputs['Vector']); links.new(sep_xyz_persp.outputs['X'], math_persp2.inputs[0]); links.new(sep_xyz_persp.outputs['Y'], math_persp3.inputs[0]); links.new(sep_xyz_persp.outputs['Z'], math_persp2.inputs[1]); links.new(sep_xyz_persp.outputs['Z'], math_persp3.inputs[1]); links.new(sep_xyz_persp.outputs['Z'], combo_persp4.inputs['Z']); links.new(math_persp2.outputs['Value'], combo_persp4.inputs['X']); links.new(math_persp3.outputs['Value'], combo_persp4.inputs['Y']); links.new(val_lens.outputs['Value'], math_zoom1.inputs[0]); links.new(val_sensor.outputs['Value'], math_zoom1.inputs[1]); links.new(math_zoom1.outputs['Value'], math_zoom2.inputs[0]); links.new(val_shift_x.outputs['Value'], combo_shift1.inputs['X']); links.new(val_shift_y.outputs['Value'], combo_shift1.inputs['Y']); links.new(val_resolution.outputs['Value'], math_aspect_div.inputs[1]); links.new(val_resolution.outputs['Value'], math_aspect_lt.inputs[0]); links.new(val_resolution.outputs['Value'], combo_aspect1.inputs['Y']); links.new(combo_persp4.outputs['Vector'], vec_math_zoom3.inputs[0]); links.new(math_zoom2.outputs['Value'], vec_math_zoom3.inputs[1]); links.new(math_aspect_div.outputs['Value'], combo_aspect2.inputs['X']); links.new(vec_math_zoom3.outputs['Vector'], vec_math_shift2.inputs[0]); links.new(combo_shift1.outputs['Vector'], vec_math_shift2.inputs[1]); links.new(math_aspect_lt.outputs['Value'], mix_aspect_switch.inputs[0]); links.new(combo_aspect1.outputs['Vector'], mix_aspect_switch.inputs[6]); links.new(combo_aspect2.outputs['Vector'], mix_aspect_switch.inputs[7]); links.new(mix_aspect_switch.outputs[2], vec_math_user_transforms.inputs[1]); links.new(vec_math_shift2.outputs['Vector'], vec_math_user_transforms.inputs[0]); links.new(vec_math_user_transforms.outputs['Vector'], vec_math_recenter.inputs[0]); links.new(vec_math_recenter.outputs['Vector'], output_node.inputs['Vector'])
-    
-    value_nodes_to_drive = {"lens": val_lens, "sensor": val_sensor, "shift_x": val_shift_x, "shift_y": val_shift_y, "resolution": val_resolution}
-    setup_drivers_for_group(value_nodes_to_drive, camera_obj)
-    
-    return group
-
-def setup_drivers_for_group(nodes_to_drive, camera_obj):
-    """Sets up drivers for the value nodes within the projection node group. (Original Logic)"""
-    def add_driver(node, data_path):
-        driver = node.outputs[0].driver_add('default_value').driver
-        var = driver.variables.new()
-        var.name = "var"
-        var.targets[0].id_type = 'CAMERA'
-        var.targets[0].id = camera_obj.data
-        var.targets[0].data_path = data_path
-        driver.expression = "var"
-        
-    add_driver(nodes_to_drive["lens"], "lens")
-    add_driver(nodes_to_drive["sensor"], "sensor_width")
-    add_driver(nodes_to_drive["shift_x"], "shift_x")
-    add_driver(nodes_to_drive["shift_y"], "shift_y")
-    
-    res_driver = nodes_to_drive["resolution"].outputs[0].driver_add('default_value').driver
-    res_driver.expression = "res_x / res_y if res_y != 0 else 1.0"
-    
-    var_x = res_driver.variables.new()
-    var_x.name = "res_x"
-    var_x.targets[0].id_type = 'SCENE'
-    var_x.targets[0].id = bpy.context.scene
-    var_x.targets[0].data_path = "render.resolution_x"
-    
-    var_y = res_driver.variables.new()
-    var_y.name = "res_y"
-    var_y.targets[0].id_type = 'SCENE'
-    var_y.targets[0].id = bpy.context.scene
-    var_y.targets[0].data_path = "render.resolution_y"
+def apply_viewport_proxy(scene):
+    """Switches Clip Tools materials to the scene's viewport plate resolution unless it is Full."""
+    if scene.clip_tools_proxy_resolution != 'FULL':
+        from .proxies import apply_proxy_resolution
+        apply_proxy_resolution(scene.clip_tools_proxy_resolution)
+
+def get_proxy_build_status(clip):
+    """Status of a running proxy build for the clip, or None; does not import the proxies module."""
+    proxies = sys.modules.get(f"{__name__}.proxies")
+    status = proxies.proxy_builds.get(clip.name) if proxies else None
+    return status if status and status["running"] else None
+
+def update_proxy_resolution(self, context):
+    from .proxies import apply_proxy_resolution
+    apply_proxy_resolution(self.clip_tools_proxy_resolution)
+
+# Final renders always use the full resolution plates; the viewport resolution is restored when the render
+# completes or is cancelled, before the file is saved mid-render and when a file saved that way is loaded.
+_rendering_scenes = set()
+
+@persistent
+def use_full_resolution_for_render(scene, *args):
+    if scene.clip_tools_proxy_resolution != 'FULL':
+        from .proxies import apply_proxy_resolution
+        _rendering_scenes.add(scene.name)
+        try:
+            apply_proxy_resolution('FULL')
+        except Exception:
+            restore_viewport_resolution(scene)
+            raise
+
+@persistent
+def restore_viewport_resolution(scene, *args):
+    _rendering_scenes.discard(scene.name)
+    apply_viewport_proxy(scene)
+
+@persistent
+def save_viewport_resolution(*args):
+    """Save handler: writes the viewport plates, not the full resolution ones of a running render."""
+    for name in _rendering_scenes:
+        scene = bpy.data.scenes.get(name)
+        if scene:
+            apply_viewport_proxy(scene)
+
+@persistent
+def resume_render_resolution(*args):
+    if _rendering_scenes:
+        from .proxies import apply_proxy_resolution
+        apply_proxy_resolution('FULL')
+
+@persistent
+def load_viewport_resolution(*args):
+    """Load handler: files saved during a render or after a crash mid-render get their viewport plates back."""
+    _rendering_scenes.clear()
+    scene = getattr(bpy.context, "scene", None)
+    if scene:
+        apply_viewport_proxy(scene)
+
+@persistent
+def prefetch_plate_frames(scene, *args):
+    """Frame change handler: reads upcoming plate frames ahead when prefetching is enabled in the preferences."""
+    prefs = get_addon_preferences()
+    if prefs and prefs.prefetch_enabled:
+        from .prefetch import prefetch_frames
+        prefetch_frames(scene, prefs.prefetch_window, prefs.prefetch_threads)
+
+@persistent
+def clear_solve_caches(*args):
+    """Load handler: drops the cached camera paths and bundle trees of the previous file, if they were built."""
+    for module_name, clear in (("reconstruction", "clear_camera_path_cache"), ("bundle_index", "clear_bundle_index_cache")):
+        module = sys.modules.get(f"{__name__}.{module_name}")
+        if module:
+            getattr(module, clear)()
+
 
 
 # --- Operator Classes (Formatted with Docstrings) ---
+# Operators only import the module doing the work when they first run, keeping registration light.
 
 class CLIP_OT_setup_camera_solver(Operator):
     """Adds a Camera Solver constraint to the active camera for the current clip."""
@@ -125,17 +138,13 @@ class CLIP_OT_setup_camera_solver(Operator):
     def execute(self, context):
         camera = context.scene.camera
         clip = context.space_data.clip
-        for c in camera.constraints:
-            if c.type == 'CAMERA_SOLVER':
-                self.report({'INFO'}, f"Camera Solver constraint already exists on '{camera.name}'.")
-                return {'CANCELLED'}
-        constraint = camera.constraints.new(type='CAMERA_SOLVER')
-        constraint.clip = clip
-        constraint.use_active_clip = False
+        from .solvers import setup_camera_solver
+        if setup_camera_solver(camera, clip) is None:
+            self.report({'INFO'}, f"Camera Solver constraint already exists on '{camera.name}'.")
+            return {'CANCELLED'}
         self.report({'INFO'}, f"Added Camera Solver constraint to '{camera.name}' for clip '{clip.name}'.")
         return {'FINISHED'}
 
-
 class CLIP_OT_setup_object_solver(Operator):
     """Creates a new Empty with an Object Solver constraint for the active tracking object."""
     bl_idname = "clip.setup_object_solver"
@@ -161,43 +170,62 @@ class CLIP_OT_setup_object_solver(Operator):
         clip = context.space_data.clip
         camera = context.scene.camera
         tracking_object = clip.tracking.objects.active
-        new_empty = None
         if not camera:
             self.report({'ERROR'}, "No active scene camera found. Operation cancelled.")
             return {'CANCELLED'}
+        from .solvers import setup_object_solver
         try:
-            new_empty = bpy.data.objects.new("ObjectTrack", None)
-            new_empty.empty_display_type = 'PLAIN_AXES'
-            context.collection.objects.link(new_empty)
-            constraint = new_empty.constraints.new(type='OBJECT_SOLVER')
-            constraint.clip = clip
-            constraint.use_active_clip = False
-            constraint.object = tracking_object.name
-            constraint.camera = camera
-            for o in context.selected_objects:
-                o.select_set(False)
-            context.view_layer.objects.active = new_empty
-            new_empty.select_set(True)
-            self.report({'INFO'}, f"Created 'ObjectTrack' Empty and configured for track '{tracking_object.name}'.")
+            new_empty = setup_object_solver(context.collection, camera, clip, tracking_object)
         except Exception as e:
             self.report({'ERROR'}, f"Failed to set up Object Solver: {e}")
-            if new_empty:
-                bpy.data.objects.remove(new_empty, do_unlink=True)
             return {'CANCELLED'}
+        for o in context.selected_objects:
+            o.select_set(False)
+        context.view_layer.objects.active = new_empty
+        new_empty.select_set(True)
+        self.report({'INFO'}, f"Created 'ObjectTrack' Empty and configured for track '{tracking_object.name}'.")
         return {'FINISHED'}
 
-
-class CLIP_OT_3d_markers_to_empty(Operator):
+class CLIP_OT_3d_markers_to_empty(ModalJobMixin, Operator):
     """Creates an Empty at the 3D position of each selected track with reconstructed 3D data."""
     bl_idname = "clip.3d_markers_to_empty"
     bl_label = "3D Markers to Empty"
     bl_description = "Creates Empties from selected tracks with 3D reconstruction data"
     bl_options = {'REGISTER', 'UNDO'}
+
+    output: bpy.props.EnumProperty(
+        name="Output",
+        description="What to create from the selected bundles",
+        items=[
+            ('EMPTIES', "Empties", "One Empty per track, parented to a 'Trackpoint' Empty"),
+            ('POINT_CLOUD', "Point Cloud", "A single point object with a per-point track name; scales to tens of thousands of tracks"),
+        ],
+        default='EMPTIES'
+    )
+    animated: bpy.props.BoolProperty(
+        name="Animated",
+        description="Bake each Empty's location for every reconstructed frame instead of only the current one (Empties output)",
+        default=False
+    )
+    sync: bpy.props.BoolProperty(
+        name="Sync Existing",
+        description="Update the Empties of an earlier run on this tracking object in place: move only changed bundles and add Empties for new tracks (Empties output)",
+        default=False
+    )
+    missing: bpy.props.EnumProperty(
+        name="Deleted Tracks",
+        description="What happens to synced Empties whose track was deleted or lost its bundle",
+        items=[
+            ('FLAG', "Flag", "Keep the Empty and mark it with a 'clip_tools_missing' custom property"),
+            ('REMOVE', "Remove", "Delete the Empty"),
+        ],
+        default='FLAG'
+    )
     
     @classmethod
     def poll(cls, context):
         return is_clip_editor_with_active_clip(context)
-        
+
     def execute(self, context):
         sc = context.space_data
         clip = sc.clip
@@ -205,44 +233,60 @@ class CLIP_OT_3d_markers_to_empty(Operator):
         if not tracking_object:
             self.report({'ERROR'}, "No active tracking object found.")
             return {'CANCELLED'}
+        return self.job_finished(context, run_job(self.markers_job(context, clip, tracking_object, [])))
+
+    def invoke(self, context, event):
+        clip = context.space_data.clip
+        tracking_object = clip.tracking.objects.active
+        if not tracking_object or self.output == 'POINT_CLOUD':
+            return self.execute(context)
+        # Empties are created one by one, so they run as a modal job with progress and Esc to cancel.
+        return self.start_job(context, lambda created: self.markers_job(context, clip, tracking_object, created))
+
+    def markers_job(self, context, clip, tracking_object, created):
         scene = context.scene
-        camera = scene.camera
-        world_matrix = Matrix.Identity(4)
-        if camera:
-            reconstruction = tracking_object.reconstruction
-            if reconstruction and reconstruction.is_valid:
-                relative_frame = scene.frame_current - clip.frame_start + 1
-                reconstructed_matrix = reconstruction.cameras.matrix_from_frame(frame=relative_frame)
-                if reconstructed_matrix:
-                    world_matrix = camera.matrix_world @ reconstructed_matrix.inverted()
-        parent_empty = bpy.data.objects.new("Trackpoint", None)
-        parent_empty.empty_display_type = 'PLAIN_AXES'
-        parent_empty.empty_display_size = 1.0 
-        context.collection.objects.link(parent_empty)
-        created_empties = []
-        for i, track in enumerate(tracking_object.tracks):
-            if track.has_bundle and track.select:
-                empty_name = f"Track_{i + 1:03}"
-                empty = bpy.data.objects.new(empty_name, None)
-                empty.empty_display_type = 'PLAIN_AXES'
-                empty.location = world_matrix @ track.bundle
-                context.collection.objects.link(empty)
-                empty.parent = parent_empty
-                created_empties.append(empty)
-                d = empty.driver_add("empty_display_size").driver
-                var = d.variables.new()
-                var.name = "size"
-                var.targets[0].id_type = 'OBJECT'
-                var.targets[0].id = parent_empty
-                var.targets[0].data_path = 'empty_display_size'
-                d.expression = "size"
-        parent_empty.location = (0, 0, 0)
-        if not created_empties:
-            if parent_empty.users == 1 and parent_empty.name in bpy.data.objects:
-                bpy.data.objects.remove(parent_empty, do_unlink=True)
+        from .reconstruction import get_tracking_world_matrix
+        from .markers import iter_track_empties, iter_sync_track_empties, create_track_point_cloud, iter_bake_bundle_animation
+        world_matrix = get_tracking_world_matrix(scene, clip, tracking_object)
+        if self.output == 'POINT_CLOUD':
+            return create_track_point_cloud(context.collection, tracking_object, world_matrix), None
+        if self.sync:
+            self.job_title = "Syncing Empties"
+            summary = yield from iter_sync_track_empties(scene, context.collection, clip, tracking_object, world_matrix, self.animated,
+                                                         remove_missing=self.missing == 'REMOVE', created=created)
+            return summary, summary["baked"]
+        self.job_title = "Creating Empties"
+        _, created_empties, created_indices = yield from iter_track_empties(context.collection, tracking_object, world_matrix, created=created, clip=clip)
+        baked = None
+        if self.animated and created_empties:
+            self.job_title = "Baking Empties"
+            baked = yield from iter_bake_bundle_animation(scene, clip, tracking_object, created_empties, created_indices, created)
+        return created_empties, baked
+
+    def job_finished(self, context, result):
+        created, baked = result
+        if self.output == 'POINT_CLOUD':
+            if not created:
+                self.report({'WARNING'}, "No selected tracks with 3D data found.")
+                return {'CANCELLED'}
+            self.report({'INFO'}, f"{len(created.data.vertices)} track points created. Change 'Display Size' in its 'Track Points' modifier.")
+            return {'FINISHED'}
+        if self.sync and created["parent"]:
+            counts = f"{created['created']} created, {created['updated']} updated, {created['unchanged']} unchanged"
+            if created["missing"] or created["removed"]:
+                counts += f", {created['missing'] + created['removed']} without track ({'removed' if self.missing == 'REMOVE' else 'flagged'})"
+            if baked is False:
+                self.report({'WARNING'}, f"Empties synced ({counts}); no valid reconstruction to bake from.")
+            else:
+                self.report({'INFO'}, f"Empties synced: {counts}.")
+            return {'FINISHED'}
+        if not created or (self.sync and not created["parent"]):
             self.report({'WARNING'}, "No selected tracks with 3D data found.")
             return {'CANCELLED'}
-        self.report({'INFO'}, f"{len(created_empties)} Empties created. Select 'Trackpoint' parent to change size via Object Data Properties.")
+        if baked is False:
+            self.report({'WARNING'}, "No valid reconstruction; Empties were placed at the current frame only.")
+            return {'FINISHED'}
+        self.report({'INFO'}, f"{len(created)} Empties created. Select 'Trackpoint' parent to change size via Object Data Properties.")
         return {'FINISHED'}
 
 class CLIP_OT_set_start_frame_from_filename(bpy.types.Operator):
@@ -258,6 +302,17 @@ class CLIP_OT_set_start_frame_from_filename(bpy.types.Operator):
         
     def execute(self, context):
         clip = context.space_data.clip; name_to_parse = clip.name
+        from .footage import get_frame_number_from_path, index_image_sequence
+        info = index_image_sequence(clip.filepath) if clip.source == 'SEQUENCE' else None
+        first_frame = get_frame_number_from_path(clip.filepath)
+        if info is not None and first_frame is not None:
+            # Use the indexed range directly instead of letting set_scene_frames probe the sequence file by file.
+            scene = context.scene
+            clip.frame_start = first_frame; scene.frame_start = first_frame; scene.frame_end = max(info.last - clip.frame_offset, first_frame)
+            bpy.ops.screen.frame_jump(end=False)
+            missing = f" Warning: {len(info.missing)} missing frame(s) in the sequence." if info.missing else ""
+            self.report({'INFO'}, f"Clip '{clip.name}': start frame set to {first_frame}, scene range {scene.frame_start}-{scene.frame_end}.{missing}")
+            return {'FINISHED'}
         match = re.search(r"[._](\d{4,})\.", name_to_parse)
         if match:
             try: frame_start = int(match.group(1))
@@ -269,22 +324,61 @@ class CLIP_OT_set_start_frame_from_filename(bpy.types.Operator):
         return {'FINISHED'}
 
 class CLIP_OT_duplicate_active_movieclip(bpy.types.Operator):
-    """Creates a copy of the currently active Movie Clip data-block."""
+    """Creates a copy of the currently active Movie Clip data-block, optionally with only part of its tracking data."""
     bl_idname = "clip.duplicate_active_movieclip"
     bl_label = "Duplicate Active Clip"
     bl_description = "Creates a copy of the currently active Movie Clip data-block"
     bl_options = {'REGISTER', 'UNDO'}
+
+    content: bpy.props.EnumProperty(
+        name="Copy",
+        description="Which tracking data the duplicate gets",
+        items=[
+            ('ALL', "Everything", "All tracking objects, tracks, markers and the reconstruction"),
+            ('OBJECT', "Active Object", "Only the tracks of the active tracking object, without the reconstruction"),
+            ('SELECTED', "Selected Tracks", "Only the selected tracks of the active tracking object, without the reconstruction"),
+            ('SETTINGS', "Settings Only", "Footage, camera and tracking settings without tracks"),
+        ],
+        default='ALL'
+    )
+    use_frame_range: bpy.props.BoolProperty(
+        name="Frame Range",
+        description="Only keep markers inside the frame range",
+        default=False
+    )
+    frame_start: bpy.props.IntProperty(name="Start", description="First scene frame to keep markers for", default=1)
+    frame_end: bpy.props.IntProperty(name="End", description="Last scene frame to keep markers for", default=250)
     
     @classmethod
     def poll(cls, context):
         return is_clip_editor_with_active_clip(context)
 
+    def invoke(self, context, event):
+        if not self.properties.is_property_set("frame_start"): self.frame_start = context.scene.frame_start
+        if not self.properties.is_property_set("frame_end"): self.frame_end = context.scene.frame_end
+        return self.execute(context)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "content")
+        row = layout.row(align=True); row.active = self.content != 'SETTINGS'
+        row.prop(self, "use_frame_range")
+        sub = row.row(align=True); sub.active = self.use_frame_range
+        sub.prop(self, "frame_start"); sub.prop(self, "frame_end")
+
     def execute(self, context):
         space_clip = context.space_data; source_clip = space_clip.clip
         if source_clip is None: self.report({'WARNING'}, "No active Movie Clip to duplicate."); return {'CANCELLED'}
+        frame_range = (self.frame_start, max(self.frame_end, self.frame_start)) if self.use_frame_range and self.content != 'SETTINGS' else None
+        from .clips import duplicate_clip
         try:
-            new_clip = source_clip.copy(); space_clip.clip = new_clip
-            self.report({'INFO'}, f"Movie Clip '{source_clip.name}' duplicated as '{new_clip.name}'. New clip is now active.")
+            had_solve = any(o.reconstruction.is_valid for o in source_clip.tracking.objects)
+            new_clip = duplicate_clip(space_clip, context.scene, self.content, frame_range)
+            if had_solve and self.content != 'ALL':
+                self.report({'WARNING'}, f"Movie Clip '{source_clip.name}' duplicated as '{new_clip.name}' without its reconstruction; solve the copy again.")
+            else:
+                self.report({'INFO'}, f"Movie Clip '{source_clip.name}' duplicated as '{new_clip.name}'. New clip is now active.")
+        except ValueError as e: self.report({'WARNING'}, str(e)); return {'CANCELLED'}
         except Exception as e: self.report({'ERROR'}, f"Failed to duplicate Movie Clip: {e}"); return {'CANCELLED'}
         return {'FINISHED'}
 
@@ -294,6 +388,11 @@ class CLIP_OT_delete_active_movieclip(bpy.types.Operator):
     bl_label = "Delete Active Clip"
     bl_description = "Deletes the active Movie Clip. This action can be undone, but the data-block might be lost if not used elsewhere and the file is saved."
     bl_options = {'REGISTER', 'UNDO'}
+    purge_generated: bpy.props.BoolProperty(
+        name="Purge Generated Data",
+        description="Also remove the plate images, image plane and projection materials and projection node groups created for this clip that nothing uses anymore",
+        default=False
+    )
 
     @classmethod
     def poll(cls, context):
@@ -305,7 +404,12 @@ class CLIP_OT_delete_active_movieclip(bpy.types.Operator):
         clip_name = clip_to_delete.name
         try:
             space_clip.clip = None; bpy.data.movieclips.remove(clip_to_delete)
-            self.report({'INFO'}, f"Movie Clip '{clip_name}' removed. Editor now has no active clip.")
+            purged = ""
+            if self.purge_generated:
+                from .memory import purge_generated_data
+                counts = purge_generated_data({clip_name})
+                purged = f" Purged {counts['images']} image(s), {counts['materials']} material(s) and {counts['node_groups']} node group(s)."
+            self.report({'INFO'}, f"Movie Clip '{clip_name}' removed. Editor now has no active clip.{purged}")
         except Exception as e: self.report({'ERROR'}, f"Failed to delete Movie Clip '{clip_name}': {e}"); return {'CANCELLED'}
         return {'FINISHED'}
 
@@ -322,130 +426,52 @@ class CLIP_OT_create_image_plane_from_clip(bpy.types.Operator):
         min=0.01,
         soft_max=100.0
     )
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        description="How the plane follows the camera's lens, shift and resolution",
+        items=[
+            ('LIVE', "Live", "Scripted drivers re-evaluated on every frame change"),
+            ('BAKED', "Baked", "Keyframes baked over the scene frame range; fast playback, re-run after camera changes"),
+        ],
+        default='LIVE'
+    )
 
     @classmethod
     def poll(cls, context):
         has_camera = context.scene.camera is not None
         return has_camera and is_clip_editor_with_active_clip(context)
 
-    def setup_driver_variables(self, driver, imageplane, camera):
-        """Sets up the necessary variables for the image plane drivers. (Original Logic)"""
-        scene = bpy.context.scene
-        needed_vars = {
-            'cA': ('CAMERA', "angle", camera.data), 'cT': ('CAMERA', 'type', camera.data),
-            'cSx': ('CAMERA', 'shift_x', camera.data), 'cSy': ('CAMERA', 'shift_y', camera.data),
-            'r_x': ('SCENE', 'render.resolution_x', scene), 'r_y': ('SCENE', 'render.resolution_y', scene),
-            'p_x': ('SCENE', 'render.pixel_aspect_x', scene), 'p_y': ('SCENE', 'render.pixel_aspect_y', scene),
-        }
-        for name, (id_type, path, target_id) in needed_vars.items():
-            if name not in driver.variables:
-                var = driver.variables.new(); var.name = name; var.type = 'SINGLE_PROP'
-                var.targets[0].id_type = id_type; var.targets[0].id = target_id; var.targets[0].data_path = path
-        if 'depth' not in driver.variables:
-            var = driver.variables.new(); var.name = 'depth'; var.type = 'TRANSFORMS'
-            var.targets[0].id = imageplane; var.targets[0].data_path = 'location'
-            var.targets[0].transform_type = 'LOC_Z'; var.targets[0].transform_space = 'LOCAL_SPACE'
-        if 'scale_y' not in driver.variables:
-            var = driver.variables.new(); var.name = 'scale_y'; var.type = 'SINGLE_PROP'
-            var.targets[0].id = imageplane; var.targets[0].data_path = 'scale[1]'
-
-    def setup_drivers_for_image_plane(self, imageplane, camera):
-        """Sets up the drivers for the image plane's scale and location. (Original Logic)"""
-        base_expr = "abs(depth) * tan(cA/2)"; aspect_expr = "(r_y * p_y) / (r_x * p_x)"
-        half_width_expr = f"({base_expr})"; half_height_expr = f"({base_expr}) * {aspect_expr}"
-        
-        driver_x = imageplane.driver_add('scale', 0).driver; driver_x.type = 'SCRIPTED'
-        self.setup_driver_variables(driver_x, imageplane, camera)
-        driver_x.expression = f"{half_width_expr} if cT == 0 else 0"
-        
-        driver_y = imageplane.driver_add('scale', 1).driver; driver_y.type = 'SCRIPTED'
-        self.setup_driver_variables(driver_y, imageplane, camera)
-        driver_y.expression = f"{half_height_expr} if cT == 0 else 0"
-        
-        driver_loc_x = imageplane.driver_add('location', 0).driver; driver_loc_x.type = 'SCRIPTED'
-        self.setup_driver_variables(driver_loc_x, imageplane, camera)
-        driver_loc_x.expression = f"cSx * 2 * {half_width_expr}"
-        
-        driver_loc_y = imageplane.driver_add('location', 1).driver; driver_loc_y.type = 'SCRIPTED'
-        self.setup_driver_variables(driver_loc_y, imageplane, camera)
-        driver_loc_y.expression = f"cSy * 2 * scale_y * (r_x / r_y)"
-
-    def create_image_plane(self, context, camera, image):
-        """Creates and configures the image plane object and its material."""
-        try:
-            scene = context.scene; depth = self.depth 
-            context.view_layer.objects.active = camera; camera.select_set(True)
-            bpy.ops.mesh.primitive_plane_add()
-            imageplane = context.active_object
-            imageplane.name = "ImagePlane_" + camera.name
-            bpy.ops.object.parent_set(type='OBJECT', keep_transform=False)
-            imageplane.parent = camera
-            imageplane.location = (0, 0, -depth)
-            self.setup_drivers_for_image_plane(imageplane, camera)
-            material_name = 'mat_imageplane_' + image.name
-            material = bpy.data.materials.get(material_name)
-            if not material:
-                material = bpy.data.materials.new(name=material_name); material.use_nodes = True
-                material.node_tree.nodes.clear()
-                tex_image = material.node_tree.nodes.new('ShaderNodeTexImage')
-                emission = material.node_tree.nodes.new('ShaderNodeEmission')
-                transparent = material.node_tree.nodes.new('ShaderNodeBsdfTransparent')
-                mix_shader = material.node_tree.nodes.new('ShaderNodeMixShader')
-                output = material.node_tree.nodes.new('ShaderNodeOutputMaterial')
-                tex_image.location = (-300, 300); emission.location = (0, 300)
-                transparent.location = (0, 0); mix_shader.location = (300, 200)
-                output.location = (600, 200)
-                links = material.node_tree.links
-                links.new(tex_image.outputs['Color'], emission.inputs['Color'])
-                links.new(tex_image.outputs['Alpha'], mix_shader.inputs['Fac'])
-                links.new(transparent.outputs['BSDF'], mix_shader.inputs[1])
-                links.new(emission.outputs['Emission'], mix_shader.inputs[2])
-                links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
-            if not imageplane.material_slots:
-                imageplane.data.materials.append(material)
-            else:
-                imageplane.material_slots[0].material = material
-            tex_image_node = material.node_tree.nodes.get("Image Texture")
-            if tex_image_node:
-                tex_image_node.image = image; img_user = tex_image_node.image_user
-                img_user.use_cyclic = True; img_user.use_auto_refresh = True
-                if image.source == 'SEQUENCE':
-                    img_user.frame_duration = scene.frame_end - scene.frame_start + 1
-                    first_frame = get_frame_number_from_path(image.filepath_raw)
-                    if first_frame is not None:
-                        img_user.frame_offset = first_frame - 1; img_user.frame_start = scene.frame_start
-                    else:
-                        img_user.frame_offset = 0; img_user.frame_start = scene.frame_start
-                elif image.source == 'MOVIE':
-                    img_user.frame_duration = scene.frame_end - scene.frame_start + 1
-                    img_user.frame_offset = 0; img_user.frame_start = scene.frame_start
-        except Exception as e:
-            import traceback; traceback.print_exc()
-            self.report({'ERROR'}, f"Failed to create image plane: {e}")
-            return {'CANCELLED'}
-        context.view_layer.objects.active = imageplane; imageplane.select_set(True)
-        return {'FINISHED'}
-
     def execute(self, context):
         clip = context.space_data.clip
         camera = context.scene.camera
         if not camera:
             self.report({'WARNING'}, "No active camera in the scene.")
             return {'CANCELLED'}
+        from .image_plane import create_image_plane
         try:
-            image = bpy.data.images.load(clip.filepath, check_existing=True)
-            if image.source == 'FILE':
-                image.source = 'SEQUENCE'
+            imageplane = create_image_plane(context.scene, context.collection, camera, clip, self.depth, self.mode)
         except Exception as e:
-            self.report({'ERROR'}, f"Failed to load image: {e}")
+            import traceback; traceback.print_exc()
+            self.report({'ERROR'}, f"Failed to create image plane: {e}")
             return {'CANCELLED'}
-        return self.create_image_plane(context, camera, image)
+        apply_viewport_proxy(context.scene)
+        for o in context.selected_objects:
+            o.select_set(False)
+        camera.select_set(True)
+        context.view_layer.objects.active = imageplane; imageplane.select_set(True)
+        return {'FINISHED'}
 
 class PROJECTION_OT_setup_shader(bpy.types.Operator):
-    """Creates a camera projection material for the selected object."""
+    """Creates a camera projection material for the selected object, or one shared material for all selected meshes."""
     bl_idname = "object.setup_projection_shader"
     bl_label = "Set Cam Projection"
     bl_options = {'REGISTER', 'UNDO'}
+    batch: bpy.props.BoolProperty(
+        name="All Selected Meshes",
+        description="Assign one shared projection material to every selected mesh",
+        default=False
+    )
+
     @classmethod
     def poll(cls, context):
         active_obj = context.active_object
@@ -456,29 +482,471 @@ class PROJECTION_OT_setup_shader(bpy.types.Operator):
         return True
         
     def execute(self, context):
-        selected_obj = context.active_object; active_camera = context.scene.camera; movie_clip = context.space_data.clip; scene = context.scene
+        selected_obj = context.active_object; active_camera = context.scene.camera; movie_clip = context.space_data.clip
+        targets = [o for o in context.selected_objects if o.type == 'MESH'] if self.batch else [selected_obj]
+        if not targets: self.report({'WARNING'}, "No mesh objects selected"); return {'CANCELLED'}
+        from .projection import setup_projection
+        # bpy.data.images.load raises RuntimeError when the footage cannot be read.
+        try: materials = setup_projection(active_camera, movie_clip, targets, shared=self.batch)
+        except RuntimeError as e: self.report({'ERROR'}, f"Failed to load image from movie clip: {e}"); return {'CANCELLED'}
+        apply_viewport_proxy(context.scene)
+        self.report({'INFO'}, f"Material '{materials[0].name}' has been set up on {len(targets)} object(s)."); return {'FINISHED'}
+
+class CLIP_OT_apply_lens_distortion(bpy.types.Operator):
+    """Makes the clip's projection and image plane materials follow the tracking camera's lens distortion."""
+    bl_idname = "clip.apply_lens_distortion"
+    bl_label = "Apply Lens Distortion"
+    bl_description = "Computes an ST-map of the tracking camera's distortion once and uses it in the clip's projection and image plane materials"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    enable: bpy.props.BoolProperty(name="Distort", description="Disable to remove the ST-map lookup again (ideal pinhole camera)", default=True)
+
+    @classmethod
+    def poll(cls, context):
+        return is_clip_editor_with_active_clip(context)
+
+    def execute(self, context):
+        clip = context.space_data.clip
+        from .distortion_map import apply_lens_distortion
+        st_map, changed = apply_lens_distortion(clip, self.enable)
+        if not changed:
+            self.report({'WARNING'}, f"No projection or image plane materials use clip '{clip.name}'.")
+            return {'CANCELLED'}
+        if st_map:
+            self.report({'INFO'}, f"ST-map '{st_map.name}' applied to {changed} material(s).")
+        else:
+            self.report({'INFO'}, f"Lens distortion removed from {changed} material(s).")
+        return {'FINISHED'}
+
+class ClipToolsCameraMapping(bpy.types.PropertyGroup):
+    """One clip -> camera pair of Batch Scene Setup."""
+    use: bpy.props.BoolProperty(name="Use", default=True)
+    clip: bpy.props.StringProperty(name="Clip")
+    camera: bpy.props.StringProperty(name="Camera", description="Camera object the clip is solved on")
+    projection_collection: bpy.props.StringProperty(name="Projection", description="Collection whose meshes get this camera's projection material")
+
+class CLIP_OT_batch_scene_setup(bpy.types.Operator):
+    """Sets up solvers, image planes and projection materials for several clip -> camera pairs in one step."""
+    bl_idname = "clip.batch_scene_setup"
+    bl_label = "Batch Scene Setup"
+    bl_description = "Camera Solver, Object Solvers, image plane and projection material for every clip and its camera, in one undo step"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    mappings: bpy.props.CollectionProperty(type=ClipToolsCameraMapping)
+    camera_solver: bpy.props.BoolProperty(name="Camera Solver", default=True)
+    object_solvers: bpy.props.BoolProperty(name="Object Solvers", description="One Object Solver Empty per tracking object", default=True)
+    image_plane: bpy.props.BoolProperty(name="Image Plane", default=True)
+    projection: bpy.props.BoolProperty(name="Projection", description="Projection material on the meshes of each pair's collection", default=True)
+    depth: bpy.props.FloatProperty(name="Depth", description="Image plane distance from the camera", default=10.0, min=0.01, soft_max=100.0)
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[('LIVE', "Live", "Scripted drivers"), ('BAKED', "Baked", "Keyframes baked over the scene frame range")],
+        default='LIVE'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return len(bpy.data.movieclips) > 0 and context.scene is not None
+
+    def fill_mappings(self, context):
+        from .scene_setup import guess_camera_for_clip
+        self.mappings.clear()
+        for clip in bpy.data.movieclips:
+            camera = guess_camera_for_clip(context.scene, clip)
+            item = self.mappings.add(); item.clip = clip.name; item.camera = camera.name if camera else ""
+
+    def invoke(self, context, event):
+        self.fill_mappings(context)
+        return context.window_manager.invoke_props_dialog(self, width=600)
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row(align=True)
+        for name in ("camera_solver", "object_solvers", "image_plane", "projection"):
+            row.prop(self, name, toggle=True)
+        row = layout.row(); row.active = self.image_plane
+        row.prop(self, "depth"); row.prop(self, "mode", expand=True)
+        for item in self.mappings:
+            row = layout.row(align=True)
+            row.prop(item, "use", text="")
+            row.label(text=item.clip, icon='SEQUENCE')
+            row.prop_search(item, "camera", context.scene, "objects", text="", icon='CAMERA_DATA')
+            sub = row.row(align=True); sub.active = self.projection
+            sub.prop_search(item, "projection_collection", bpy.data, "collections", text="", icon='OUTLINER_COLLECTION')
+
+    def execute(self, context):
+        if not self.mappings:
+            self.fill_mappings(context)
+        scene = context.scene; mappings = []
+        for item in self.mappings:
+            clip = bpy.data.movieclips.get(item.clip); camera = scene.objects.get(item.camera)
+            if not item.use or clip is None:
+                continue
+            if camera is None or camera.type != 'CAMERA':
+                self.report({'WARNING'}, f"Clip '{item.clip}' skipped: no camera object '{item.camera}' in the scene.")
+                continue
+            collection = bpy.data.collections.get(item.projection_collection) if item.projection_collection else None
+            mappings.append((clip, camera, list(collection.all_objects) if collection else []))
+        if not mappings:
+            self.report({'WARNING'}, "No clip -> camera pairs to set up.")
+            return {'CANCELLED'}
+        steps = [name for name in ("camera_solver", "object_solvers", "image_plane", "projection") if getattr(self, name)]
+        from .scene_setup import batch_scene_setup
+        summary = batch_scene_setup(scene, context.collection, mappings, steps, self.depth, self.mode)
+        apply_viewport_proxy(scene)
+        for error in summary["errors"]:
+            self.report({'ERROR'}, error)
+        self.report({'INFO'}, f"{len(mappings)} clip(s): {summary['camera_solvers']} Camera Solver(s), {summary['object_solvers']} Object Solver(s), "
+                              f"{summary['image_planes']} image plane(s), {summary['materials']} projection material(s).")
+        return {'FINISHED'}
+
+class CLIP_OT_analyze_reprojection_error(bpy.types.Operator):
+    """Reprojects every bundle into every solved frame and compares it with the markers."""
+    bl_idname = "clip.analyze_reprojection_error"
+    bl_label = "Analyze Reprojection Error"
+    bl_description = "Per-track and per-frame reprojection error of the active tracking object's solve, with outlier selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    threshold: bpy.props.FloatProperty(name="Threshold", description="Tracks with a mean error above this (in pixels) are outliers", default=1.0, min=0.0, soft_max=10.0, subtype='PIXEL')
+    select_outliers: bpy.props.BoolProperty(name="Select Outliers", description="Select exactly the tracks above the threshold", default=True)
+    color_tracks: bpy.props.BoolProperty(name="Color Tracks", description="Set each analyzed track's custom color from green (low error) to red (twice the threshold)", default=False)
+    write_text: bpy.props.BoolProperty(name="Error Tables", description="Write per-track and per-frame tables to a Text data-block", default=True)
+
+    @classmethod
+    def poll(cls, context):
+        if not is_clip_editor_with_active_clip(context):
+            return False
+        tracking_object = context.space_data.clip.tracking.objects.active
+        if not (tracking_object and tracking_object.reconstruction.is_valid):
+            cls.poll_message_set("The active tracking object has no valid solve.")
+            return False
+        return True
+
+    def execute(self, context):
+        clip = context.space_data.clip; tracking_object = clip.tracking.objects.active
+        from .solve_analysis import analyze_solve
+        summary = analyze_solve(clip, tracking_object, self.threshold, self.select_outliers, self.color_tracks, self.write_text)
+        if not summary["tracks"]:
+            self.report({'WARNING'}, "No tracks with 3D data found.")
+            return {'CANCELLED'}
+        text = f" Tables in text '{summary['text'].name}'." if summary["text"] else ""
+        self.report({'INFO'}, f"Mean reprojection error {summary['mean']:.3f} px over {summary['tracks']} tracks and {summary['frames']} frames; "
+                              f"{summary['outliers']} track(s) above {self.threshold:.2f} px.{text}")
+        return {'FINISHED'}
+
+def has_active_bundles(cls, context):
+    """Shared poll of the bundle query operators: a Clip Editor clip whose active tracking object is solved."""
+    if not is_clip_editor_with_active_clip(context):
+        return False
+    tracking_object = context.space_data.clip.tracking.objects.active
+    if not (tracking_object and tracking_object.reconstruction.is_valid):
+        cls.poll_message_set("The active tracking object has no valid solve.")
+        return False
+    return True
+
+class CLIP_OT_select_duplicate_bundles(bpy.types.Operator):
+    """Selects tracks whose bundle nearly coincides with a better track's bundle."""
+    bl_idname = "clip.select_duplicate_bundles"
+    bl_label = "Select Duplicate Bundles"
+    bl_description = "Clusters bundles closer than the radius and selects all but the lowest-error track of each cluster"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    radius: bpy.props.FloatProperty(name="Radius", description="Bundles closer than this (in scene units) are duplicates", default=0.01, min=0.0, soft_max=1.0, subtype='DISTANCE')
+
+    @classmethod
+    def poll(cls, context):
+        return has_active_bundles(cls, context)
+
+    def execute(self, context):
+        clip = context.space_data.clip; tracking_object = clip.tracking.objects.active
+        from .bundle_index import find_duplicate_tracks, set_track_selection
+        duplicates = find_duplicate_tracks(context.scene, clip, tracking_object, self.radius)
+        set_track_selection(tracking_object.tracks, duplicates)
+        self.report({'INFO'}, f"{len(duplicates)} duplicate track(s) selected.")
+        return {'FINISHED'}
+
+class CLIP_OT_select_tracks_near(bpy.types.Operator):
+    """Selects tracks whose bundle is close to the 3D cursor or the active object."""
+    bl_idname = "clip.select_tracks_near"
+    bl_label = "Select Tracks Near"
+    bl_description = "Selects tracks whose bundle lies within the radius of the 3D cursor or the active object"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source: bpy.props.EnumProperty(
+        name="Near",
+        items=[('CURSOR', "3D Cursor", "The scene's 3D cursor"), ('ACTIVE_OBJECT', "Active Object", "The origin of the active object")],
+        default='CURSOR'
+    )
+    radius: bpy.props.FloatProperty(name="Radius", default=0.5, min=0.0, soft_max=10.0, subtype='DISTANCE')
+    extend: bpy.props.BoolProperty(name="Extend", description="Keep the current selection", default=False)
+
+    @classmethod
+    def poll(cls, context):
+        return has_active_bundles(cls, context)
+
+    def execute(self, context):
+        clip = context.space_data.clip; tracking_object = clip.tracking.objects.active
+        if self.source == 'ACTIVE_OBJECT' and context.active_object is None:
+            self.report({'WARNING'}, "No active object.")
+            return {'CANCELLED'}
+        location = context.scene.cursor.location if self.source == 'CURSOR' else context.active_object.matrix_world.translation
+        from .bundle_index import select_tracks_near
+        count = select_tracks_near(context.scene, clip, tracking_object, location, self.radius, self.extend)
+        self.report({'INFO'}, f"{count} track(s) within {self.radius:.3g} of the {'3D cursor' if self.source == 'CURSOR' else 'active object'}.")
+        return {'FINISHED'}
+
+class CLIP_OT_select_tracks_inside_mesh(bpy.types.Operator):
+    """Selects tracks whose bundle lies inside a closed mesh."""
+    bl_idname = "clip.select_tracks_inside_mesh"
+    bl_label = "Select Tracks Inside Mesh"
+    bl_description = "Selects tracks whose bundle lies inside a closed mesh object, e.g. a box around part of the set"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    object_name: bpy.props.StringProperty(name="Mesh", description="Closed mesh with outward-facing normals (default: the active object)")
+    extend: bpy.props.BoolProperty(name="Extend", description="Keep the current selection", default=False)
+
+    @classmethod
+    def poll(cls, context):
+        return has_active_bundles(cls, context)
+
+    def invoke(self, context, event):
+        if not self.object_name and context.active_object and context.active_object.type == 'MESH':
+            self.object_name = context.active_object.name
+        return self.execute(context)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop_search(self, "object_name", context.scene, "objects", icon='MESH_CUBE')
+        layout.prop(self, "extend")
+
+    def execute(self, context):
+        clip = context.space_data.clip; tracking_object = clip.tracking.objects.active
+        mesh_object = context.scene.objects.get(self.object_name)
+        if mesh_object is None or mesh_object.type != 'MESH':
+            self.report({'WARNING'}, "Choose a mesh object.")
+            return {'CANCELLED'}
+        from .bundle_index import select_tracks_inside_mesh
+        count = select_tracks_inside_mesh(context.scene, context.evaluated_depsgraph_get(), clip, tracking_object, mesh_object, self.extend)
+        self.report({'INFO'}, f"{count} track(s) inside '{mesh_object.name}'.")
+        return {'FINISHED'}
+
+class CLIP_OT_export_markers(bpy.types.Operator, ExportHelper):
+    """Exports the 2D markers of every tracking object of the active clip."""
+    bl_idname = "clip.export_markers"
+    bl_label = "Export 2D Markers"
+    bl_description = "Writes frame, position, pattern corners and enabled state of every marker to CSV or NumPy column files"
+    bl_options = {'REGISTER'}
+
+    file_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ('CSV', "CSV", "One row per marker with object and track names"),
+            ('NPY', "NumPy Columns", "A folder with one memory-mappable .npy file per column and tracks.json with the names"),
+        ],
+        default='CSV'
+    )
+    selected_only: bpy.props.BoolProperty(name="Selected Tracks Only", default=False)
+    filter_glob: bpy.props.StringProperty(default="*.csv", options={'HIDDEN'})
+
+    @property
+    def filename_ext(self):
+        return ".csv" if self.file_format == 'CSV' else ""
+
+    @classmethod
+    def poll(cls, context):
+        return is_clip_editor_with_active_clip(context)
+
+    def execute(self, context):
+        clip = context.space_data.clip
+        from .export import export_markers
+        try:
+            rows = export_markers(self.filepath, clip, self.file_format, self.selected_only)
+        except OSError as e:
+            self.report({'ERROR'}, f"Failed to write '{self.filepath}': {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Exported {rows} markers of clip '{clip.name}' to '{self.filepath}'.")
+        return {'FINISHED'}
+
+class CLIP_OT_export_camera_solve(bpy.types.Operator, ExportHelper):
+    """Exports the active clip's camera solve and bundles to interchange files."""
+    bl_idname = "clip.export_camera_solve"
+    bl_label = "Export Camera Solve"
+    bl_description = "Writes the solved camera path as a Nuke .chan file and a per-frame matrix/FOV table, and the bundles as a point file, without stepping through the scene frames"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".chan"
+    filter_glob: bpy.props.StringProperty(default="*.chan;*.txt;*.ply;*.xyz", options={'HIDDEN'})
+    export_chan: bpy.props.BoolProperty(name="Nuke .chan", description="Translation, ZXY rotation and vertical field of view per solved frame, Y-up", default=True)
+    export_table: bpy.props.BoolProperty(name="Matrix Table", description="Text table with the camera-to-world matrix, field of view and focal length per solved frame", default=True)
+    bundles: bpy.props.EnumProperty(
+        name="Bundles",
+        items=[
+            ('PLY', "PLY", "Binary PLY point cloud"),
+            ('XYZ', "XYZ", "One 'x y z' text line per bundle"),
+            ('NONE', "None", "Do not export the bundles"),
+        ],
+        default='PLY'
+    )
+    use_scene_space: bpy.props.BoolProperty(name="Scene Space", description="Apply the placement of the scene camera's Camera Solver (origin, floor, scale); otherwise write the raw tracking space", default=True)
+    y_up: bpy.props.BoolProperty(name="Y Up", description="Convert the matrix table and bundles to a Y-up world (the .chan file is always Y-up)", default=False)
+
+    @classmethod
+    def poll(cls, context):
+        if not is_clip_editor_with_active_clip(context):
+            return False
+        camera_track = next((o for o in context.space_data.clip.tracking.objects if o.is_camera), None)
+        if not (camera_track and camera_track.reconstruction.is_valid):
+            cls.poll_message_set("The clip's camera has no valid solve.")
+            return False
+        return True
+
+    def execute(self, context):
+        clip = context.space_data.clip
+        from .export import export_camera_solve
+        try:
+            result = export_camera_solve(self.filepath, context.scene, clip, self.export_chan, self.export_table, self.bundles, self.use_scene_space, self.y_up)
+        except OSError as e:
+            self.report({'ERROR'}, f"Failed to write '{self.filepath}': {e}")
+            return {'CANCELLED'}
+        if not result or not result["files"]:
+            self.report({'WARNING'}, "Nothing to export.")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Exported {result['frames']} camera frames and {result['bundles']} bundles of clip '{clip.name}' to {len(result['files'])} file(s).")
+        return {'FINISHED'}
+
+class CLIP_OT_build_proxies(bpy.types.Operator):
+    """Builds half and quarter resolution copies of the active clip's image sequence for viewport playback."""
+    bl_idname = "clip.build_plate_proxies"
+    bl_label = "Build Plate Proxies"
+    bl_description = "Builds 1/2 and 1/4 resolution copies of the image sequence in background Blender processes, for image planes and projection materials"
+    bl_options = {'REGISTER'}
+
+    build_half: bpy.props.BoolProperty(name="1/2", default=True)
+    build_quarter: bpy.props.BoolProperty(name="1/4", default=True)
+    workers: bpy.props.IntProperty(name="Workers", description="Number of Blender processes scaling frames at once (0 = half the CPU count)", default=0, min=0, soft_max=32)
+    rebuild: bpy.props.BoolProperty(name="Rebuild", description="Also rebuild proxies that are up to date", default=False)
+
+    @classmethod
+    def poll(cls, context):
+        return is_clip_editor_with_active_clip(context) and get_proxy_build_status(context.space_data.clip) is None
+
+    def execute(self, context):
+        clip = context.space_data.clip
+        levels = [level for level, enabled in (('HALF', self.build_half), ('QUARTER', self.build_quarter)) if enabled]
+        if not levels:
+            self.report({'WARNING'}, "No proxy size selected.")
+            return {'CANCELLED'}
+        from .proxies import start_proxy_build
         try:
-            image = bpy.data.images.load(movie_clip.filepath, check_existing=True)
-            if image.source == 'FILE' and movie_clip.source == 'SEQUENCE': image.source = 'SEQUENCE'
-        except Exception as e: self.report({'ERROR'}, f"Failed to load image from movie clip: {e}"); return {'CANCELLED'}
-        projection_group = create_projection_node_group(active_camera)
-        material_name = f"mat_projection_{selected_obj.name}"; material = bpy.data.materials.get(material_name)
-        if not material: material = bpy.data.materials.new(name=material_name); material.use_nodes = True
-        tree = material.node_tree; tree.nodes.clear(); links = tree.links
-        proj_group_node = tree.nodes.new('ShaderNodeGroup'); proj_group_node.node_tree = projection_group; proj_group_node.location = (-500, 200)
-        tex_image_node = tree.nodes.new('ShaderNodeTexImage'); tex_image_node.extension = 'EXTEND'; tex_image_node.location = (-250, 300)
-        emission = tree.nodes.new('ShaderNodeEmission'); emission.location = (0, 300); transparent = tree.nodes.new('ShaderNodeBsdfTransparent'); transparent.location = (0, 100); mix_shader = tree.nodes.new('ShaderNodeMixShader'); mix_shader.location = (250, 200); output = tree.nodes.new('ShaderNodeOutputMaterial'); output.location = (500, 200)
-        links.new(proj_group_node.outputs['Vector'], tex_image_node.inputs['Vector']); links.new(tex_image_node.outputs['Color'], emission.inputs['Color']); links.new(tex_image_node.outputs['Alpha'], mix_shader.inputs['Fac']); links.new(transparent.outputs['BSDF'], mix_shader.inputs[1]); links.new(emission.outputs['Emission'], mix_shader.inputs[2]); links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
-        tex_image_node.image = image; img_user = tex_image_node.image_user; img_user.use_auto_refresh = True
-        if image.source in {'SEQUENCE', 'MOVIE'}:
-            img_user.use_cyclic = True; img_user.frame_duration = scene.frame_end - scene.frame_start + 1; img_user.frame_start = scene.frame_start
-            if image.source == 'SEQUENCE':
-                first_frame = get_frame_number_from_path(image.filepath_raw)
-                img_user.frame_offset = first_frame - 1 if first_frame is not None else 0
-            else: img_user.frame_offset = 0
-        if selected_obj.data.materials: selected_obj.data.materials[0] = material
-        else: selected_obj.data.materials.append(material)
-        self.report({'INFO'}, f"Material '{material.name}' has been set up."); return {'FINISHED'}
+            status = start_proxy_build(clip, levels, self.workers, self.rebuild)
+        except (ValueError, OSError) as e:
+            self.report({'ERROR'}, f"Failed to build proxies: {e}")
+            return {'CANCELLED'}
+        if not status["total"]:
+            self.report({'INFO'}, f"Proxies for '{clip.name}' are up to date.")
+            return {'FINISHED'}
+        self.report({'INFO'}, f"Building proxies for {status['total']} frame(s) of '{clip.name}' in the background.")
+        return {'FINISHED'}
+
+class CLIP_OT_reset_prefetch_stats(bpy.types.Operator):
+    """Resets the plate prefetch counters and forgets which frames were read ahead."""
+    bl_idname = "clip.reset_prefetch_stats"
+    bl_label = "Reset Prefetch Counters"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        from .prefetch import reset_prefetch
+        reset_prefetch()
+        return {'FINISHED'}
+
+class CLIP_OT_reclaim_memory(bpy.types.Operator):
+    """Reports the memory held by plates, frees plates that are not shown and purges data of deleted clips."""
+    bl_idname = "clip.reclaim_memory"
+    bl_label = "Reclaim Plate Memory"
+    bl_description = "Estimates the memory of every plate, frees the buffers of plates not on visible objects and removes data generated for deleted clips"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    free_hidden: bpy.props.BoolProperty(name="Free Hidden Plates", description="Free the image buffers and GPU textures of plates not used by visible objects; they reload when shown again", default=True)
+    purge: bpy.props.BoolProperty(name="Purge Deleted Clips", description="Remove the unused plate images, materials and projection node groups generated for clips that no longer exist", default=True)
+    write_text: bpy.props.BoolProperty(name="Memory Report", description="Write per-clip and per-plate tables to the 'Clip Tools Memory' text", default=True)
+
+    def execute(self, context):
+        from .memory import reclaim_memory, format_bytes
+        summary = reclaim_memory(context.scene, self.free_hidden, self.purge, self.write_text)
+        purged = summary["purged"]
+        text = f" Report in text '{summary['text'].name}'." if summary["text"] else ""
+        self.report({'INFO'}, f"{summary['plates']} plate(s) hold about {format_bytes(summary['ram'])} RAM and {format_bytes(summary['vram'])} VRAM; "
+                              f"freed {summary['freed']} ({format_bytes(summary['freed_bytes'])}), purged {purged['images']} image(s), "
+                              f"{purged['materials']} material(s), {purged['node_groups']} node group(s).{text}")
+        return {'FINISHED'}
+
+class CLIP_OT_clear_timing_records(bpy.types.Operator):
+    """Clears the timing records shown in the Clip Tools Timing panel."""
+    bl_idname = "clip.clear_timing_records"
+    bl_label = "Clear Timing Records"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        timing_records.clear()
+        return {'FINISHED'}
+
+class ClipToolsPreferences(bpy.types.AddonPreferences):
+    """Addon preferences for Clip Tools."""
+    bl_idname = __package__
+
+    enable_instrumentation: bpy.props.BoolProperty(
+        name="Time Operators",
+        description="Record wall time per phase, created objects/nodes/drivers and depsgraph cost of every Clip Tools operator",
+        default=False
+    )
+    use_profiler: bpy.props.BoolProperty(
+        name="Write cProfile Dumps",
+        description="Also profile each operator run and save a .prof file next to the log",
+        default=False
+    )
+    log_path: bpy.props.StringProperty(
+        name="Timing Log",
+        description="File the timing records are appended to as JSON lines (default: clip_tools_timing.log in the temp folder)",
+        subtype='FILE_PATH',
+        default=""
+    )
+
+    proxy_directory: bpy.props.StringProperty(
+        name="Proxy Cache",
+        description="Folder for plate proxies (default: clip_tools_proxies next to the .blend file)",
+        subtype='DIR_PATH',
+        default=""
+    )
+
+    prefetch_enabled: bpy.props.BoolProperty(
+        name="Prefetch Plate Frames",
+        description="During playback, read the next frames of image plane and projection sequences ahead in background threads",
+        default=False
+    )
+    prefetch_window: bpy.props.IntProperty(
+        name="Frames Ahead",
+        description="Number of upcoming frames read ahead",
+        default=24, min=1, soft_max=200
+    )
+    prefetch_threads: bpy.props.IntProperty(
+        name="Threads",
+        description="Files read at once",
+        default=4, min=1, max=32
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "proxy_directory")
+        col = layout.column()
+        col.prop(self, "prefetch_enabled")
+        row = col.row(align=True); row.active = self.prefetch_enabled
+        row.prop(self, "prefetch_window"); row.prop(self, "prefetch_threads")
+        col = layout.column()
+        col.prop(self, "enable_instrumentation")
+        sub = col.column(); sub.active = self.enable_instrumentation
+        sub.prop(self, "use_profiler")
+        sub.prop(self, "log_path")
+        sub.label(text=f"Logging to: {get_timing_log_path()}", icon='INFO')
 
 # --- UI Panels ---
 class CLIP_PT_tools_scenesetup(Panel):
@@ -496,24 +964,88 @@ class CLIP_PT_tools_scenesetup(Panel):
 
     def draw(self, context):
         layout = self.layout
+        sc = context.space_data
         col = layout.column(align=True)
         col.operator("clip.set_viewport_background", icon='HIDE_OFF')
         col.operator("clip.setup_tracking_scene", icon='SCENE_DATA')
         col.separator()
         col.operator(CLIP_OT_setup_camera_solver.bl_idname, icon='CON_CAMERASOLVER')
         col.operator(CLIP_OT_setup_object_solver.bl_idname, icon='CON_OBJECTSOLVER')
+        col.operator(CLIP_OT_batch_scene_setup.bl_idname, icon='LINENUMBERS_ON')
+        col.separator()
+        col.prop(context.scene, "clip_tools_proxy_resolution", text="Viewport Plate")
+        col.operator(CLIP_OT_build_proxies.bl_idname, icon='RENDER_RESULT')
+        status = get_proxy_build_status(sc.clip)
+        if status:
+            col.label(text=f"Building proxies: {status['done']}/{status['total']}", icon='TIME')
+        prefs = get_addon_preferences()
+        prefetch = sys.modules.get(f"{__name__}.prefetch")
+        if prefs and prefs.prefetch_enabled and prefetch:
+            stats = prefetch.prefetch_stats
+            row = col.row(align=True)
+            row.label(text=f"Prefetch: {stats['hits']} hits, {stats['misses']} misses", icon='FILE_REFRESH')
+            row.operator(CLIP_OT_reset_prefetch_stats.bl_idname, text="", icon='LOOP_BACK')
+        col.operator(CLIP_OT_reclaim_memory.bl_idname, icon='MEMORY')
+
+class CLIP_PT_tools_timing(Panel):
+    """UI Panel summarizing the latest instrumented Clip Tools operator runs."""
+    bl_space_type = 'CLIP_EDITOR'
+    bl_region_type = 'TOOLS'
+    bl_label = "Clip Tools Timing"
+    bl_category = "Solve"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return is_instrumentation_enabled()
+
+    def draw(self, context):
+        layout = self.layout
+        if not timing_records:
+            layout.label(text="Run a Clip Tools operator to record timings.")
+        for record in list(timing_records)[:5]:
+            box = layout.box(); col = box.column(align=True)
+            col.label(text=f"{record['operator']}: {record['seconds'] * 1000:.1f} ms", icon='TIME')
+            for name, phase in sorted(record["phases"].items(), key=lambda item: -item[1]["seconds"])[:4]:
+                col.label(text=f"  {name}: {phase['seconds'] * 1000:.1f} ms ({phase['calls']}x)")
+            created = record["created"]
+            col.label(text=f"  +{created['objects']} objects, +{created['nodes']} nodes, +{created['drivers']} drivers")
+            col.label(text=f"  Depsgraph: {record['depsgraph_seconds'] * 1000:.1f} ms")
+        row = layout.row()
+        row.operator(CLIP_OT_clear_timing_records.bl_idname, icon='TRASH')
 
 # --- UI and Registration ---
-def draw_button_for_3d_markers_to_empty_panel(self, context): self.layout.operator(CLIP_OT_3d_markers_to_empty.bl_idname, icon='EMPTY_AXIS')
-def draw_menu_item_for_3d_markers_to_empty(self, context): self.layout.separator(); self.layout.operator(CLIP_OT_3d_markers_to_empty.bl_idname, icon='EMPTY_AXIS')
-def draw_button_for_set_start_frame_panel(self, context): self.layout.operator(CLIP_OT_set_start_frame_from_filename.bl_idname)
-def draw_menu_item_for_setup_solvers(self, context): self.layout.operator(CLIP_OT_setup_camera_solver.bl_idname, icon='CON_CAMERASOLVER'); self.layout.operator(CLIP_OT_setup_object_solver.bl_idname, icon='CON_OBJECTSOLVER'); self.layout.separator()
-def draw_menu_item_for_duplicate_clip(self, context): self.layout.operator(CLIP_OT_duplicate_active_movieclip.bl_idname, icon='DUPLICATE')
-def draw_menu_item_for_delete_clip(self, context): self.layout.operator(CLIP_OT_delete_active_movieclip.bl_idname, icon='TRASH')
-def draw_button_for_create_image_plane(self, context): self.layout.operator(CLIP_OT_create_image_plane_from_clip.bl_idname, text="Create Image Plane", icon='FILE_IMAGE')
-def draw_menu_item_for_create_image_plane(self, context): self.layout.operator(CLIP_OT_create_image_plane_from_clip.bl_idname, icon='FILE_IMAGE')
-def draw_button_for_set_cam_projection_panel(self, context): self.layout.operator(PROJECTION_OT_setup_shader.bl_idname, text="Set Cam Projection", icon='MATERIAL')
-def draw_menu_item_for_set_cam_projection(self, context): self.layout.separator(); self.layout.operator(PROJECTION_OT_setup_shader.bl_idname, icon='MATERIAL')
+# Draw callbacks run on every redraw of the stock Clip Editor panels and menus, so each target gets
+# a single callback that only lays out operator buttons.
+def draw_tools_geometry_buttons(self, context):
+    layout = self.layout
+    layout.operator(CLIP_OT_3d_markers_to_empty.bl_idname, icon='EMPTY_AXIS')
+    layout.operator(CLIP_OT_create_image_plane_from_clip.bl_idname, text="Create Image Plane", icon='FILE_IMAGE')
+    layout.operator(PROJECTION_OT_setup_shader.bl_idname, text="Set Cam Projection", icon='MATERIAL')
+    layout.operator(CLIP_OT_apply_lens_distortion.bl_idname, icon='MOD_LATTICE')
+
+def draw_tools_clip_buttons(self, context): self.layout.operator(CLIP_OT_set_start_frame_from_filename.bl_idname)
+
+def draw_reconstruction_menu_items(self, context):
+    layout = self.layout
+    layout.separator(); layout.operator(CLIP_OT_analyze_reprojection_error.bl_idname, icon='SORTSIZE')
+    layout.operator(CLIP_OT_select_duplicate_bundles.bl_idname, icon='AUTOMERGE_OFF')
+    layout.operator(CLIP_OT_select_tracks_near.bl_idname, icon='PIVOT_CURSOR')
+    layout.operator(CLIP_OT_select_tracks_inside_mesh.bl_idname, icon='MESH_CUBE')
+    layout.separator(); layout.operator(CLIP_OT_3d_markers_to_empty.bl_idname, icon='EMPTY_AXIS')
+    layout.operator(CLIP_OT_create_image_plane_from_clip.bl_idname, icon='FILE_IMAGE')
+    layout.separator(); layout.operator(PROJECTION_OT_setup_shader.bl_idname, icon='MATERIAL')
+    layout.operator(CLIP_OT_apply_lens_distortion.bl_idname, icon='MOD_LATTICE')
+
+def draw_clip_menu_items(self, context):
+    layout = self.layout
+    layout.operator(CLIP_OT_setup_camera_solver.bl_idname, icon='CON_CAMERASOLVER'); layout.operator(CLIP_OT_setup_object_solver.bl_idname, icon='CON_OBJECTSOLVER')
+    layout.operator(CLIP_OT_batch_scene_setup.bl_idname, text="Batch Scene Setup...", icon='LINENUMBERS_ON'); layout.separator()
+    layout.operator(CLIP_OT_duplicate_active_movieclip.bl_idname, icon='DUPLICATE')
+    layout.operator(CLIP_OT_delete_active_movieclip.bl_idname, icon='TRASH')
+    layout.operator(CLIP_OT_reclaim_memory.bl_idname, icon='MEMORY')
+    layout.separator(); layout.operator(CLIP_OT_export_markers.bl_idname, text="Export 2D Markers...", icon='EXPORT')
+    layout.operator(CLIP_OT_export_camera_solve.bl_idname, text="Export Camera Solve...", icon='EXPORT')
 
 classes_to_register = (
     CLIP_OT_setup_camera_solver,
@@ -524,25 +1056,56 @@ classes_to_register = (
     CLIP_OT_delete_active_movieclip, 
     CLIP_OT_create_image_plane_from_clip, 
     PROJECTION_OT_setup_shader,
+    CLIP_OT_apply_lens_distortion,
+    ClipToolsCameraMapping,
+    CLIP_OT_batch_scene_setup,
+    CLIP_OT_analyze_reprojection_error,
+    CLIP_OT_select_duplicate_bundles,
+    CLIP_OT_select_tracks_near,
+    CLIP_OT_select_tracks_inside_mesh,
+    CLIP_OT_export_markers,
+    CLIP_OT_export_camera_solve,
+    CLIP_OT_build_proxies,
+    CLIP_OT_reset_prefetch_stats,
+    CLIP_OT_reclaim_memory,
+    CLIP_OT_clear_timing_records,
+    ClipToolsPreferences,
     CLIP_PT_tools_scenesetup,
+    CLIP_PT_tools_timing,
 )
 
 ui_additions = [
-    ("CLIP_PT_tools_geometry", draw_button_for_3d_markers_to_empty_panel), 
-    ("CLIP_PT_tools_geometry", draw_button_for_create_image_plane),
-    ("CLIP_PT_tools_geometry", draw_button_for_set_cam_projection_panel),
-    ("CLIP_PT_tools_clip", draw_button_for_set_start_frame_panel),
-    ("CLIP_MT_reconstruction", draw_menu_item_for_3d_markers_to_empty),
-    ("CLIP_MT_reconstruction", draw_menu_item_for_create_image_plane), 
-    ("CLIP_MT_reconstruction", draw_menu_item_for_set_cam_projection),
-    ("CLIP_MT_clip", draw_menu_item_for_setup_solvers),
-    ("CLIP_MT_clip", draw_menu_item_for_duplicate_clip), 
-    ("CLIP_MT_clip", draw_menu_item_for_delete_clip), 
+    ("CLIP_PT_tools_geometry", draw_tools_geometry_buttons),
+    ("CLIP_PT_tools_clip", draw_tools_clip_buttons),
+    ("CLIP_MT_reconstruction", draw_reconstruction_menu_items),
+    ("CLIP_MT_clip", draw_clip_menu_items),
+]
+
+app_handlers = [
+    (bpy.app.handlers.render_init, use_full_resolution_for_render),
+    (bpy.app.handlers.render_complete, restore_viewport_resolution),
+    (bpy.app.handlers.render_cancel, restore_viewport_resolution),
+    (bpy.app.handlers.frame_change_post, prefetch_plate_frames),
+    (bpy.app.handlers.load_post, clear_solve_caches),
+    (bpy.app.handlers.load_post, load_viewport_resolution),
+    (bpy.app.handlers.save_pre, save_viewport_resolution),
+    (bpy.app.handlers.save_post, resume_render_resolution),
 ]
 
 def register():
     """Registers all addon classes and appends UI elements."""
-    for cls in classes_to_register: bpy.utils.register_class(cls)
+    for cls in classes_to_register:
+        if issubclass(cls, Operator): instrument_operator(cls)
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.clip_tools_proxy_resolution = bpy.props.EnumProperty(
+        name="Viewport Plate",
+        description="Resolution of the plate shown on image planes and projection materials; renders always use Full",
+        items=[('FULL', "Full", "Original footage"), ('HALF', "1/2", "Half resolution proxy"), ('QUARTER', "1/4", "Quarter resolution proxy")],
+        default='FULL',
+        update=update_proxy_resolution
+    )
+    for handlers, handler in app_handlers:
+        handlers.append(handler)
     for target_classname, draw_func in ui_additions:
         try:
             target_class = getattr(bpy.types, target_classname, None)
@@ -556,4 +1119,9 @@ def unregister():
             target_class = getattr(bpy.types, target_classname, None)
             if target_class and hasattr(target_class, "remove"): target_class.remove(draw_func)
         except (AttributeError, RuntimeError): pass
-    for cls in reversed(classes_to_register): bpy.utils.unregister_class(cls)
\ No newline at end of file
+    for handlers, handler in app_handlers:
+        if handler in handlers: handlers.remove(handler)
+    prefetch = sys.modules.get(f"{__name__}.prefetch")
+    if prefetch: prefetch.shutdown_prefetch()
+    del bpy.types.Scene.clip_tools_proxy_resolution
+    for cls in reversed(classes_to_register): bpy.utils.unregister_class(cls)
@@ -0,0 +1,63 @@
+# Clip_Tools - Animation
+#
+# Sampling animated properties and writing baked F-curves in bulk.
+
+import numpy as np
+from .instrumentation import instrumented
+
+def get_action_fcurves(id_data):
+    """Returns the F-curve collection driving an ID, or None if it has no action."""
+    anim_data = id_data.animation_data
+    if not anim_data or not anim_data.action:
+        return None
+    action = anim_data.action
+    slot = getattr(anim_data, "action_slot", None)
+    if slot is not None:
+        # Blender 4.4+ layered actions keep their F-curves in per-slot channelbags.
+        try:
+            from bpy_extras import anim_utils
+            channelbag = anim_utils.action_get_channelbag_for_slot(action, slot)
+            if channelbag is not None:
+                return channelbag.fcurves
+        except (ImportError, AttributeError):
+            pass
+    return action.fcurves
+
+def sample_property(id_data, data_path, frames, index=-1):
+    """Samples an (optionally animated) property over the given frames as a float array."""
+    fcurves = get_action_fcurves(id_data)
+    fcurve = fcurves.find(data_path, index=max(index, 0)) if fcurves else None
+    if fcurve is not None:
+        return np.fromiter((fcurve.evaluate(f) for f in frames), dtype=np.float64, count=len(frames))
+    value = id_data.path_resolve(data_path)
+    if index >= 0:
+        value = value[index]
+    return np.full(len(frames), float(value), dtype=np.float64)
+
+def read_fcurve_samples(id_data, data_path, index):
+    """Reads a baked property's keys in bulk as (frames, values) arrays, or None when it is not keyed."""
+    fcurves = get_action_fcurves(id_data)
+    fcurve = fcurves.find(data_path, index=index) if fcurves else None
+    if fcurve is None:
+        return None
+    points = fcurve.keyframe_points
+    co = np.empty(len(points) * 2, dtype=np.float32)
+    points.foreach_get("co", co)
+    co = co.reshape(-1, 2)
+    return co[:, 0], co[:, 1]
+
+@instrumented
+def write_fcurve_samples(id_data, data_path, index, frames, values):
+    """Replaces any driver or keys on a property with one linear key per frame, written in bulk."""
+    id_data.driver_remove(data_path, index)
+    id_data.keyframe_insert(data_path, index=index, frame=float(frames[0]))
+    fcurve = get_action_fcurves(id_data).find(data_path, index=index)
+    points = fcurve.keyframe_points
+    points.clear()
+    points.add(len(frames))
+    co = np.empty((len(frames), 2), dtype=np.float32)
+    co[:, 0] = frames; co[:, 1] = values
+    points.foreach_set("co", co.ravel())
+    points.foreach_set("interpolation", np.ones(len(frames), dtype=np.int32))  # 'LINEAR'
+    fcurve.update()
+    return fcurve
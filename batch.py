@@ -0,0 +1,261 @@
+# Clip_Tools - Headless batch runner
+#
+# Applies Clip Tools setups to many .blend files without opening the UI.
+#
+# Orchestrator (any Python 3, including Blender's bundled one):
+#   python batch.py shots.json --blender /path/to/blender --workers 4 --output results/
+#
+# Every shot runs in its own background Blender process:
+#   blender -b shot.blend --python batch.py -- --run-shot results/shot.job.json
+#
+# A manifest is either a plain text shot list (one .blend path per line) or a JSON file:
+#   {
+#     "steps": ["camera_solver", "image_plane", "projection", "markers_to_empty"],
+#     "options": {"image_plane": {"depth": 10.0, "mode": "BAKED"}},
+#     "shots": [
+#       "shots/sh010.blend",
+#       {"blend": "shots/sh020.blend", "name": "sh020", "clip": "sh020_plate", "camera": "Camera",
+#        "steps": ["camera_solver"], "save_as": "out/sh020_setup.blend"}
+#     ]
+#   }
+#
+# Shot names default to the .blend file name. They name the <name>.job.json and <name>.json files in the
+# output folder, so they must be unique and not "summary"; set "name" for shots with the same file name.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+STEPS = ("camera_solver", "image_plane", "projection", "markers_to_empty")
+
+
+# --- Manifest Handling ---
+
+def load_manifest(path):
+    """Reads a JSON manifest or a plain shot list and returns it in the JSON layout."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.lower().endswith(".json"):
+        manifest = json.loads(text)
+    else:
+        lines = (line.strip() for line in text.splitlines())
+        manifest = {"shots": [line for line in lines if line and not line.startswith("#")]}
+    base_dir = os.path.dirname(os.path.abspath(path))
+    shots = []
+    # Shot names name the job and result files in one output folder, next to summary.json.
+    names = {"summary": "summary.json"}
+    for shot in manifest.get("shots", []):
+        shot = {"blend": shot} if isinstance(shot, str) else dict(shot)
+        shot["blend"] = os.path.normpath(os.path.join(base_dir, shot["blend"]))
+        shot.setdefault("name", os.path.splitext(os.path.basename(shot["blend"]))[0])
+        key = shot["name"].casefold()
+        if key in names:
+            raise ValueError(f"Shot name '{shot['name']}' of '{shot['blend']}' is already used by '{names[key]}'; "
+                             f"give the shot a unique \"name\" in a JSON manifest.")
+        names[key] = shot["blend"]
+        shots.append(shot)
+    manifest["shots"] = shots
+    return manifest
+
+
+def build_jobs(manifest, steps=None):
+    """Merges manifest-wide defaults into one job description per shot."""
+    default_steps = steps or manifest.get("steps") or list(STEPS)
+    default_options = manifest.get("options", {})
+    jobs = []
+    for shot in manifest["shots"]:
+        job = dict(shot)
+        job["steps"] = list(shot.get("steps") or default_steps)
+        unknown = [s for s in job["steps"] if s not in STEPS]
+        if unknown:
+            raise ValueError(f"Shot '{shot['name']}': unknown step(s) {unknown}; expected {list(STEPS)}")
+        job["options"] = {**default_options, **shot.get("options", {})}
+        jobs.append(job)
+    return jobs
+
+
+# --- Orchestrator (no bpy) ---
+
+def run_job_in_blender(blender, job, output_dir, timeout=None):
+    """Runs one shot in a background Blender process and returns its result dictionary."""
+    job_path = os.path.join(output_dir, f"{job['name']}.job.json")
+    result_path = os.path.join(output_dir, f"{job['name']}.json")
+    job = dict(job, result_path=result_path)
+    with open(job_path, "w", encoding="utf-8") as f:
+        json.dump(job, f, indent=2)
+    if os.path.exists(result_path):
+        os.remove(result_path)
+    command = [blender, "-b", job["blend"], "--python", os.path.abspath(__file__), "--", "--run-shot", job_path]
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        returncode, stderr = process.returncode, process.stderr
+    except subprocess.TimeoutExpired as e:
+        returncode, stderr = None, f"Timed out after {e.timeout} s"
+    elapsed = time.perf_counter() - start
+    if os.path.exists(result_path):
+        with open(result_path, encoding="utf-8") as f:
+            result = json.load(f)
+    else:
+        # Blender crashed or never reached the script; record what we know.
+        result = {"shot": job["name"], "blend": job["blend"], "ok": False, "steps": [],
+                  "error": f"No result written (exit code {returncode}): {(stderr or '')[-2000:]}"}
+        with open(result_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    result["process_seconds"] = elapsed
+    return result
+
+
+def run_batch(jobs, blender, output_dir, workers=None, timeout=None):
+    """Fans the jobs out over a pool of background Blender processes and writes summary.json."""
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    results = []
+    # Each task only waits on its own Blender subprocess, so threads are enough to drive the process pool.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job_in_blender, blender, job, output_dir, timeout): job for job in jobs}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = "OK" if result.get("ok") else "FAILED"
+            print(f"[{status}] {result['shot']} ({result['process_seconds']:.1f} s)")
+    results.sort(key=lambda r: r["shot"])
+    summary = {"workers": workers, "shots": len(results), "failed": sum(not r.get("ok") for r in results), "results": results}
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+# --- Worker (inside Blender) ---
+
+def load_addon():
+    """Imports the Clip Tools package this script lives in, without registering its UI."""
+    import importlib.util
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    name = "clip_tools_batch"
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(package_dir, "__init__.py"), submodule_search_locations=[package_dir])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _step_camera_solver(addon, scene, clip, camera, job):
+    constraint = addon.setup_camera_solver(camera, clip)
+    return {"created": 0 if constraint is None else 1}
+
+
+def _step_image_plane(addon, scene, clip, camera, job):
+    options = job["options"].get("image_plane", {})
+    addon.create_image_plane(scene, scene.collection, camera, clip, options.get("depth", 10.0), options.get("mode", 'BAKED'))
+    return {"created": 1}
+
+
+def _step_projection(addon, scene, clip, camera, job):
+    import bpy
+    options = job["options"].get("projection", {})
+    names = options.get("objects")
+    if names:
+        objects = [bpy.data.objects[n] for n in names]
+    else:
+        objects = [o for o in scene.objects if o.type == 'MESH' and o.select_get() and not o.name.startswith("ImagePlane_")]
+    if not objects:
+        raise ValueError("No target meshes: list them in options.projection.objects or save the file with them selected.")
+    materials = addon.setup_projection(camera, clip, objects, shared=options.get("shared", True))
+    return {"objects": len(objects), "materials": len(materials)}
+
+
+def _step_markers_to_empty(addon, scene, clip, camera, job):
+    options = job["options"].get("markers_to_empty", {})
+    tracking_objects = clip.tracking.objects
+    tracking_object = tracking_objects[options["tracking_object"]] if "tracking_object" in options else tracking_objects.active
+    if options.get("sync", False):
+        world_matrix = addon.get_tracking_world_matrix(scene, clip, tracking_object)
+        summary = addon.sync_track_empties(scene, scene.collection, clip, tracking_object, world_matrix, options.get("animated", False),
+                                           options.get("selected_only", False), options.get("remove_missing", False))
+        return {key: summary[key] for key in ("created", "updated", "unchanged", "missing", "removed")}
+    created = addon.markers_to_empty(scene, scene.collection, clip, tracking_object, options.get("output", 'EMPTIES'),
+                                     options.get("animated", False), options.get("selected_only", False))
+    return {"created": len(created)}
+
+
+STEP_FUNCTIONS = {
+    "camera_solver": _step_camera_solver,
+    "image_plane": _step_image_plane,
+    "projection": _step_projection,
+    "markers_to_empty": _step_markers_to_empty,
+}
+
+
+def run_shot(job):
+    """Applies the job's steps to the open .blend file, saves it and writes the per-shot result JSON."""
+    import bpy
+    start = time.perf_counter()
+    result = {"shot": job["name"], "blend": job["blend"], "ok": True, "steps": []}
+    try:
+        addon = load_addon()
+        scene = bpy.data.scenes[job["scene"]] if "scene" in job else bpy.context.scene
+        clip = bpy.data.movieclips[job["clip"]] if "clip" in job else (scene.active_clip or next(iter(bpy.data.movieclips), None))
+        camera = scene.objects[job["camera"]] if "camera" in job else scene.camera
+        if clip is None or camera is None:
+            raise ValueError(f"Shot needs a movie clip and a camera (clip={clip}, camera={camera}).")
+        result.update(clip=clip.name, camera=camera.name)
+        for step in job["steps"]:
+            step_start = time.perf_counter()
+            entry = {"name": step, "ok": True}
+            try:
+                entry.update(STEP_FUNCTIONS[step](addon, scene, clip, camera, job))
+            except Exception as e:
+                entry.update(ok=False, error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+                result["ok"] = False
+            entry["seconds"] = time.perf_counter() - step_start
+            result["steps"].append(entry)
+        if job.get("save", True) and any(s["ok"] for s in result["steps"]):
+            save_start = time.perf_counter()
+            bpy.ops.wm.save_as_mainfile(filepath=job.get("save_as") or bpy.data.filepath)
+            result["save_seconds"] = time.perf_counter() - save_start
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+    result["seconds"] = time.perf_counter() - start
+    with open(job["result_path"], "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+# --- Command Line ---
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Apply Clip Tools setups to many .blend files in background Blender processes.")
+    parser.add_argument("manifest", nargs="?", help="JSON manifest or text file with one .blend path per line")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable (default: $BLENDER or 'blender')")
+    parser.add_argument("--workers", type=int, default=None, help="Number of Blender processes running at once")
+    parser.add_argument("--steps", default=None, help=f"Comma separated steps, overriding the manifest ({', '.join(STEPS)})")
+    parser.add_argument("--output", default="clip_tools_batch", help="Directory for per-shot result JSON files")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a shot's Blender process is killed")
+    parser.add_argument("--run-shot", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_shot:
+        with open(args.run_shot, encoding="utf-8") as f:
+            result = run_shot(json.load(f))
+        sys.exit(0 if result["ok"] else 1)
+    if not args.manifest:
+        parser.error("a manifest is required")
+    steps = args.steps.split(",") if args.steps else None
+    jobs = build_jobs(load_manifest(args.manifest), steps)
+    summary = run_batch(jobs, args.blender, args.output, args.workers, args.timeout)
+    print(f"{summary['shots'] - summary['failed']}/{summary['shots']} shots succeeded. Results in '{args.output}'.")
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,596 @@
+# Clip_Tools - Lightweight bpy / mathutils stand-in for benchmarks
+#
+# Implements just enough of the data API used by the addon's setup functions for them
+# to run in plain Python (e.g. CI without Blender). Timings under this stand-in measure
+# the addon's own Python overhead and how it scales, not Blender's internal cost.
+
+import math
+import sys
+import types
+
+
+class _LazyNumpy:
+    """Defers importing NumPy so startup measurements are not skewed by the stand-in itself."""
+    def __getattr__(self, name):
+        import numpy
+        return getattr(numpy, name)
+
+
+np = _LazyNumpy()
+
+
+# --- mathutils ---
+
+class Vector:
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._v = np.array(values, dtype=np.float64)
+
+    def __len__(self): return len(self._v)
+    def __getitem__(self, i): return float(self._v[i])
+    def __setitem__(self, i, value): self._v[i] = value
+    def __iter__(self): return iter(self._v.tolist())
+    def __array__(self, dtype=None, copy=None): return np.asarray(self._v, dtype=dtype)
+    def __repr__(self): return f"Vector({tuple(self._v.tolist())})"
+
+
+class Matrix:
+    def __init__(self, rows=None):
+        self._m = np.identity(4) if rows is None else np.array(rows, dtype=np.float64)
+
+    @classmethod
+    def Identity(cls, size):
+        return cls(np.identity(size))
+
+    def __matmul__(self, other):
+        if isinstance(other, Matrix):
+            return Matrix(self._m @ other._m)
+        v = np.asarray(other, dtype=np.float64)
+        if len(v) == 3 and len(self._m) == 4:
+            return Vector((self._m @ np.append(v, 1.0))[:3])
+        return Vector(self._m @ v)
+
+    def inverted(self): return Matrix(np.linalg.inv(self._m))
+    def inverted_safe(self): return Matrix(np.linalg.pinv(self._m))
+    def to_scale(self): return Vector(np.linalg.norm(self._m[:3, :3], axis=0))
+    def copy(self): return Matrix(self._m.copy())
+    def __len__(self): return len(self._m)
+    def __getitem__(self, i): return self._m[i]
+    def __array__(self, dtype=None, copy=None): return np.asarray(self._m, dtype=dtype)
+    def __bool__(self): return True
+
+
+class KDTree:
+    """Brute-force stand-in for mathutils.kdtree.KDTree (same results, linear-time queries)."""
+    def __init__(self, size):
+        self._co = []; self._index = []
+
+    def insert(self, co, index): self._co.append(tuple(co)); self._index.append(index)
+    def balance(self): self._points = np.array(self._co, dtype=np.float64).reshape(-1, 3)
+
+    def find_range(self, co, radius):
+        distance = np.linalg.norm(self._points - np.asarray(co, dtype=np.float64), axis=1)
+        return [(Vector(self._points[i]), self._index[i], float(distance[i])) for i in np.flatnonzero(distance <= radius)]
+
+
+# --- Data API building blocks ---
+
+class Struct:
+    """Plain attribute bag; unknown attributes are simply stored on assignment."""
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def __getitem__(self, key): return self.__dict__.setdefault("_idprops", {})[key]
+    def __setitem__(self, key, value): self.__dict__.setdefault("_idprops", {})[key] = value
+    def __delitem__(self, key): del self.__dict__.setdefault("_idprops", {})[key]
+    def __contains__(self, key): return key in self.__dict__.get("_idprops", {})
+    def get(self, key, default=None): return self.__dict__.get("_idprops", {}).get(key, default)
+
+    def path_resolve(self, path):
+        value = self
+        for part in path.split("."):
+            value = getattr(value, part)
+        return value
+
+
+class Collection(list):
+    """List with the name lookups of bpy_prop_collection."""
+    def __init__(self, factory=None):
+        super().__init__()
+        self._factory = factory
+
+    def get(self, key, default=None):
+        return next((item for item in self if getattr(item, "name", None) == key), default)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            item = self.get(key)
+            if item is None:
+                raise KeyError(key)
+            return item
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return self.get(key) is not None
+        return super().__contains__(key)
+
+    def new(self, *args, **kwargs):
+        item = self._factory(*args, **kwargs)
+        self.append(item)
+        return item
+
+    def foreach_set(self, attr, seq):
+        values = np.asarray(seq)
+        values = values.reshape(len(self), -1) if len(self) else values
+        for item, value in zip(self, values):
+            setattr(item, attr, value[0] if len(value) == 1 else value)
+
+    def foreach_get(self, attr, buf):
+        buf[:] = np.ravel([getattr(item, attr) for item in self])
+
+
+class DriverVariable(Struct):
+    def __init__(self):
+        super().__init__(name="var", type='SINGLE_PROP', targets=[Struct(id_type='OBJECT', id=None, data_path="",
+                                                                           transform_type='LOC_X', transform_space='WORLD_SPACE')])
+
+
+class Driver(Struct):
+    def __init__(self):
+        super().__init__(type='SCRIPTED', expression="", variables=Collection(DriverVariable))
+
+
+class KeyframePoints:
+    def __init__(self):
+        self.co = np.empty((0, 2)); self.interpolation = np.empty(0, dtype=np.int32)
+
+    def __len__(self): return len(self.co)
+    def add(self, count):
+        self.co = np.concatenate((self.co, np.zeros((count, 2))))
+        self.interpolation = np.concatenate((self.interpolation, np.full(count, 2, dtype=np.int32)))
+    def clear(self): self.__init__()
+    def insert(self, frame, value): self.add(1); self.co[-1] = (frame, value)
+    def foreach_set(self, attr, seq):
+        setattr(self, attr, np.asarray(seq).reshape(getattr(self, attr).shape))
+    def foreach_get(self, attr, buf):
+        buf[:] = getattr(self, attr).ravel()
+
+
+class FCurve(Struct):
+    def __init__(self, data_path, index=0):
+        super().__init__(data_path=data_path, array_index=index, driver=Driver(), keyframe_points=KeyframePoints())
+
+    def evaluate(self, frame):
+        co = self.keyframe_points.co
+        return float(np.interp(frame, co[:, 0], co[:, 1])) if len(co) else 0.0
+
+    def update(self):
+        order = np.argsort(self.keyframe_points.co[:, 0], kind="stable")
+        self.keyframe_points.co = self.keyframe_points.co[order]
+
+
+class FCurves(Collection):
+    def __init__(self):
+        super().__init__(FCurve)
+
+    def find(self, data_path, index=0):
+        return next((f for f in self if f.data_path == data_path and f.array_index == index), None)
+
+
+class AnimData(Struct):
+    def __init__(self):
+        super().__init__(action=None, drivers=FCurves())
+
+
+class ID(Struct):
+    def __init__(self, name="", **kwargs):
+        super().__init__(name=name, users=1, animation_data=None, use_fake_user=False, **kwargs)
+
+    def animation_data_create(self):
+        if self.animation_data is None:
+            self.animation_data = AnimData()
+        return self.animation_data
+
+    def driver_add(self, data_path, index=-1):
+        anim_data = self.animation_data_create()
+        fcurve = anim_data.drivers.find(data_path, max(index, 0))
+        if fcurve is None:
+            fcurve = anim_data.drivers.new(data_path, max(index, 0))
+        return fcurve
+
+    def driver_remove(self, data_path, index=-1):
+        if self.animation_data:
+            drivers = self.animation_data.drivers
+            drivers[:] = [d for d in drivers if not (d.data_path == data_path and (index < 0 or d.array_index == index))]
+        return True
+
+    def keyframe_insert(self, data_path, index=-1, frame=0.0):
+        anim_data = self.animation_data_create()
+        if anim_data.action is None:
+            anim_data.action = data.actions.new(f"{self.name}Action")
+        fcurves = anim_data.action.fcurves
+        fcurve = fcurves.find(data_path, max(index, 0)) or fcurves.new(data_path, max(index, 0))
+        value = self.path_resolve(data_path)
+        fcurve.keyframe_points.insert(frame, value[index] if index >= 0 else value)
+        return True
+
+
+class IDCollection(Collection):
+    def remove(self, item, do_unlink=True):
+        list.remove(self, item); item.__dict__.pop("_users_collection", None)
+
+    def new(self, name, *args, **kwargs):
+        existing = {item.name for item in self}
+        unique, n = name, 0
+        while unique in existing:
+            n += 1; unique = f"{name}.{n:03}"
+        return super().new(unique, *args, **kwargs)
+
+
+# --- Node trees ---
+
+class Socket(Struct):
+    def __init__(self, node, name):
+        super().__init__(node=node, name=name, default_value=0.0, identifier=name, links=[])
+
+    def driver_add(self, path, index=-1):
+        return self.node.tree.driver_add(f'nodes["{self.node.name}"].outputs[0].{path}', index)
+
+
+class Sockets:
+    def __init__(self, node):
+        self._node = node; self._sockets = {}
+
+    def __getitem__(self, key):
+        if key not in self._sockets:
+            self._sockets[key] = Socket(self._node, key)
+        return self._sockets[key]
+
+
+_NODE_NAMES = {'ShaderNodeTexImage': "Image Texture", 'ShaderNodeTexCoord': "Texture Coordinate", 'ShaderNodeGroup': "Group",
+               'NodeGroupInput': "Group Input", 'NodeGroupOutput': "Group Output"}
+
+
+class Node(Struct):
+    def __init__(self, tree, bl_idname):
+        super().__init__(tree=tree, bl_idname=bl_idname, name=_NODE_NAMES.get(bl_idname, bl_idname), label="",
+                         location=(0, 0), node_tree=None, image=None, image_user=Struct(), object=None)
+        self.inputs = Sockets(self); self.outputs = Sockets(self)
+
+
+class Nodes(Collection):
+    def __init__(self, tree):
+        super().__init__(); self._tree = tree
+
+    def remove(self, node):
+        for link in [l for l in self._tree.links if node in (l.from_socket.node, l.to_socket.node)]:
+            self._tree.links.remove(link)
+        list.remove(self, node)
+
+    def new(self, bl_idname):
+        node = Node(self._tree, bl_idname)
+        base, n = node.name, 0
+        while self.get(node.name) is not None:
+            n += 1; node.name = f"{base}.{n:03}"
+        self.append(node)
+        return node
+
+
+class Interface(Struct):
+    def __init__(self):
+        super().__init__(items_tree=Collection())
+
+    def new_socket(self, name, in_out='INPUT', socket_type='NodeSocketFloat'):
+        socket = Struct(name=name, in_out=in_out, socket_type=socket_type, default_value=0.0, min_value=0.0, identifier=f"Socket_{len(self.items_tree)}")
+        self.items_tree.append(socket)
+        return socket
+
+
+class Links(Collection):
+    """Node links; like Blender, linking into an input replaces its existing link."""
+    def new(self, from_socket, to_socket):
+        for link in list(to_socket.links):
+            self.remove(link)
+        link = Struct(from_socket=from_socket, to_socket=to_socket)
+        to_socket.links.append(link); self.append(link)
+        return link
+
+    def remove(self, link):
+        link.to_socket.links.remove(link); list.remove(self, link)
+
+
+class NodeTree(ID):
+    def __init__(self, name, type='ShaderNodeTree'):
+        super().__init__(name, bl_idname=type, interface=Interface(), links=Links())
+        self.nodes = Nodes(self)
+
+
+class Material(ID):
+    def __init__(self, name):
+        super().__init__(name, use_nodes=False)
+        self.node_tree = NodeTree(name)
+
+
+class ImagePixels:
+    def __init__(self, count):
+        self.values = np.zeros(count, dtype=np.float32)
+
+    def __len__(self): return len(self.values)
+    def foreach_set(self, seq): self.values[:] = seq
+    def foreach_get(self, buf): buf[:] = self.values
+
+
+class Image(ID):
+    def __init__(self, name, filepath="", width=0, height=0, alpha=True, float_buffer=False):
+        super().__init__(name, filepath=filepath, filepath_raw=filepath, source='FILE' if filepath else 'GENERATED',
+                         size=(width, height), file_format='PNG', packed_file=None, colorspace_settings=Struct(name='sRGB'))
+        self.pixels = ImagePixels(width * height * 4)
+        self.channels = 4; self.is_float = float_buffer; self.bindcode = 0
+
+    @property
+    def has_data(self): return bool(self.size[0])
+
+    def buffers_free(self):
+        self.size = (0, 0); self.bindcode = 0
+
+    def pack(self):
+        self.packed_file = Struct(size=self.pixels.values.nbytes)
+
+
+class ImageCollection(IDCollection):
+    def load(self, filepath, check_existing=False):
+        if check_existing:
+            for image in self:
+                if image.filepath == filepath:
+                    return image
+        return super().new(filepath.replace("\\", "/").rsplit("/", 1)[-1], filepath)
+
+    def new(self, name, width, height, alpha=False, float_buffer=False):
+        return super().new(name, "", width, height, alpha, float_buffer)
+
+
+# --- Objects and scenes ---
+
+class MeshVertices(Struct):
+    def __init__(self):
+        super().__init__(co=np.empty((0, 3), dtype=np.float32))
+
+    def __len__(self): return len(self.co)
+    def add(self, count): self.co = np.concatenate((self.co, np.zeros((count, 3), dtype=np.float32)))
+    def foreach_set(self, attr, seq): self.co = np.asarray(seq, dtype=np.float32).reshape(-1, 3)
+    def foreach_get(self, attr, buf): buf[:] = self.co.ravel()
+
+
+class Attribute(Struct):
+    def __init__(self, mesh, name, type, domain):
+        super().__init__(name=name, data_type=type, domain=domain)
+        self.data = Collection()
+        self.data.extend(Struct(value=None) for _ in range(len(mesh.vertices)))
+
+
+class Mesh(ID):
+    def __init__(self, name):
+        super().__init__(name, vertices=MeshVertices(), materials=[], polygons=[])
+        self.attributes = Collection(lambda name, type, domain: Attribute(self, name, type, domain))
+        self.uv_layers = Collection(lambda name: Struct(name=name, data=Collection()))
+
+    def from_pydata(self, vertices, edges, faces):
+        self.vertices.add(len(vertices)); self.vertices.foreach_set("co", np.ravel(vertices))
+        self.polygons = list(faces)
+
+    def update(self): pass
+
+
+class Modifier(Struct):
+    def __init__(self, name, type):
+        super().__init__(name=name, type=type, node_group=None)
+
+
+class Object(ID):
+    def __init__(self, name, object_data=None):
+        obj_type = 'EMPTY' if object_data is None else ('CAMERA' if isinstance(object_data, CameraData) else 'MESH')
+        super().__init__(name, data=object_data, type=obj_type, parent=None, location=[0.0, 0.0, 0.0], scale=[1.0, 1.0, 1.0],
+                         empty_display_type='PLAIN_AXES', empty_display_size=1.0, matrix_world=Matrix(), _select=False)
+        self.constraints = Collection(lambda type: Struct(type=type, enabled=True, clip=None, use_active_clip=True))
+        self.modifiers = Collection(Modifier)
+
+    @property
+    def material_slots(self):
+        materials = self.data.materials if self.data is not None and hasattr(self.data, "materials") else []
+        return [Struct(material=material) for material in materials]
+
+    def visible_get(self): return True
+
+    @property
+    def children(self):
+        return [o for o in bpy_module.data.objects if o.parent is self]
+
+    @property
+    def users_collection(self):
+        return self.__dict__.get("_users_collection", [])
+
+    def select_set(self, state): self._select = state
+    def select_get(self): return self._select
+
+
+class CameraData(ID):
+    def __init__(self, name):
+        super().__init__(name, type='PERSP', lens=50.0, sensor_width=36.0, sensor_height=24.0, sensor_fit='AUTO', shift_x=0.0, shift_y=0.0)
+
+    @property
+    def angle(self):
+        sensor = self.sensor_height if self.sensor_fit == 'VERTICAL' else self.sensor_width
+        return 2.0 * math.atan(sensor / (2.0 * self.lens))
+
+
+class SceneCollection(Struct):
+    def __init__(self):
+        super().__init__(objects=Collection())
+        self.objects.link = self._link
+
+    def _link(self, obj):
+        self.objects.append(obj); obj.__dict__.setdefault("_users_collection", []).append(self)
+
+
+class Scene(ID):
+    def __init__(self, name):
+        super().__init__(name, frame_start=1, frame_end=250, frame_current=1, camera=None, active_clip=None,
+                         render=Struct(resolution_x=1920, resolution_y=1080, pixel_aspect_x=1.0, pixel_aspect_y=1.0))
+        self.collection = SceneCollection()
+
+    @property
+    def objects(self):
+        return self.collection.objects
+
+
+class Text(ID):
+    def __init__(self, name):
+        super().__init__(name, body="")
+
+    def clear(self): self.body = ""
+    def write(self, text): self.body += text
+
+
+class BlendData:
+    def __init__(self):
+        self.objects = IDCollection(Object)
+        self.meshes = IDCollection(Mesh)
+        self.cameras = IDCollection(CameraData)
+        self.node_groups = IDCollection(NodeTree)
+        self.materials = IDCollection(Material)
+        self.images = ImageCollection(Image)
+        self.actions = IDCollection(lambda name: ID(name, fcurves=FCurves()))
+        self.movieclips = IDCollection(lambda name: ID(name))
+        self.scenes = IDCollection(Scene)
+        self.texts = IDCollection(Text)
+        self.filepath = ""
+
+    def batch_remove(self, ids):
+        for item in ids:
+            item.__dict__.pop("_users_collection", None)
+        ids = set(map(id, ids))
+        for collection in vars(self).values():
+            if isinstance(collection, list):
+                collection[:] = [item for item in collection if id(item) not in ids]
+
+
+data = BlendData()
+
+
+class WindowManager(Struct):
+    """Records modal handlers, timers and progress so modal operators can be driven by hand."""
+    def __init__(self):
+        super().__init__(handlers=[], timers=[], progress=None)
+
+    def event_timer_add(self, time_step, window=None):
+        timer = Struct(time_step=time_step); self.timers.append(timer)
+        return timer
+
+    def event_timer_remove(self, timer): self.timers.remove(timer)
+    def modal_handler_add(self, operator): self.handlers.append(operator)
+    def progress_begin(self, low, high): self.progress = low
+    def progress_update(self, value): self.progress = value
+    def progress_end(self): self.progress = None
+
+
+def reset():
+    """Clears all stand-in data and gives the context a fresh scene."""
+    global data
+    data = BlendData()
+    bpy_module.data = data
+    bpy_module.context.scene = data.scenes.new("Scene")
+    bpy_module.context.collection = bpy_module.context.scene.collection
+    bpy_module.context.window_manager = WindowManager()
+    bpy_module.context.preferences = Struct(addons={})
+    bpy_module.context.window = Struct()
+    bpy_module.context.workspace = Struct(status_text_set=lambda text: None)
+    bpy_module.context.view_layer = Struct(update=lambda: None)
+
+
+# --- Module installation ---
+
+def _prop(**kwargs):
+    return kwargs.get("default")
+
+
+class Operator:
+    bl_idname = ""
+    def report(self, level, message): self.reports = getattr(self, "reports", []) + [(set(level), message)]
+    @classmethod
+    def poll_message_set(cls, message): pass
+
+
+class Panel:
+    pass
+
+
+class UILayout:
+    """Records what a panel or menu draws: ("operator", idname), ("prop", name) and ("label", text) items."""
+    def __init__(self, items=None):
+        self.items = [] if items is None else items
+
+    def column(self, **kwargs): return UILayout(self.items)
+    def row(self, **kwargs): return UILayout(self.items)
+    def box(self): return UILayout(self.items)
+    def separator(self, **kwargs): pass
+    def label(self, text="", **kwargs): self.items.append(("label", text))
+    def prop(self, data, name, **kwargs): self.items.append(("prop", name))
+
+    def operator(self, idname, **kwargs):
+        self.items.append(("operator", idname))
+        return Struct()
+
+
+bpy_module = types.ModuleType("bpy")
+bpy_module.data = data
+bpy_module.context = Struct(scene=None, collection=None)
+bpy_module.types = types.ModuleType("bpy.types")
+bpy_module.types.Operator = Operator
+bpy_module.types.Panel = Panel
+bpy_module.types.PropertyGroup = Struct
+bpy_module.types.AddonPreferences = Panel
+bpy_module.props = types.ModuleType("bpy.props")
+for _name in ("BoolProperty", "IntProperty", "FloatProperty", "StringProperty", "EnumProperty", "PointerProperty", "CollectionProperty"):
+    setattr(bpy_module.props, _name, _prop)
+bpy_module.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+bpy_module.path = types.SimpleNamespace(abspath=lambda path, **kwargs: path[2:] if path.startswith("//") else path)
+bpy_module.types.Scene = Scene
+bpy_module.app = types.ModuleType("bpy.app")
+bpy_module.app.version, bpy_module.app.version_string, bpy_module.app.background = (0, 0, 0), "stand-in", True
+bpy_module.app.handlers = types.ModuleType("bpy.app.handlers")
+bpy_module.app.handlers.persistent = lambda func: func
+for _name in ("render_init", "render_complete", "render_cancel", "frame_change_post", "depsgraph_update_post", "load_post", "save_pre", "save_post"):
+    setattr(bpy_module.app.handlers, _name, [])
+
+class ExportHelper:
+    filepath = ""
+
+
+bpy_extras_module = types.ModuleType("bpy_extras")
+bpy_extras_module.io_utils = types.ModuleType("bpy_extras.io_utils")
+bpy_extras_module.io_utils.ExportHelper = ExportHelper
+
+mathutils_module = types.ModuleType("mathutils")
+mathutils_module.Matrix = Matrix
+mathutils_module.Vector = Vector
+mathutils_module.kdtree = types.ModuleType("mathutils.kdtree")
+mathutils_module.kdtree.KDTree = KDTree
+# Mesh BVH queries are not emulated; only the import resolves.
+mathutils_module.bvhtree = types.ModuleType("mathutils.bvhtree")
+mathutils_module.bvhtree.BVHTree = type("BVHTree", (), {})
+
+
+def install():
+    """Registers the stand-in as 'bpy' and 'mathutils' unless the real modules are importable."""
+    sys.modules["bpy"] = bpy_module
+    sys.modules["bpy.types"] = bpy_module.types
+    sys.modules["bpy.props"] = bpy_module.props
+    sys.modules["bpy.app"] = bpy_module.app
+    sys.modules["bpy.app.handlers"] = bpy_module.app.handlers
+    sys.modules["bpy_extras"] = bpy_extras_module
+    sys.modules["bpy_extras.io_utils"] = bpy_extras_module.io_utils
+    sys.modules["mathutils"] = mathutils_module
+    sys.modules["mathutils.kdtree"] = mathutils_module.kdtree
+    sys.modules["mathutils.bvhtree"] = mathutils_module.bvhtree
+    reset()
+    return bpy_module
@@ -0,0 +1,286 @@
+# Clip_Tools - Benchmark suite
+#
+# Times the addon's scene setup functions on synthetic tracking data at several sizes.
+#
+# Plain Python / CI (uses the fake_bpy stand-in):
+#   python benchmarks/run.py --output results.json
+# Background Blender (real data API):
+#   blender -b --factory-startup --python benchmarks/run.py -- --output results.json
+# Regression check against an earlier run:
+#   python benchmarks/run.py --output new.json --compare old.json --threshold 1.25
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, ADDON_DIR)
+
+PRESETS = {
+    "quick": {"tracks": [100, 1000], "frames": [100], "objects": [1]},
+    "full": {"tracks": [100, 1000, 10000], "frames": [100, 1000], "objects": [1, 4]},
+}
+
+
+def load_backend(force_stand_in=False):
+    """Returns (bpy, backend name), installing the stand-in when real Blender is not available."""
+    if not force_stand_in:
+        try:
+            import bpy
+            return bpy, f"blender {bpy.app.version_string}"
+        except ImportError:
+            pass
+    import fake_bpy
+    return fake_bpy.install(), "stand-in"
+
+
+def addon_version():
+    try:
+        with open(os.path.join(ADDON_DIR, "blender_manifest.toml"), encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("version"):
+                    return line.split("=", 1)[1].strip().strip('"')
+    except OSError:
+        pass
+    return None
+
+
+class Bench:
+    """Runs cases, removes the data-blocks each run created, and keeps the fastest time."""
+    ID_COLLECTIONS = ("objects", "meshes", "cameras", "node_groups", "materials", "images", "actions")
+
+    def __init__(self, bpy, repeats):
+        self.bpy = bpy; self.repeats = repeats; self.results = []
+
+    def _snapshot(self):
+        return {name: set(map(id, getattr(self.bpy.data, name))) for name in self.ID_COLLECTIONS}
+
+    def _cleanup(self, before):
+        created = [item for name in self.ID_COLLECTIONS for item in getattr(self.bpy.data, name) if id(item) not in before[name]]
+        if created:
+            self.bpy.data.batch_remove(created)
+
+    def run(self, name, params, func, setup=None):
+        times = []
+        for _ in range(self.repeats):
+            before = self._snapshot()
+            args = setup() if setup else ()
+            start = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - start)
+            self._cleanup(before)
+        result = {"name": name, "params": params, "seconds": min(times), "mean_seconds": sum(times) / len(times), "repeats": len(times)}
+        self.results.append(result)
+        print(f"{name:<32} {json.dumps(params):<48} {result['seconds'] * 1000:10.2f} ms")
+        return result
+
+
+def make_camera(bpy, scene):
+    camera_data = bpy.data.cameras.new("BenchCamera")
+    camera = bpy.data.objects.new("BenchCamera", camera_data)
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    return camera
+
+
+STARTUP_SCRIPT = """
+import sys, time
+sys.path[:0] = [{bench_dir!r}, {addon_dir!r}]
+import fake_bpy; fake_bpy.install()
+start = time.perf_counter()
+import batch
+batch.load_addon().register()
+print(time.perf_counter() - start, "numpy" in sys.modules)
+"""
+
+
+def measure_startup(repeats):
+    """Times import + register() of the addon in fresh interpreters (stand-in only) and records whether numpy was loaded."""
+    script = STARTUP_SCRIPT.format(bench_dir=BENCH_DIR, addon_dir=ADDON_DIR)
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0])); numpy_loaded = output[1] == "True"
+    result = {"name": "addon_startup", "params": {"numpy_loaded": numpy_loaded}, "seconds": min(times), "mean_seconds": sum(times) / len(times), "repeats": len(times)}
+    print(f"{result['name']:<32} {json.dumps(result['params']):<48} {result['seconds'] * 1000:10.2f} ms")
+    return result
+
+
+def run_suite(bpy, addon, preset, repeats, backend="stand-in"):
+    from synthetic import make_clip
+    bench = Bench(bpy, repeats)
+    if backend == "stand-in":
+        # Addon import + registration cost; inside Blender this is measured by Blender's own startup.
+        bench.results.append(measure_startup(repeats))
+    scene = bpy.context.scene
+    camera = make_camera(bpy, scene)
+
+    # 3D Markers to Empty (operator body), static and point-cloud output.
+    for tracks in preset["tracks"]:
+        for objects in preset["objects"]:
+            clip = make_clip(tracks=tracks, frames=min(preset["frames"]), objects=objects)
+            for output in ('EMPTIES', 'POINT_CLOUD'):
+                def markers(output=output, clip=clip):
+                    for tracking_object in clip.tracking.objects:
+                        addon.markers_to_empty(scene, scene.collection, clip, tracking_object, output, selected_only=True)
+                bench.run(f"3d_markers_to_empty.{output.lower()}", {"tracks": tracks, "objects": objects}, markers)
+
+    # Animated bundle bake (tracks x frames).
+    for frames in preset["frames"]:
+        tracks = min(preset["tracks"])
+        clip = make_clip(tracks=tracks, frames=frames)
+        bench.run("3d_markers_to_empty.animated", {"tracks": tracks, "frames": frames},
+                  lambda clip=clip: addon.markers_to_empty(scene, scene.collection, clip, clip.tracking.objects.active, 'EMPTIES', True))
+
+    # Re-sync of an existing set of Empties after a small re-solve (1% of the bundles moved).
+    for tracks in preset["tracks"]:
+        clip = make_clip(tracks=tracks, frames=min(preset["frames"]))
+        tracking_object = clip.tracking.objects.active
+        world_matrix = addon.get_tracking_world_matrix(scene, clip, tracking_object)
+        def synced(clip=clip, tracking_object=tracking_object, world_matrix=world_matrix):
+            addon.sync_track_empties(scene, scene.collection, clip, tracking_object, world_matrix)
+            tracking_object.tracks.bundles[::100] += 0.01
+            return ()
+        bench.run("3d_markers_to_empty.sync", {"tracks": tracks},
+                  lambda clip=clip, tracking_object=tracking_object, world_matrix=world_matrix:
+                  addon.sync_track_empties(scene, scene.collection, clip, tracking_object, world_matrix), setup=synced)
+
+    # Solved camera path table: first build versus cached lookup.
+    for frames in preset["frames"]:
+        clip = make_clip(tracks=min(preset["tracks"]), frames=frames)
+        tracking_object = clip.tracking.objects.active
+        def cold(clip=clip, tracking_object=tracking_object):
+            addon.clear_camera_path_cache()
+            addon.get_camera_path(clip, tracking_object)
+        bench.run("camera_path.cold", {"frames": frames}, cold)
+        bench.run("camera_path.cached", {"frames": frames}, lambda clip=clip, tracking_object=tracking_object: addon.get_camera_path(clip, tracking_object))
+
+    # Reprojection error analysis over all tracks x frames.
+    for frames in preset["frames"]:
+        for tracks in preset["tracks"]:
+            clip = make_clip(tracks=tracks, frames=frames)
+            bench.run("analyze_solve", {"tracks": tracks, "frames": frames},
+                      lambda clip=clip: addon.analyze_solve(clip, clip.tracking.objects.active, 1.0, True, True, False))
+
+    # 2D marker export (tracks x frames), streamed to a temporary folder; 500 x 3000 is a long feature shot.
+    with tempfile.TemporaryDirectory() as export_dir:
+        for tracks, frames in sorted({(max(preset["tracks"][:2]), frames) for frames in preset["frames"]} | {(500, 3000)}):
+            clip = make_clip(tracks=tracks, frames=frames)
+            for file_format in ('CSV', 'NPY'):
+                path = os.path.join(export_dir, f"markers_{tracks}_{frames}" + (".csv" if file_format == 'CSV' else ""))
+                bench.run(f"export_markers.{file_format.lower()}", {"tracks": tracks, "frames": frames},
+                          lambda clip=clip, path=path, file_format=file_format: addon.export_markers(path, clip, file_format))
+
+    # Camera solve + bundle export (.chan, matrix table, PLY), read straight from the reconstruction.
+    with tempfile.TemporaryDirectory() as export_dir:
+        for frames in sorted({max(preset["frames"]), 5000}):
+            tracks = min(preset["tracks"])
+            clip = make_clip(tracks=tracks, frames=frames)
+            path = os.path.join(export_dir, f"solve_{frames}.chan")
+            bench.run("export_camera_solve", {"tracks": tracks, "frames": frames},
+                      lambda clip=clip, path=path: addon.export_camera_solve(path, scene, clip))
+
+    # Batch scene setup: solvers and a baked image plane for several clip -> camera pairs in one pass.
+    for clips in (1, 4):
+        def pairs(clips=clips):
+            return ([(make_clip(tracks=min(preset["tracks"]), frames=min(preset["frames"]), objects=2), make_camera(bpy, scene)) for _ in range(clips)],)
+        bench.run("batch_scene_setup", {"clips": clips},
+                  lambda pairs: addon.batch_scene_setup(scene, scene.collection, [(clip, cam, []) for clip, cam in pairs],
+                                                        ("camera_solver", "object_solvers", "image_plane")), setup=pairs)
+
+    # Projection node group: full rebuild versus cached lookup.
+    def prebuilt_group():
+        addon.create_projection_node_group(camera)
+        return ()
+    for calls in (1, 10, 100):
+        bench.run("create_projection_node_group", {"calls": calls}, lambda calls=calls: [addon.create_projection_node_group(camera) for _ in range(calls)])
+        bench.run("get_projection_node_group.cached", {"calls": calls},
+                  lambda calls=calls: [addon.get_projection_node_group(camera) for _ in range(calls)], setup=prebuilt_group)
+
+    # Image plane: live drivers versus baked keys over the frame range.
+    def new_plane():
+        plane = bpy.data.objects.new("BenchPlane", bpy.data.meshes.new("BenchPlane"))
+        scene.collection.objects.link(plane)
+        plane.parent = camera
+        return (plane,)
+    bench.run("image_plane.drivers", {}, lambda plane: addon.setup_image_plane_drivers(plane, camera, scene), setup=new_plane)
+    for frames in preset["frames"]:
+        def baked(plane, frames=frames):
+            scene.frame_start, scene.frame_end = 1, frames
+            addon.bake_image_plane_animation(scene, plane, camera, 10.0)
+        bench.run("image_plane.baked", {"frames": frames}, baked, setup=new_plane)
+
+    # Lens distortion ST-map at plate resolution.
+    clip = make_clip(tracks=min(preset["tracks"]), frames=min(preset["frames"]))
+    camera_data = clip.tracking.camera
+    camera_data.distortion_model = 'BROWN'
+    camera_data.brown_k1, camera_data.brown_k2, camera_data.brown_k3, camera_data.brown_k4 = -0.08, 0.01, 0.0, 0.0
+    camera_data.brown_p1, camera_data.brown_p2 = 0.0005, -0.0003
+    intrinsics = addon.get_intrinsics(clip)
+    bench.run("compute_st_map", {"width": intrinsics.width, "height": intrinsics.height}, lambda: addon.compute_st_map(intrinsics))
+
+    # Sequence number parsing and directory indexing.
+    with tempfile.TemporaryDirectory() as plate_dir:
+        for files in sorted({max(preset["frames"]), 10 * max(preset["frames"])}):
+            names = [f"plate.{1001 + i:04}.exr" for i in range(files)]
+            for name in names:
+                open(os.path.join(plate_dir, name), "wb").close()
+            bench.run("get_frame_number_from_path", {"files": files}, lambda names=names: [addon.get_frame_number_from_path(n) for n in names])
+            first = os.path.join(plate_dir, names[0])
+            def cold(first=first):
+                addon.clear_sequence_index_cache()
+                addon.index_image_sequence(first)
+            bench.run("index_image_sequence.cold", {"files": files}, cold)
+            bench.run("index_image_sequence.cached", {"files": files}, lambda first=first: addon.index_image_sequence(first))
+
+    return bench.results
+
+
+def compare(results, baseline_path, threshold):
+    """Prints cases slower than threshold x the baseline and returns how many there are."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], json.dumps(r["params"], sort_keys=True)): r["seconds"] for r in json.load(f)["results"]}
+    regressions = 0
+    for result in results:
+        old = baseline.get((result["name"], json.dumps(result["params"], sort_keys=True)))
+        if old and result["seconds"] > old * threshold:
+            regressions += 1
+            print(f"REGRESSION {result['name']} {result['params']}: {old * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms")
+    return regressions
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Benchmark Clip Tools on synthetic tracking data.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--stand-in", action="store_true", help="Use the bpy stand-in even inside Blender")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown factor reported as a regression")
+    args = parser.parse_args(argv)
+
+    bpy, backend = load_backend(args.stand_in)
+    import batch
+    addon = batch.load_addon()
+    print(f"Clip Tools {addon_version()} on {backend}, preset '{args.preset}'")
+    results = run_suite(bpy, addon, PRESETS[args.preset], args.repeats, backend)
+    report = {"addon_version": addon_version(), "backend": backend, "python": platform.python_version(),
+              "platform": platform.platform(), "preset": args.preset, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to '{args.output}'.")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
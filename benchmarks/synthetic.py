@@ -0,0 +1,183 @@
+# Clip_Tools - Synthetic tracking data for benchmarks
+#
+# Builds duck-typed stand-ins for MovieClip / MovieTrackingObject / MovieTrackingTrack with
+# solved reconstructions. They expose the same bulk API (len, iteration, foreach_get,
+# matrix_from_frame) as Blender's collections, so they work with both the real bpy and
+# the fake_bpy stand-in. Real clips cannot be given a reconstruction from Python.
+
+import numpy as np
+
+
+def _look_at_matrices(positions, target):
+    """Camera-to-world matrices (F, 4, 4) looking from positions towards a target (-Z forward, +Y up)."""
+    forward = target - positions
+    forward /= np.linalg.norm(forward, axis=1, keepdims=True)
+    right = np.cross(forward, np.array([0.0, 0.0, 1.0]))
+    right /= np.linalg.norm(right, axis=1, keepdims=True)
+    up = np.cross(right, forward)
+    matrices = np.tile(np.identity(4), (len(positions), 1, 1))
+    matrices[:, :3, 0] = right; matrices[:, :3, 1] = up; matrices[:, :3, 2] = -forward; matrices[:, :3, 3] = positions
+    return matrices
+
+
+class SyntheticMarker:
+    def __init__(self, frame, co, mute=False):
+        self.frame = frame; self.co = co; self.mute = mute
+
+
+class SyntheticMarkers:
+    def __init__(self, frames, co, mute):
+        self._frames = frames; self._co = co; self._mute = mute
+
+    def __len__(self): return len(self._frames)
+    def __getitem__(self, i): return SyntheticMarker(int(self._frames[i]), tuple(self._co[i]), bool(self._mute[i]))
+    def __iter__(self): return (self[i] for i in range(len(self)))
+
+    def foreach_get(self, attr, buf):
+        if attr == "pattern_corners":
+            buf[:] = np.tile(np.array([[-0.01, -0.01], [0.01, -0.01], [0.01, 0.01], [-0.01, 0.01]], dtype=np.float32), (len(self._frames), 1)).ravel()
+            return
+        source = {"frame": self._frames, "co": self._co, "mute": self._mute}[attr]
+        buf[:] = source.ravel()
+
+
+class SyntheticTrack:
+    def __init__(self, tracks, index):
+        self._tracks = tracks; self._index = index
+
+    name = property(lambda self: self._tracks.names[self._index])
+    has_bundle = property(lambda self: bool(self._tracks.has_bundle[self._index]))
+    select = property(lambda self: bool(self._tracks.select[self._index]))
+    markers = property(lambda self: self._tracks.markers_for(self._index))
+
+    @property
+    def bundle(self):
+        from mathutils import Vector
+        return Vector(self._tracks.bundles[self._index].tolist())
+
+
+class SyntheticTracks:
+    """N tracks with bundles, selection flags and one marker per frame."""
+    def __init__(self, bundles, frames, rng, marker_co=None, marker_mute=None):
+        count = len(bundles)
+        self.bundles = bundles.astype(np.float32)
+        self.has_bundle = rng.random(count) > 0.05
+        self.select = rng.random(count) > 0.2
+        self.use_custom_color = np.zeros(count, dtype=bool)
+        self.color = np.zeros((count, 3), dtype=np.float32)
+        self.offset = np.zeros((count, 2), dtype=np.float32)
+        self.names = [f"Track.{i:05}" for i in range(count)]
+        self._frames = frames
+        self._marker_co = rng.random((count, len(frames), 2)).astype(np.float32) if marker_co is None else marker_co.astype(np.float32)
+        self._marker_mute = np.zeros((count, len(frames)), dtype=bool) if marker_mute is None else marker_mute
+
+    def __len__(self): return len(self.bundles)
+    def __getitem__(self, i): return SyntheticTrack(self, i)
+    def __iter__(self): return (SyntheticTrack(self, i) for i in range(len(self)))
+
+    def markers_for(self, i):
+        return SyntheticMarkers(self._frames, self._marker_co[i], self._marker_mute[i])
+
+    def foreach_get(self, attr, buf):
+        source = {"bundle": self.bundles, "has_bundle": self.has_bundle, "select": self.select,
+                  "use_custom_color": self.use_custom_color, "color": self.color, "offset": self.offset}[attr]
+        buf[:] = source.ravel()
+
+    def foreach_set(self, attr, seq):
+        target = getattr(self, attr)
+        target[...] = np.asarray(seq, dtype=target.dtype).reshape(target.shape)
+
+
+class SyntheticCameras:
+    """Reconstructed cameras stored like MovieTrackingReconstructedCameras (column-major matrices)."""
+    def __init__(self, frames, matrices):
+        self._frames = frames.astype(np.int32); self._matrices = matrices
+
+    def __len__(self): return len(self._frames)
+
+    def __getitem__(self, i):
+        from mathutils import Matrix
+        camera = type("SyntheticReconstructedCamera", (), {})()
+        camera.frame = int(self._frames[i]); camera.matrix = Matrix(self._matrices[i].tolist())
+        return camera
+
+    def foreach_get(self, attr, buf):
+        if attr == "frame":
+            buf[:] = self._frames
+        elif attr == "matrix":
+            buf[:] = self._matrices.transpose(0, 2, 1).ravel()
+        else:
+            raise AttributeError(attr)
+
+    def matrix_from_frame(self, frame=1):
+        from mathutils import Matrix
+        index = np.searchsorted(self._frames, frame)
+        if index >= len(self._frames) or self._frames[index] != frame:
+            return None
+        return Matrix(self._matrices[index].tolist())
+
+
+class SyntheticReconstruction:
+    def __init__(self, cameras):
+        self.cameras = cameras; self.is_valid = True; self.average_error = 0.3
+
+
+class SyntheticTrackingObject:
+    def __init__(self, name, is_camera, tracks, reconstruction):
+        self.name = name; self.is_camera = is_camera; self.tracks = tracks; self.reconstruction = reconstruction
+
+
+class SyntheticTrackingObjects(list):
+    @property
+    def active(self):
+        return self[0] if self else None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next(o for o in self if o.name == key)
+        return super().__getitem__(key)
+
+
+class SyntheticCamera:
+    """Undistorted tracking camera of a 1920x1080 clip with a 35 mm lens on a 36 mm sensor."""
+    focal_length_pixels = 1866.67; principal_point_pixels = (960.0, 540.0); pixel_aspect = 1.0
+    distortion_model = 'POLYNOMIAL'; k1 = k2 = k3 = 0.0
+
+
+def _project(bundles, matrices, camera, size):
+    """Normalized marker positions (N, F, 2) and a behind-camera mask (N, F) of bundles seen by the cameras."""
+    inverse = np.linalg.inv(matrices)
+    points = np.einsum('fij,nj->nfi', inverse[:, :3, :3], bundles) + inverse[None, :, :3, 3]
+    depth = -points[..., 2]
+    pixels = points[..., :2] / np.where(depth > 0, depth, 1.0)[..., None] * camera.focal_length_pixels + camera.principal_point_pixels
+    return pixels / np.array(size), depth <= 0
+
+
+class SyntheticClip:
+    def __init__(self, name, objects, frame_count, filepath):
+        self.name = name; self.frame_start = 1; self.frame_offset = 0; self.frame_duration = frame_count
+        self.filepath = filepath; self.source = 'SEQUENCE'; self.size = (1920, 1080)
+        self.tracking = type("Tracking", (), {})()
+        self.tracking.objects = objects
+        self.tracking.camera = SyntheticCamera()
+
+
+def make_clip(tracks=1000, frames=200, objects=1, seed=0, filepath="//plate/plate.1001.exr"):
+    """
+    Builds a solved clip with `objects` tracking objects of `tracks` tracks each over `frames` frames.
+    Markers are the bundles' projections plus about half a pixel of noise.
+    """
+    rng = np.random.default_rng(seed)
+    frame_numbers = np.arange(1, frames + 1)
+    tracking_objects = SyntheticTrackingObjects()
+    for k in range(objects):
+        angle = np.linspace(0.0, 0.5, frames) + k
+        positions = np.stack((10.0 * np.cos(angle), 10.0 * np.sin(angle), np.full(frames, 1.7)), axis=1)
+        matrices = _look_at_matrices(positions, np.zeros(3))
+        bundles = rng.uniform(-3.0, 3.0, (tracks, 3))
+        name = "Camera" if k == 0 else f"Object.{k:02}"
+        co, behind = _project(bundles, matrices, SyntheticCamera, (1920, 1080))
+        co += rng.normal(0.0, 0.5, co.shape) / np.array((1920, 1080))
+        tracking_objects.append(SyntheticTrackingObject(name, k == 0, SyntheticTracks(bundles, frame_numbers, rng, co, behind),
+                                                        SyntheticReconstruction(SyntheticCameras(frame_numbers, matrices))))
+    return SyntheticClip("SyntheticClip", tracking_objects, frames, filepath)
@@ -0,0 +1,110 @@
+# Clip_Tools - Bundle Index
+#
+# KD-tree over a tracking object's bundles for radius, duplicate and volume queries. The tree is
+# built once per solve and rebuilt only when the bundles change.
+
+import numpy as np
+from collections import namedtuple
+from mathutils import Vector
+from mathutils.kdtree import KDTree
+from mathutils.bvhtree import BVHTree
+from .instrumentation import instrumented
+from .reconstruction import read_track_bundles, get_tracking_world_matrix
+
+BundleIndex = namedtuple("BundleIndex", ("signature", "tree", "bundles", "track_indices"))
+
+# (clip name, tracking object name) -> BundleIndex
+_bundle_indices = {}
+
+def _solve_signature(tracking_object, bundles, has_bundle):
+    """Changes whenever the solve or any bundle changes; reading the bundles in bulk is far cheaper than rebuilding."""
+    reconstruction = tracking_object.reconstruction
+    return (reconstruction.is_valid, len(reconstruction.cameras), len(bundles), hash(bundles.tobytes()), hash(has_bundle.tobytes()))
+
+@instrumented
+def get_bundle_index(clip, tracking_object):
+    """Returns the cached BundleIndex of a tracking object, rebuilding it after the solve changed."""
+    bundles, has_bundle, _ = read_track_bundles(tracking_object.tracks)
+    signature = _solve_signature(tracking_object, bundles, has_bundle)
+    key = (clip.name, tracking_object.name)
+    index = _bundle_indices.get(key)
+    if index is None or index.signature != signature:
+        track_indices = np.flatnonzero(has_bundle)
+        tree = KDTree(len(track_indices))
+        for i, co in enumerate(bundles[track_indices].tolist()):
+            tree.insert(co, i)
+        tree.balance()
+        index = _bundle_indices[key] = BundleIndex(signature, tree, bundles, track_indices)
+    return index
+
+def clear_bundle_index_cache():
+    """Drops all cached bundle trees."""
+    _bundle_indices.clear()
+
+def find_tracks_in_range(index, co, radius):
+    """Track indices whose bundle lies within radius of co (both in the tracking object's space)."""
+    return [int(index.track_indices[i]) for _, i, _ in index.tree.find_range(co, radius)]
+
+def to_bundle_space(world, location, radius):
+    """Converts a world-space location and distance into bundle space, given the bundle-to-world matrix."""
+    scale = sum(world.to_scale()) / 3.0 or 1.0
+    return world.inverted_safe() @ location, radius / scale
+
+def set_track_selection(tracks, track_indices, extend=False):
+    """Selects the given tracks in one foreach_set, keeping the current selection when extending."""
+    select = np.zeros(len(tracks), dtype=bool)
+    if extend:
+        tracks.foreach_get("select", select)
+    select[np.asarray(track_indices, dtype=np.int64)] = True
+    tracks.foreach_set("select", select)
+
+def select_tracks_near(scene, clip, tracking_object, location, radius, extend=False):
+    """Selects the tracks whose bundle is within radius (world units) of a world-space location. Returns their count."""
+    index = get_bundle_index(clip, tracking_object)
+    co, local_radius = to_bundle_space(get_tracking_world_matrix(scene, clip, tracking_object), location, radius)
+    found = find_tracks_in_range(index, co, local_radius)
+    set_track_selection(tracking_object.tracks, found, extend)
+    return len(found)
+
+@instrumented
+def find_duplicate_tracks(scene, clip, tracking_object, radius):
+    """
+    Clusters bundles closer than radius (world units) and returns the tracks to drop: every member of a
+    cluster except the one with the lowest average error.
+    """
+    index = get_bundle_index(clip, tracking_object)
+    tracks = tracking_object.tracks
+    _, local_radius = to_bundle_space(get_tracking_world_matrix(scene, clip, tracking_object), Vector(), radius)
+    errors = np.empty(len(tracks), dtype=np.float32); tracks.foreach_get("average_error", errors)
+    assigned = np.zeros(len(tracks), dtype=bool); duplicates = []
+    points = index.bundles
+    for track_index in index.track_indices[np.argsort(errors[index.track_indices], kind='stable')].tolist():
+        if assigned[track_index]:
+            continue
+        assigned[track_index] = True
+        for neighbour in find_tracks_in_range(index, points[track_index].tolist(), local_radius):
+            if not assigned[neighbour]:
+                assigned[neighbour] = True; duplicates.append(neighbour)
+    return duplicates
+
+@instrumented
+def select_tracks_inside_mesh(scene, depsgraph, clip, tracking_object, mesh_object, extend=False):
+    """Selects the tracks whose bundle lies inside a closed mesh object. Returns their count."""
+    index = get_bundle_index(clip, tracking_object)
+    world = get_tracking_world_matrix(scene, clip, tracking_object)
+    to_mesh = mesh_object.matrix_world.inverted_safe() @ world
+    # Only bundles within the mesh's bounding sphere need the exact inside test.
+    corners = [mesh_object.matrix_world @ Vector(corner) for corner in mesh_object.bound_box]
+    center = sum(corners, Vector()) / 8.0
+    radius = max((corner - center).length for corner in corners)
+    co, local_radius = to_bundle_space(world, center, radius)
+    bvh = BVHTree.FromObject(mesh_object, depsgraph)
+    inside = []
+    for track_index in find_tracks_in_range(index, co, local_radius):
+        point = to_mesh @ Vector(index.bundles[track_index].tolist())
+        location, normal, _, _ = bvh.find_nearest(point)
+        # The nearest surface point faces away from points inside a closed, outward-facing mesh.
+        if location is not None and (location - point).dot(normal) > 0.0:
+            inside.append(track_index)
+    set_track_selection(tracking_object.tracks, inside, extend)
+    return len(inside)
@@ -0,0 +1,132 @@
+# Clip_Tools - Clip Duplication
+#
+# Full and partial copies of Movie Clip data-blocks.
+
+import bpy
+import numpy as np
+
+def copy_rna_settings(source, target, skip=()):
+    """Copies every writable value property (not pointers or collections) between two structs of the same type."""
+    for prop in source.bl_rna.properties:
+        name = prop.identifier
+        if prop.is_readonly or prop.type in {'POINTER', 'COLLECTION'} or name in skip or name == "rna_type":
+            continue
+        try:
+            setattr(target, name, getattr(source, name))
+        except (AttributeError, TypeError, ValueError):
+            pass
+
+def get_track_flags(tracks, attr):
+    """Reads a boolean track property ('select', 'hide', ...) for all tracks in one call."""
+    flags = np.zeros(len(tracks), dtype=bool)
+    tracks.foreach_get(attr, flags)
+    return flags
+
+def copy_clip_settings(source, target):
+    """Copies clip, camera intrinsics, tracking and stabilization settings without any tracks."""
+    copy_rna_settings(source, target, skip={"name", "filepath", "use_fake_user"})
+    copy_rna_settings(source.colorspace_settings, target.colorspace_settings)
+    copy_rna_settings(source.tracking.camera, target.tracking.camera)
+    copy_rna_settings(source.tracking.settings, target.tracking.settings)
+    copy_rna_settings(source.tracking.stabilization, target.tracking.stabilization)
+
+def get_matching_tracking_object(clip, source_object):
+    """Returns the clip's tracking object matching source_object, creating it if needed."""
+    tracking_objects = clip.tracking.objects
+    if source_object.is_camera:
+        target = next(o for o in tracking_objects if o.is_camera)
+    else:
+        target = tracking_objects.get(source_object.name) or tracking_objects.new(source_object.name)
+    copy_rna_settings(source_object, target, skip={"name"})
+    return target
+
+# Per-marker data moved by the trim, with the number of values per marker.
+MARKER_ATTRIBUTES = (("co", 2, np.float32), ("pattern_corners", 8, np.float32), ("search_min", 2, np.float32),
+                     ("search_max", 2, np.float32), ("mute", 1, bool), ("is_keyed", 1, bool))
+
+def trim_tracks_to_frame_range(scene, clip, tracking_object, frame_start, frame_end):
+    """
+    Deletes every marker of a tracking object outside the scene frame range. A track with no marker inside the
+    range keeps its nearest one, muted, since a track cannot lose its last marker. Returns the deleted marker count.
+    """
+    # Markers are keyed on clip frames.
+    clip_start, clip_end = frame_start - clip.frame_start + 1, frame_end - clip.frame_start + 1
+    deleted = 0
+    for track in tracking_object.tracks:
+        markers = track.markers
+        frames = np.empty(len(markers), dtype=np.int32)
+        markers.foreach_get("frame", frames)
+        # Markers are sorted by frame, so the ones in range are one span.
+        first, last = int(np.searchsorted(frames, clip_start)), int(np.searchsorted(frames, clip_end, side="right"))
+        if first == 0 and last == len(frames):
+            continue
+        if first == last:
+            first = int(np.argmin(np.minimum(np.abs(frames - clip_start), np.abs(frames - clip_end))))
+            last = first + 1
+            markers[first].mute = True
+        kept = last - first
+        if first:
+            # Moves the span to the front in bulk, and renumbers the markers left after it to unique frames past it.
+            for attr, size, dtype in MARKER_ATTRIBUTES:
+                values = np.empty(len(frames) * size, dtype=dtype)
+                markers.foreach_get(attr, values)
+                values[:kept * size] = values[first * size:last * size]
+                markers.foreach_set(attr, values)
+            frames[:kept] = frames[first:last]
+            frames[kept:] = frames[kept - 1] + 1 + np.arange(len(frames) - kept, dtype=np.int32)
+            markers.foreach_set("frame", frames)
+        # The API has no way to resize a marker collection, so the tail goes one delete_frame at a time. Deleting
+        # from the end keeps each call to a frame lookup, without moving the markers before it.
+        for frame in frames[:kept - 1:-1].tolist():
+            markers.delete_frame(frame)
+        deleted += len(frames) - kept
+    return deleted
+
+def duplicate_clip(space_clip, scene, content='ALL', frame_range=None):
+    """Duplicates the Clip Editor's clip and makes the copy active.
+
+    content: 'ALL' (full copy), 'OBJECT' (active tracking object only), 'SELECTED' (its selected tracks only)
+    or 'SETTINGS' (no tracks). frame_range: optional (start, end) in scene frames; markers outside it are deleted.
+    Only 'ALL' keeps the camera and object reconstructions (including solved frames outside frame_range): the
+    other copies reload the footage, and a reconstruction cannot be written from Python.
+    """
+    source = space_clip.clip
+    if content == 'ALL':
+        new_clip = source.copy()
+        space_clip.clip = new_clip
+        if frame_range:
+            for tracking_object in new_clip.tracking.objects:
+                trim_tracks_to_frame_range(scene, new_clip, tracking_object, *frame_range)
+        return new_clip
+
+    source_object = source.tracking.objects.active
+    tracks = source_object.tracks
+    select, hide = get_track_flags(tracks, "select"), get_track_flags(tracks, "hide")
+    copy_mask = select if content == 'SELECTED' else np.ones(len(tracks), dtype=bool)
+    if content == 'SELECTED' and not copy_mask.any():
+        raise ValueError(f"No selected tracks in tracking object '{source_object.name}'.")
+
+    # A freshly loaded clip shares the footage but none of the tracking data, unlike ID.copy().
+    new_clip = bpy.data.movieclips.load(source.filepath, check_existing=False)
+    new_clip.name = source.name
+    copy_clip_settings(source, new_clip)
+    target_object = get_matching_tracking_object(new_clip, source_object)
+    new_clip.tracking.objects.active = target_object
+    if content == 'SETTINGS' or not copy_mask.any():
+        space_clip.clip = new_clip
+        return new_clip
+
+    # The track clipboard copies whole tracks with all their markers in one call; it skips hidden tracks.
+    tracks.foreach_set("hide", np.zeros(len(tracks), dtype=bool)); tracks.foreach_set("select", copy_mask)
+    try:
+        bpy.ops.clip.copy_tracks()
+    finally:
+        tracks.foreach_set("select", select); tracks.foreach_set("hide", hide)
+    space_clip.clip = new_clip
+    bpy.ops.clip.paste_tracks()
+    if frame_range:
+        trim_tracks_to_frame_range(scene, new_clip, target_object, *frame_range)
+    new_tracks = target_object.tracks
+    if len(new_tracks) == copy_mask.sum():
+        new_tracks.foreach_set("select", select[copy_mask]); new_tracks.foreach_set("hide", hide[copy_mask])
+    return new_clip
@@ -0,0 +1,107 @@
+# Clip_Tools - Lens Distortion Map
+#
+# ST-map (UV lookup image) of the tracking camera's lens distortion. Projection and image plane
+# materials look up the distorted plate position through it, so CG lines up with the plate out to
+# the frame edges without undistorting every frame.
+
+import bpy
+import hashlib
+import numpy as np
+from .instrumentation import instrumented
+from .lens import get_intrinsics, distort_normalized, normalized_to_pixels, pixels_to_normalized
+
+# Rows computed at once, keeping the temporary float64 arrays small on 4K+ plates.
+ROWS_PER_BLOCK = 256
+
+def intrinsics_hash(intrinsics):
+    """Stable digest of the resolution, camera intrinsics and distortion coefficients."""
+    return hashlib.sha1(repr(tuple(intrinsics)).encode()).hexdigest()[:12]
+
+@instrumented
+def compute_st_map(intrinsics):
+    """
+    (height, width, 4) float32 RGBA ST-map: for every undistorted pixel center, R and G hold the
+    normalized (0-1) position of the same ray on the distorted plate.
+    """
+    width, height = intrinsics.width, intrinsics.height
+    st_map = np.zeros((height, width, 4), dtype=np.float32)
+    st_map[..., 3] = 1.0
+    px = np.arange(width, dtype=np.float64) + 0.5
+    for start in range(0, height, ROWS_PER_BLOCK):
+        py = np.arange(start, min(start + ROWS_PER_BLOCK, height), dtype=np.float64)[:, None] + 0.5
+        x, y = pixels_to_normalized(px[None, :], py, intrinsics)
+        x, y = distort_normalized(*np.broadcast_arrays(x, y), intrinsics)
+        dx, dy = normalized_to_pixels(x, y, intrinsics)
+        st_map[start:start + len(py), :, 0] = dx / width
+        st_map[start:start + len(py), :, 1] = dy / height
+    return st_map
+
+@instrumented
+def get_distortion_map(clip):
+    """
+    Returns the ST-map image for the clip's tracking camera. Images are named by the hash of the
+    distortion parameters, so a map is computed once and shared by clips with the same camera.
+    """
+    intrinsics = get_intrinsics(clip)
+    name = "ST-Map " + intrinsics_hash(intrinsics)
+    image = bpy.data.images.get(name)
+    if image and tuple(image.size) == (intrinsics.width, intrinsics.height):
+        return image
+    if image:
+        bpy.data.images.remove(image)
+    image = bpy.data.images.new(name, intrinsics.width, intrinsics.height, alpha=True, float_buffer=True)
+    image.colorspace_settings.name = 'Non-Color'
+    image.pixels.foreach_set(compute_st_map(intrinsics).ravel())
+    # Packed as float EXR so the map survives saving without being recomputed.
+    image.file_format = 'OPEN_EXR'
+    image.pack()
+    image["clip_tools_clip"] = clip.name
+    return image
+
+def set_distortion_map(material, st_map):
+    """
+    Routes the plate texture's lookup vector through an ST-map texture, or removes that lookup again
+    when st_map is None. Works on projection materials and on image plane materials (UV lookup).
+    """
+    tree = material.node_tree; links = tree.links
+    plate = tree.nodes.get("Image Texture")
+    if plate is None:
+        return False
+    lookup = tree.nodes.get("ST-Map")
+    if st_map is None:
+        if lookup:
+            source = lookup.inputs['Vector'].links[0].from_socket if lookup.inputs['Vector'].links else None
+            tree.nodes.remove(lookup)
+            if source:
+                links.new(source, plate.inputs['Vector'])
+        if "clip_tools_stmap" in material:
+            del material["clip_tools_stmap"]
+        return True
+    if lookup is None:
+        source = plate.inputs['Vector'].links[0].from_socket if plate.inputs['Vector'].links else None
+        lookup = tree.nodes.new('ShaderNodeTexImage'); lookup.name = "ST-Map"; lookup.label = "Lens Distortion"
+        lookup.interpolation = 'Linear'; lookup.extension = 'EXTEND'
+        lookup.location = (plate.location[0] - 250, plate.location[1] - 250)
+        if source:
+            links.new(source, lookup.inputs['Vector'])
+        links.new(lookup.outputs['Color'], plate.inputs['Vector'])
+    lookup.image = st_map
+    material["clip_tools_stmap"] = st_map.name
+    return True
+
+def restore_distortion_map(material):
+    """Re-applies the ST-map recorded on a material after its node tree was rebuilt."""
+    st_map = bpy.data.images.get(material.get("clip_tools_stmap", ""))
+    if st_map:
+        set_distortion_map(material, st_map)
+
+@instrumented
+def apply_lens_distortion(clip, enable=True):
+    """
+    Wires the clip's ST-map into every projection and image plane material showing the clip, or
+    removes it again. Returns (ST-map image or None, number of materials changed).
+    """
+    st_map = get_distortion_map(clip) if enable else None
+    materials = [m for m in bpy.data.materials if m.get("clip_tools_clip") == clip.name and m.node_tree]
+    changed = sum(1 for material in materials if set_distortion_map(material, st_map))
+    return st_map, changed
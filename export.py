@@ -0,0 +1,270 @@
+# Clip_Tools - Export
+#
+# Writing tracking data to files for other applications.
+
+import os
+import json
+import numpy as np
+from .instrumentation import instrumented
+from .lens import get_intrinsics
+from .reconstruction import read_track_bundles, transform_points, get_camera_path, get_tracking_world_matrix
+
+# Column name -> (dtype, per-row shape) of the columnar marker layout.
+MARKER_COLUMNS = {
+    "object_index": (np.int16, ()),
+    "track_index": (np.int32, ()),
+    "frame": (np.int32, ()),
+    "co": (np.float32, (2,)),
+    "pattern_corners": (np.float32, (4, 2)),
+    "enabled": (np.bool_, ()),
+}
+
+def read_track_markers(track):
+    """Reads all markers of a track in bulk: frame, co, pattern_corners and enabled as NumPy arrays."""
+    markers = track.markers
+    count = len(markers)
+    frames = np.empty(count, dtype=np.int32); markers.foreach_get("frame", frames)
+    co = np.empty(count * 2, dtype=np.float32); markers.foreach_get("co", co)
+    corners = np.empty(count * 8, dtype=np.float32); markers.foreach_get("pattern_corners", corners)
+    mute = np.empty(count, dtype=bool); markers.foreach_get("mute", mute)
+    return {"frame": frames, "co": co.reshape(count, 2), "pattern_corners": corners.reshape(count, 4, 2), "enabled": ~mute}
+
+def iter_export_tracks(clip, selected_only=False):
+    """Yields (object index, tracking object, track index, track) for every track to export."""
+    for object_index, tracking_object in enumerate(clip.tracking.objects):
+        tracks = tracking_object.tracks
+        selected = np.ones(len(tracks), dtype=bool)
+        if selected_only:
+            tracks.foreach_get("select", selected)
+        for track_index in np.flatnonzero(selected):
+            yield object_index, tracking_object, int(track_index), tracks[int(track_index)]
+
+def _csv_field(text):
+    return '"' + text.replace('"', '""') + '"' if any(c in text for c in ',"\n') else text
+
+# Markers formatted per CSV block; tracks are gathered until a block holds about this many rows.
+CSV_BLOCK_ROWS = 1 << 17
+
+def _fixed_point_layout(values, decimals):
+    """Rounded magnitudes of values in units of the last decimal, the negative mask, sign width and integer digit count."""
+    scaled = np.rint(np.abs(values.astype(np.float64)) * 10 ** decimals)
+    scaled = scaled.astype(np.uint32 if scaled.max(initial=0) < 2 ** 32 else np.uint64)
+    negative = (values < 0) & (scaled != 0)
+    return scaled, negative, int(negative.any()), len(str(int(scaled.max(initial=0)) // 10 ** decimals))
+
+def _write_fixed_point(out, scaled, negative, sign, integer_digits, decimals):
+    """
+    Writes values like '%.<decimals>f' into the (N, W) byte view `out`, right-aligned. Unused leading
+    positions stay zero bytes, which format_csv_rows drops.
+    """
+    digit_columns = [sign + i for i in range(integer_digits)] + [out.shape[1] - decimals + i for i in range(decimals)]
+    value = scaled
+    for column in reversed(digit_columns):
+        quotient = value // 10
+        out[:, column] = value - quotient * 10 + ord("0")
+        # Integer digits above the units digit are padding once the remaining value is zero.
+        if sign <= column < sign + integer_digits - 1:
+            out[value == 0, column] = 0
+        value = quotient
+    if sign:
+        out[negative, 0] = ord("-")
+    if decimals:
+        out[:, -decimals - 1] = ord(".")
+
+def format_csv_rows(prefixes, counts, columns):
+    """
+    Formats rows as CSV bytes column by column with NumPy instead of one string format per row.
+    prefixes: encoded leading text of each group of `counts` rows; columns: (values, decimals) pairs,
+    written like '%.<decimals>f' ('%d' for 0 decimals).
+    """
+    layouts = [(*_fixed_point_layout(values, decimals), decimals) for values, decimals in columns]
+    prefix_width = max(map(len, prefixes), default=0)
+    widths = [sign + integer_digits + (decimals + 1 if decimals else 0) + 1 for _, _, sign, integer_digits, decimals in layouts]
+    # Column-major, so every character column is written contiguously; tobytes() emits the rows.
+    table = np.zeros((int(sum(counts)), prefix_width + sum(widths)), dtype=np.uint8, order='F')
+    prefix_chars = np.zeros((len(prefixes), prefix_width), dtype=np.uint8)
+    for i, prefix in enumerate(prefixes):
+        prefix_chars[i, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+    table[:, :prefix_width] = np.repeat(prefix_chars, counts, axis=0)
+    start = prefix_width
+    for layout, width in zip(layouts, widths):
+        _write_fixed_point(table[:, start:start + width - 1], *layout)
+        table[:, start + width - 1] = ord(",")
+        start += width
+    table[:, -1] = ord("\n")
+    # Padding is dropped in one pass over the bytes.
+    return table.tobytes(order='C').translate(None, b"\0")
+
+def write_markers_csv(path, clip, selected_only=False):
+    """Streams markers to a CSV file in blocks of tracks. Returns the number of rows written."""
+    header = "object,track,frame,x,y," + ",".join(f"corner{i}_{axis}" for i in range(1, 5) for axis in "xy") + ",enabled"
+    rows = 0
+    block = []
+    def write_block(f):
+        frame, co, corners, enabled = (np.concatenate([data[key] for _, data in block]) for key in ("frame", "co", "pattern_corners", "enabled"))
+        corners = corners.reshape(-1, 8)
+        columns = [(frame, 0), *((co[:, i], 6) for i in range(2)), *((corners[:, i], 6) for i in range(8)), (enabled, 0)]
+        f.write(format_csv_rows([prefix for prefix, _ in block], [len(data["frame"]) for _, data in block], columns))
+        block.clear()
+    with open(path, "wb") as f:
+        f.write((header + "\n").encode("utf-8"))
+        block_rows = 0
+        for _, tracking_object, _, track in iter_export_tracks(clip, selected_only):
+            data = read_track_markers(track)
+            if not len(data["frame"]):
+                continue
+            block.append((f"{_csv_field(tracking_object.name)},{_csv_field(track.name)},".encode("utf-8"), data))
+            rows += len(data["frame"])
+            block_rows += len(data["frame"])
+            if block_rows >= CSV_BLOCK_ROWS:
+                write_block(f)
+                block_rows = 0
+        if block:
+            write_block(f)
+    return rows
+
+def write_markers_npy(directory, clip, selected_only=False):
+    """
+    Streams markers into one memory-mappable .npy file per column plus tracks.json with names and clip metadata.
+    Returns the number of rows written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tracks = list(iter_export_tracks(clip, selected_only))
+    # Row counts are known up front, so every column is preallocated on disk and filled track by track.
+    counts = [len(track.markers) for _, _, _, track in tracks]
+    total = sum(counts)
+    columns = {name: np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode='w+', dtype=dtype, shape=(total, *shape))
+               for name, (dtype, shape) in MARKER_COLUMNS.items()}
+    row = 0
+    for (object_index, _, track_index, track), count in zip(tracks, counts):
+        data = read_track_markers(track)
+        rows = slice(row, row + count)
+        columns["object_index"][rows] = object_index; columns["track_index"][rows] = track_index
+        for name, values in data.items():
+            columns[name][rows] = values
+        row += count
+    for column in columns.values():
+        column.flush()
+    del columns
+    metadata = {
+        "clip": clip.name, "filepath": clip.filepath, "size": list(clip.size), "frame_start": clip.frame_start, "frame_offset": clip.frame_offset,
+        "rows": total, "columns": list(MARKER_COLUMNS),
+        "objects": [{"name": o.name, "is_camera": o.is_camera, "tracks": [t.name for t in o.tracks]} for o in clip.tracking.objects],
+    }
+    with open(os.path.join(directory, "tracks.json"), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    return total
+
+@instrumented
+def export_markers(filepath, clip, file_format='CSV', selected_only=False):
+    """Exports the clip's 2D markers as 'CSV' (one file) or 'NPY' (a directory of columns). Returns the row count."""
+    if file_format == 'NPY':
+        return write_markers_npy(filepath, clip, selected_only)
+    return write_markers_csv(filepath, clip, selected_only)
+
+# Rotation of -90 degrees about X: Blender's Z-up world to a Y-up world, (x, y, z) -> (x, z, -y).
+Y_UP = np.array(((1.0, 0.0, 0.0, 0.0), (0.0, 0.0, 1.0, 0.0), (0.0, -1.0, 0.0, 0.0), (0.0, 0.0, 0.0, 1.0)))
+
+def get_solve_base_matrix(scene, clip, camera_track):
+    """
+    Tracking space -> world: the placement the scene camera's Camera Solver adds to the reconstruction
+    (set origin, floor, scale). Identity when the scene camera is not solved from this clip.
+    """
+    camera = scene.camera
+    solver = next((c for c in camera.constraints if c.type == 'CAMERA_SOLVER' and c.enabled), None) if camera else None
+    solver_clip = (scene.active_clip if solver.use_active_clip else solver.clip) if solver else None
+    if solver_clip != clip:
+        return np.identity(4)
+    return np.array(get_tracking_world_matrix(scene, clip, camera_track), dtype=np.float64)
+
+def read_camera_solve(scene, clip, use_scene_space=True):
+    """
+    Reads the clip's camera solve without stepping the scene: solved scene frames, (F, 4, 4) camera world
+    matrices, (N, 3) bundles with their track names, and the tracking camera's intrinsics.
+    """
+    camera_track = next((o for o in clip.tracking.objects if o.is_camera), None)
+    if camera_track is None or not camera_track.reconstruction.is_valid:
+        return None
+    path = get_camera_path(clip, camera_track)
+    solved = np.flatnonzero(path.valid)
+    base = get_solve_base_matrix(scene, clip, camera_track) if use_scene_space else np.identity(4)
+    tracks = camera_track.tracks
+    bundles, has_bundle, _ = read_track_bundles(tracks)
+    track_indices = np.flatnonzero(has_bundle)
+    return {
+        "frames": solved + path.first_frame, "matrices": base @ path.matrices[solved],
+        "bundles": transform_points(base, bundles[track_indices]), "names": [tracks[int(i)].name for i in track_indices],
+        "intrinsics": get_intrinsics(clip),
+    }
+
+def field_of_view(intrinsics):
+    """Horizontal and vertical field of view in degrees of the tracking camera."""
+    focal_y = intrinsics.focal * intrinsics.pixel_aspect
+    return (np.degrees(2.0 * np.arctan(intrinsics.width / (2.0 * intrinsics.focal))),
+            np.degrees(2.0 * np.arctan(intrinsics.height / (2.0 * focal_y))))
+
+def matrices_to_euler_zxy(matrices):
+    """
+    (F, 3) Euler angles in degrees for Nuke's default ZXY rotation order (R = Ry @ Rx @ Rz), unwrapped
+    over the frames so the curves do not jump by 360 degrees.
+    """
+    rotation = matrices[:, :3, :3] / np.linalg.norm(matrices[:, :3, :3], axis=1, keepdims=True)
+    x = np.arcsin(np.clip(-rotation[:, 1, 2], -1.0, 1.0))
+    y = np.arctan2(rotation[:, 0, 2], rotation[:, 2, 2])
+    z = np.arctan2(rotation[:, 1, 0], rotation[:, 1, 1])
+    return np.degrees(np.unwrap(np.stack((x, y, z), axis=1), axis=0))
+
+def write_camera_chan(path, frames, matrices, intrinsics):
+    """Nuke .chan: frame, translation, ZXY rotation in degrees and vertical field of view, in a Y-up world."""
+    matrices = Y_UP @ matrices
+    _, vertical_fov = field_of_view(intrinsics)
+    table = np.column_stack((frames, matrices[:, :3, 3], matrices_to_euler_zxy(matrices), np.full(len(frames), vertical_fov)))
+    np.savetxt(path, table, fmt="%d" + "\t%.6f" * 7)
+    return len(table)
+
+def write_camera_table(path, frames, matrices, intrinsics):
+    """Plain text table: frame, the 16 camera-to-world matrix values (row-major), FOVs and focal length in pixels."""
+    horizontal_fov, vertical_fov = field_of_view(intrinsics)
+    header = "frame " + " ".join(f"m{row}{col}" for row in range(4) for col in range(4)) + " hfov vfov focal_px"
+    lens = np.tile((horizontal_fov, vertical_fov, intrinsics.focal), (len(frames), 1))
+    table = np.column_stack((frames, matrices.reshape(-1, 16), lens))
+    np.savetxt(path, table, fmt="%d" + " %.9g" * 19, header=header)
+    return len(table)
+
+def write_bundles_xyz(path, points):
+    """One 'x y z' line per bundle."""
+    np.savetxt(path, points, fmt="%.6f %.6f %.6f")
+    return len(points)
+
+def write_bundles_ply(path, points, comments=()):
+    """Binary little-endian PLY point cloud of the bundles."""
+    header = ["ply", "format binary_little_endian 1.0", *(f"comment {c}" for c in comments),
+              f"element vertex {len(points)}", "property float x", "property float y", "property float z", "end_header"]
+    with open(path, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+        f.write(np.ascontiguousarray(points, dtype="<f4").tobytes())
+    return len(points)
+
+@instrumented
+def export_camera_solve(filepath, scene, clip, chan=True, table=True, bundles='PLY', use_scene_space=True, y_up=False):
+    """
+    Writes the camera solve and bundles next to filepath (its extension is replaced): <name>.chan, <name>.txt and
+    <name>.ply or <name>.xyz. Returns {"frames", "bundles", "files"}, or None when the clip has no camera solve.
+    """
+    solve = read_camera_solve(scene, clip, use_scene_space)
+    if solve is None:
+        return None
+    stem = os.path.splitext(filepath)[0]
+    matrices, points = solve["matrices"], solve["bundles"]
+    files = []
+    if chan:
+        write_camera_chan(stem + ".chan", solve["frames"], matrices, solve["intrinsics"]); files.append(stem + ".chan")
+    if y_up:
+        matrices = Y_UP @ matrices; points = transform_points(Y_UP, points)
+    if table:
+        write_camera_table(stem + ".txt", solve["frames"], matrices, solve["intrinsics"]); files.append(stem + ".txt")
+    if bundles == 'PLY':
+        write_bundles_ply(stem + ".ply", points, (f"clip {clip.name}", "y_up" if y_up else "z_up")); files.append(stem + ".ply")
+    elif bundles == 'XYZ':
+        write_bundles_xyz(stem + ".xyz", points); files.append(stem + ".xyz")
+    return {"frames": len(solve["frames"]), "bundles": len(points), "files": files}
@@ -0,0 +1,96 @@
+# Clip_Tools - Footage
+#
+# Loading clip footage as images and indexing image sequences on disk.
+
+import bpy
+import os
+import re
+from collections import namedtuple
+import numpy as np
+from .instrumentation import instrumented
+
+def get_frame_number_from_path(filepath):
+    """Extracts the frame number sequence from the end of a filepath string."""
+    if not filepath:
+        return None
+    # This regex specifically looks for a number sequence right before the file extension.
+    match = re.search(r'(\d+)\.\w+$', filepath)
+    return int(match.group(1)) if match else None
+
+SequenceInfo = namedtuple("SequenceInfo", ("first", "last", "padding", "count", "missing"))
+
+# Directory path -> (mtime_ns, {(head, tail): SequenceInfo}); one scan serves every sequence in the folder.
+_sequence_index_cache = {}
+
+def _scan_sequence_directory(directory):
+    """Scans a plate directory once and groups its numbered files into sequences."""
+    pattern = re.compile(r'^(.*?)(\d+)(\.\w+)$')
+    groups = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            match = pattern.match(entry.name)
+            if match:
+                groups.setdefault((match.group(1), match.group(3)), []).append(match.group(2))
+    sequences = {}
+    for key, numbers in groups.items():
+        frames = np.unique(np.fromiter((int(n) for n in numbers), dtype=np.int64, count=len(numbers)))
+        first, last = int(frames[0]), int(frames[-1])
+        missing = tuple(np.setdiff1d(np.arange(first, last + 1), frames).tolist())
+        sequences[key] = SequenceInfo(first, last, min(len(n) for n in numbers), len(frames), missing)
+    return sequences
+
+@instrumented
+def index_image_sequence(filepath):
+    """
+    Returns the SequenceInfo (real first/last frame, padding, frame count and missing frames) of the
+    image sequence a file belongs to, or None. Results are cached until the directory's mtime changes.
+    """
+    if not filepath:
+        return None
+    filepath = bpy.path.abspath(filepath)
+    directory, filename = os.path.split(filepath)
+    match = re.match(r'^(.*?)(\d+)(\.\w+)$', filename)
+    if not match:
+        return None
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+        cached = _sequence_index_cache.get(directory)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, _scan_sequence_directory(directory))
+            _sequence_index_cache[directory] = cached
+    except OSError:
+        return None
+    return cached[1].get((match.group(1), match.group(3)))
+
+def clear_sequence_index_cache():
+    """Forgets all indexed sequences, forcing the next lookup to rescan."""
+    _sequence_index_cache.clear()
+
+def configure_image_user(img_user, image, clip):
+    """Matches an Image Texture's frame range to where the clip plays in the scene."""
+    img_user.use_auto_refresh = True
+    if image.source not in {'SEQUENCE', 'MOVIE'}:
+        return
+    first_frame, last_frame = 1, clip.frame_duration
+    if image.source == 'SEQUENCE':
+        number = get_frame_number_from_path(image.filepath_raw)
+        if number is not None:
+            info = index_image_sequence(image.filepath_raw)
+            first_frame, last_frame = number, info.last if info is not None else number + clip.frame_duration - 1
+    # The clip shows footage frame first_frame + frame_offset at its start frame. A negative offset starts the
+    # footage later in the scene, so the image user begins where the first file is shown.
+    skipped = max(-clip.frame_offset, 0)
+    shown_first = first_frame + clip.frame_offset + skipped
+    img_user.use_cyclic = True
+    img_user.frame_start = clip.frame_start + skipped
+    img_user.frame_offset = shown_first - 1
+    img_user.frame_duration = max(last_frame - shown_first + 1, 1)
+
+@instrumented
+def load_clip_image(clip):
+    """Loads (or reuses) the Image data-block for a clip's footage."""
+    image = bpy.data.images.load(clip.filepath, check_existing=True)
+    if image.source == 'FILE' and clip.source == 'SEQUENCE':
+        image.source = 'SEQUENCE'
+    image["clip_tools_clip"] = clip.name
+    return image
@@ -0,0 +1,123 @@
+# Clip_Tools - Image Plane
+#
+# Camera-parented image plane with live drivers or baked animation.
+
+import bpy
+import numpy as np
+from .instrumentation import instrumented, timed_phase
+from .animation import sample_property, write_fcurve_samples
+from .footage import configure_image_user, load_clip_image
+
+def setup_image_plane_driver_variables(driver, imageplane, camera, scene):
+    """Sets up the necessary variables for the image plane drivers. (Original Logic)"""
+    needed_vars = {
+        'cA': ('CAMERA', "angle", camera.data), 'cT': ('CAMERA', 'type', camera.data),
+        'cSx': ('CAMERA', 'shift_x', camera.data), 'cSy': ('CAMERA', 'shift_y', camera.data),
+        'r_x': ('SCENE', 'render.resolution_x', scene), 'r_y': ('SCENE', 'render.resolution_y', scene),
+        'p_x': ('SCENE', 'render.pixel_aspect_x', scene), 'p_y': ('SCENE', 'render.pixel_aspect_y', scene),
+    }
+    for name, (id_type, path, target_id) in needed_vars.items():
+        if name not in driver.variables:
+            var = driver.variables.new(); var.name = name; var.type = 'SINGLE_PROP'
+            var.targets[0].id_type = id_type; var.targets[0].id = target_id; var.targets[0].data_path = path
+    if 'depth' not in driver.variables:
+        var = driver.variables.new(); var.name = 'depth'; var.type = 'TRANSFORMS'
+        var.targets[0].id = imageplane; var.targets[0].data_path = 'location'
+        var.targets[0].transform_type = 'LOC_Z'; var.targets[0].transform_space = 'LOCAL_SPACE'
+    if 'scale_y' not in driver.variables:
+        var = driver.variables.new(); var.name = 'scale_y'; var.type = 'SINGLE_PROP'
+        var.targets[0].id = imageplane; var.targets[0].data_path = 'scale[1]'
+
+@instrumented
+def setup_image_plane_drivers(imageplane, camera, scene):
+    """Sets up the drivers for the image plane's scale and location. (Original Logic)"""
+    base_expr = "abs(depth) * tan(cA/2)"; aspect_expr = "(r_y * p_y) / (r_x * p_x)"
+    half_width_expr = f"({base_expr})"; half_height_expr = f"({base_expr}) * {aspect_expr}"
+    
+    driver_x = imageplane.driver_add('scale', 0).driver; driver_x.type = 'SCRIPTED'
+    setup_image_plane_driver_variables(driver_x, imageplane, camera, scene)
+    driver_x.expression = f"{half_width_expr} if cT == 0 else 0"
+    
+    driver_y = imageplane.driver_add('scale', 1).driver; driver_y.type = 'SCRIPTED'
+    setup_image_plane_driver_variables(driver_y, imageplane, camera, scene)
+    driver_y.expression = f"{half_height_expr} if cT == 0 else 0"
+    
+    driver_loc_x = imageplane.driver_add('location', 0).driver; driver_loc_x.type = 'SCRIPTED'
+    setup_image_plane_driver_variables(driver_loc_x, imageplane, camera, scene)
+    driver_loc_x.expression = f"cSx * 2 * {half_width_expr}"
+    
+    driver_loc_y = imageplane.driver_add('location', 1).driver; driver_loc_y.type = 'SCRIPTED'
+    setup_image_plane_driver_variables(driver_loc_y, imageplane, camera, scene)
+    driver_loc_y.expression = f"cSy * 2 * scale_y * (r_x / r_y)"
+
+@instrumented
+def bake_image_plane_animation(scene, imageplane, camera, depth):
+    """Bakes the image plane driver expressions for the whole scene frame range in one vectorized pass."""
+    cam_data = camera.data
+    frames = np.arange(scene.frame_start, scene.frame_end + 1, dtype=np.float64)
+    lens = sample_property(cam_data, "lens", frames)
+    sensor_path = "sensor_height" if cam_data.sensor_fit == 'VERTICAL' else "sensor_width"
+    sensor = sample_property(cam_data, sensor_path, frames)
+    shift_x = sample_property(cam_data, "shift_x", frames); shift_y = sample_property(cam_data, "shift_y", frames)
+    r_x = sample_property(scene, "render.resolution_x", frames); r_y = sample_property(scene, "render.resolution_y", frames)
+    p_x = sample_property(scene, "render.pixel_aspect_x", frames); p_y = sample_property(scene, "render.pixel_aspect_y", frames)
+    # abs(depth) * tan(angle / 2) with angle = 2 * atan(sensor / (2 * lens))
+    half_width = abs(depth) * sensor / (2.0 * lens)
+    if cam_data.type != 'PERSP':
+        half_width = np.zeros_like(half_width)
+    half_height = half_width * (r_y * p_y) / (r_x * p_x)
+    write_fcurve_samples(imageplane, "scale", 0, frames, half_width)
+    write_fcurve_samples(imageplane, "scale", 1, frames, half_height)
+    write_fcurve_samples(imageplane, "location", 0, frames, shift_x * 2.0 * half_width)
+    write_fcurve_samples(imageplane, "location", 1, frames, shift_y * 2.0 * half_height * (r_x / r_y))
+
+@instrumented
+def get_image_plane_material(image):
+    """Returns the emission/transparency material used by image planes for an image, creating it once."""
+    material_name = 'mat_imageplane_' + image.name
+    material = bpy.data.materials.get(material_name)
+    if not material:
+        material = bpy.data.materials.new(name=material_name); material.use_nodes = True
+        material.node_tree.nodes.clear()
+        tex_image = material.node_tree.nodes.new('ShaderNodeTexImage')
+        emission = material.node_tree.nodes.new('ShaderNodeEmission')
+        transparent = material.node_tree.nodes.new('ShaderNodeBsdfTransparent')
+        mix_shader = material.node_tree.nodes.new('ShaderNodeMixShader')
+        output = material.node_tree.nodes.new('ShaderNodeOutputMaterial')
+        tex_image.location = (-300, 300); emission.location = (0, 300)
+        transparent.location = (0, 0); mix_shader.location = (300, 200)
+        output.location = (600, 200)
+        links = material.node_tree.links
+        links.new(tex_image.outputs['Color'], emission.inputs['Color'])
+        links.new(tex_image.outputs['Alpha'], mix_shader.inputs['Fac'])
+        links.new(transparent.outputs['BSDF'], mix_shader.inputs[1])
+        links.new(emission.outputs['Emission'], mix_shader.inputs[2])
+        links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
+    return material
+
+def create_image_plane(scene, collection, camera, clip, depth=10.0, mode='LIVE'):
+    """
+    Context-free Create Image Plane: builds a camera-parented 2x2 plane (same as the Plane primitive)
+    through the data API, so it also works in background mode.
+    """
+    image = load_clip_image(clip)
+    with timed_phase("image_plane_mesh"):
+        mesh = bpy.data.meshes.new("ImagePlane_" + camera.name)
+        mesh.from_pydata([(-1, -1, 0), (1, -1, 0), (1, 1, 0), (-1, 1, 0)], [], [(0, 1, 2, 3)])
+        mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", (0, 0, 1, 0, 1, 1, 0, 1))
+        imageplane = bpy.data.objects.new("ImagePlane_" + camera.name, mesh)
+        collection.objects.link(imageplane)
+        imageplane.parent = camera
+        imageplane.location = (0, 0, -depth)
+    if mode == 'BAKED':
+        bake_image_plane_animation(scene, imageplane, camera, depth)
+    else:
+        setup_image_plane_drivers(imageplane, camera, scene)
+    material = get_image_plane_material(image)
+    imageplane.data.materials.append(material)
+    material["clip_tools_clip"] = clip.name
+    tex_image_node = material.node_tree.nodes.get("Image Texture")
+    if tex_image_node:
+        tex_image_node.image = image
+        configure_image_user(tex_image_node.image_user, image, clip)
+    return imageplane
@@ -0,0 +1,140 @@
+# Clip_Tools - Instrumentation
+#
+# Opt-in timing for operators and their builder helpers (Preferences > Add-ons > Clip Tools, or
+# CLIP_TOOLS_INSTRUMENT=1 on the farm). When disabled, the wrappers only check one flag.
+
+import bpy
+import os
+import json
+import time
+import functools
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+
+_active_timing = []  # Stack of the records being collected; empty when nothing is instrumented.
+
+timing_records = deque(maxlen=20)
+
+def get_addon_preferences():
+    """Returns the addon preferences, or None when the addon is not registered (e.g. batch.py)."""
+    addon = bpy.context.preferences.addons.get(__package__)
+    return addon.preferences if addon else None
+
+def is_instrumentation_enabled():
+    prefs = get_addon_preferences()
+    return bool(os.environ.get("CLIP_TOOLS_INSTRUMENT")) or bool(prefs and prefs.enable_instrumentation)
+
+def get_timing_log_path():
+    prefs = get_addon_preferences()
+    path = os.environ.get("CLIP_TOOLS_TIMING_LOG") or (prefs.log_path if prefs else "")
+    return bpy.path.abspath(path) if path else os.path.join(tempfile.gettempdir(), "clip_tools_timing.log")
+
+@contextmanager
+def timed_phase(name):
+    """Adds the wall time of the enclosed block to the active timing record under `name`."""
+    if not _active_timing:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase = _active_timing[-1]["phases"].setdefault(name, {"seconds": 0.0, "calls": 0})
+        phase["seconds"] += time.perf_counter() - start; phase["calls"] += 1
+
+def instrumented(func):
+    """Decorator recording a helper as a phase of the operator currently being timed."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _active_timing:
+            return func(*args, **kwargs)
+        with timed_phase(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def _count_datablocks():
+    """Counts objects, shader/geometry nodes and drivers in the file."""
+    trees = list(bpy.data.node_groups) + [m.node_tree for m in bpy.data.materials if m.node_tree]
+    animated = list(bpy.data.objects) + list(bpy.data.node_groups)
+    return {
+        "objects": len(bpy.data.objects),
+        "nodes": sum(len(t.nodes) for t in trees),
+        "drivers": sum(len(i.animation_data.drivers) for i in animated if i.animation_data),
+    }
+
+def _finish_timing_record(record, profiler):
+    """Stores a finished record, appends it to the log file and writes the optional cProfile dump."""
+    log_path = get_timing_log_path()
+    try:
+        if profiler:
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(record["time"]))
+            record["profile"] = os.path.join(os.path.dirname(log_path), f"clip_tools_{record['operator']}_{stamp}.prof")
+            profiler.dump_stats(record["profile"])
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"Clip Tools: could not write timing log '{log_path}': {e}")
+    timing_records.appendleft(record)
+
+class OperatorTiming:
+    """
+    Timing record of one operator run. Phases are collected while the run is resumed, so a modal job
+    is timed from invoke to finish or cancel and only its own steps count as phases.
+    """
+    def __init__(self, idname):
+        prefs = get_addon_preferences()
+        self.before = _count_datablocks()
+        self.record = {"operator": idname, "time": time.time(), "phases": {}}
+        self.profiler = None
+        if bool(os.environ.get("CLIP_TOOLS_PROFILE")) or bool(prefs and prefs.use_profiler):
+            import cProfile
+            self.profiler = cProfile.Profile()
+        self.start = time.perf_counter()
+
+    @classmethod
+    def begin(cls, idname):
+        """Starts timing an operator, or returns None when instrumentation is disabled."""
+        return cls(idname) if is_instrumentation_enabled() else None
+
+    @contextmanager
+    def resumed(self):
+        _active_timing.append(self.record)
+        if self.profiler:
+            self.profiler.enable()
+        try:
+            yield
+        finally:
+            if self.profiler:
+                self.profiler.disable()
+            _active_timing.pop()
+
+    def finish(self, context, result):
+        record = self.record
+        record["seconds"] = time.perf_counter() - self.start
+        record["result"] = sorted(result)
+        after = _count_datablocks()
+        record["created"] = {key: after[key] - self.before[key] for key in after}
+        # Cost of evaluating what the operator changed, which otherwise lands on the next redraw.
+        start = time.perf_counter()
+        context.view_layer.update()
+        record["depsgraph_seconds"] = time.perf_counter() - start
+        _finish_timing_record(record, self.profiler)
+        return result
+
+def instrument_operator(cls):
+    """Wraps an operator's execute() so it is timed when instrumentation is enabled."""
+    execute = cls.execute
+    if getattr(execute, "_clip_tools_instrumented", False):
+        return cls
+    @functools.wraps(execute)
+    def timed_execute(self, context):
+        timing = OperatorTiming.begin(cls.bl_idname)
+        if timing is None:
+            return execute(self, context)
+        with timing.resumed():
+            result = execute(self, context)
+        return timing.finish(context, result)
+    timed_execute._clip_tools_instrumented = True
+    cls.execute = timed_execute
+    return cls
@@ -0,0 +1,71 @@
+# Clip_Tools - Lens
+#
+# Camera intrinsics and lens distortion models of the Movie Clip tracking camera, on NumPy arrays.
+
+import numpy as np
+from collections import namedtuple
+
+Intrinsics = namedtuple("Intrinsics", ("width", "height", "focal", "principal", "pixel_aspect", "model", "coefficients"))
+
+def get_intrinsics(clip):
+    """Reads the clip's tracking camera: focal length and principal point in pixels plus distortion coefficients."""
+    camera = clip.tracking.camera
+    model = camera.distortion_model
+    if model == 'POLYNOMIAL':
+        coefficients = (camera.k1, camera.k2, camera.k3)
+    elif model == 'DIVISION':
+        coefficients = (camera.division_k1, camera.division_k2)
+    elif model == 'BROWN':
+        coefficients = (camera.brown_k1, camera.brown_k2, camera.brown_k3, camera.brown_k4, camera.brown_p1, camera.brown_p2)
+    elif model == 'NUKE':
+        coefficients = (camera.nuke_k1, camera.nuke_k2)
+    else:
+        coefficients = ()
+    width, height = clip.size
+    return Intrinsics(width, height, camera.focal_length_pixels, tuple(camera.principal_point_pixels), camera.pixel_aspect, model, coefficients)
+
+def distort_normalized(x, y, intrinsics):
+    """
+    Applies the lens distortion to normalized (undistorted) image coordinates, following libmv's
+    Polynomial, Divisions, Nuke and Brown models.
+    """
+    c = intrinsics.coefficients
+    r2 = x * x + y * y
+    if intrinsics.model == 'POLYNOMIAL':
+        radial = 1.0 + r2 * (c[0] + r2 * (c[1] + r2 * c[2]))
+        return x * radial, y * radial
+    if intrinsics.model == 'DIVISION':
+        radial = 1.0 + r2 * (c[0] + r2 * c[1])
+        return x / radial, y / radial
+    if intrinsics.model == 'BROWN':
+        k1, k2, k3, k4, p1, p2 = c
+        radial = 1.0 + r2 * (k1 + r2 * (k2 + r2 * (k3 + r2 * k4)))
+        return (x * radial + 2.0 * p1 * x * y + p2 * (r2 + 2.0 * x * x),
+                y * radial + p1 * (r2 + 2.0 * y * y) + 2.0 * p2 * x * y)
+    if intrinsics.model == 'NUKE':
+        return distort_nuke(x, y, intrinsics)
+    return x, y
+
+def distort_nuke(x, y, intrinsics, iterations=20):
+    """
+    Nuke's model maps distorted to undistorted radii, ru = rd / (1 + k1 rd^2 + k2 rd^4), in pixel offsets from the
+    principal point divided by half the longest image side. Like libmv, it is applied by solving for rd with Newton's method.
+    """
+    k1, k2 = intrinsics.coefficients
+    half_size = max(intrinsics.width, intrinsics.height) * 0.5
+    scale_x, scale_y = intrinsics.focal / half_size, intrinsics.focal * intrinsics.pixel_aspect / half_size
+    ru = np.hypot(x * scale_x, y * scale_y)
+    rd = ru
+    for _ in range(iterations):
+        rd2 = rd * rd
+        rd = rd - (rd - ru * (1.0 + rd2 * (k1 + rd2 * k2))) / (1.0 - ru * rd * (2.0 * k1 + 4.0 * k2 * rd2))
+    # Distortion is radial, so every point scales by rd / ru (1 at the center).
+    ratio = np.divide(rd, ru, out=np.ones_like(ru), where=ru > 0)
+    return x * ratio, y * ratio
+
+def normalized_to_pixels(x, y, intrinsics):
+    """Normalized camera coordinates to pixel coordinates (origin at the bottom-left, like marker positions)."""
+    return x * intrinsics.focal + intrinsics.principal[0], y * intrinsics.focal * intrinsics.pixel_aspect + intrinsics.principal[1]
+
+def pixels_to_normalized(px, py, intrinsics):
+    return (px - intrinsics.principal[0]) / intrinsics.focal, (py - intrinsics.principal[1]) / (intrinsics.focal * intrinsics.pixel_aspect)
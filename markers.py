@@ -0,0 +1,276 @@
+# Clip_Tools - 3D Markers
+#
+# Turning reconstructed bundles into Empties or a track point cloud.
+
+import bpy
+import numpy as np
+from .instrumentation import instrumented
+from .animation import read_fcurve_samples, write_fcurve_samples
+from .modal import run_job
+from .reconstruction import read_track_bundles, transform_points, reconstructed_camera_matrices, camera_world_matrices, get_tracking_world_matrix
+
+@instrumented
+def get_track_points_node_group():
+    """Returns the shared Geometry Nodes group that displays track points with one 'Display Size' control."""
+    group = bpy.data.node_groups.get("Clip Tools | Track Points")
+    if group:
+        return group
+    group = bpy.data.node_groups.new(name="Clip Tools | Track Points", type='GeometryNodeTree')
+    group.interface.new_socket(name="Geometry", in_out="INPUT", socket_type='NodeSocketGeometry')
+    size_socket = group.interface.new_socket(name="Display Size", in_out="INPUT", socket_type='NodeSocketFloat')
+    size_socket.default_value = 0.05; size_socket.min_value = 0.0
+    group.interface.new_socket(name="Geometry", in_out="OUTPUT", socket_type='NodeSocketGeometry')
+    nodes = group.nodes; links = group.links
+    group_input = nodes.new('NodeGroupInput'); group_input.location = (-300, 0)
+    mesh_to_points = nodes.new('GeometryNodeMeshToPoints'); mesh_to_points.location = (0, 0)
+    group_output = nodes.new('NodeGroupOutput'); group_output.location = (300, 0)
+    links.new(group_input.outputs['Geometry'], mesh_to_points.inputs['Mesh']); links.new(group_input.outputs['Display Size'], mesh_to_points.inputs['Radius']); links.new(mesh_to_points.outputs['Points'], group_output.inputs['Geometry'])
+    return group
+
+# Id-property on the 'Trackpoint' parent mapping each track name to its Empty (an object pointer,
+# so renaming or re-parenting the Empties keeps them in sync).
+TRACK_MAP_PROP = "clip_tools_tracks"
+
+def new_track_empty(collection, parent_empty, name, location):
+    """One point Empty parented to the 'Trackpoint' parent, its display size driven by the parent's."""
+    empty = bpy.data.objects.new(name, None)
+    empty.empty_display_type = 'PLAIN_AXES'
+    empty.location = location
+    collection.objects.link(empty)
+    empty.parent = parent_empty
+    d = empty.driver_add("empty_display_size").driver
+    var = d.variables.new()
+    var.name = "size"
+    var.targets[0].id_type = 'OBJECT'
+    var.targets[0].id = parent_empty
+    var.targets[0].data_path = 'empty_display_size'
+    d.expression = "size"
+    return empty
+
+def iter_track_empties(collection, tracking_object, world_matrix, selected_only=True, created=None, clip=None):
+    """
+    Job behind create_track_empties: yields (done, total) after each Empty and returns (parent, empties,
+    track_indices). Every created object is also appended to `created`, for rollback.
+    """
+    created = [] if created is None else created
+    tracks = tracking_object.tracks
+    bundles, has_bundle, selected = read_track_bundles(tracks)
+    mask = has_bundle & selected if selected_only else has_bundle
+    indices = np.flatnonzero(mask).tolist()
+    if not indices:
+        return None, [], []
+    parent_empty = bpy.data.objects.new("Trackpoint", None)
+    parent_empty.empty_display_type = 'PLAIN_AXES'
+    parent_empty.empty_display_size = 1.0 
+    collection.objects.link(parent_empty)
+    created.append(parent_empty)
+    created_empties = []
+    for i, location in zip(indices, transform_points(world_matrix, bundles[mask]).tolist()):
+        empty = new_track_empty(collection, parent_empty, f"Track_{i + 1:03}", location)
+        created.append(empty)
+        created_empties.append(empty)
+        yield len(created_empties), len(indices)
+    parent_empty.location = (0, 0, 0)
+    if clip is not None:
+        parent_empty["clip_tools_clip"] = clip.name
+    parent_empty["clip_tools_tracking_object"] = tracking_object.name
+    parent_empty[TRACK_MAP_PROP] = {tracks[i].name: empty for i, empty in zip(indices, created_empties)}
+    return parent_empty, created_empties, indices
+
+@instrumented
+def create_track_empties(collection, tracking_object, world_matrix, selected_only=True, clip=None):
+    """
+    Creates a 'Trackpoint' parent and one driven Empty per (selected) track with a bundle.
+    Returns (parent, empties, track_indices); parent is None when nothing was created.
+    Passing the clip records the track -> Empty mapping used by sync_track_empties.
+    """
+    return run_job(iter_track_empties(collection, tracking_object, world_matrix, selected_only, clip=clip))
+
+# Bundles that moved less than this (in scene units) count as unchanged when syncing.
+SYNC_TOLERANCE = 1e-5
+
+def find_track_empties_parent(clip, tracking_object):
+    """The 'Trackpoint' parent of an earlier 3D Markers to Empty run on this tracking object, or None."""
+    for obj in bpy.data.objects:
+        if TRACK_MAP_PROP in obj and obj.get("clip_tools_clip") == clip.name and obj.get("clip_tools_tracking_object") == tracking_object.name:
+            return obj
+    return None
+
+def is_linked_object(obj):
+    """False for mapped Empties that were deleted or unlinked from every collection."""
+    return obj is not None and len(obj.users_collection) > 0
+
+def baked_samples_differ(empty, frames, locations):
+    """Compares an Empty's baked location keys with freshly computed (F, 3) locations."""
+    for axis in range(3):
+        samples = read_fcurve_samples(empty, "location", axis)
+        if samples is None or len(samples[0]) != len(frames) or not np.array_equal(samples[0], frames):
+            return True
+        if not np.allclose(samples[1], locations[:, axis], rtol=0.0, atol=SYNC_TOLERANCE):
+            return True
+    return False
+
+def iter_sync_track_empties(scene, collection, clip, tracking_object, world_matrix, animated=False, selected_only=True, remove_missing=False, created=None):
+    """
+    Job behind sync_track_empties: updates the Empties of an earlier run in place instead of creating a new set.
+    Only Empties whose bundle moved are touched, new (selected) tracks get an Empty, and Empties whose track was
+    deleted or lost its bundle are flagged with a 'clip_tools_missing' property (or removed). Without an earlier
+    run a new set is created. Yields (done, total) and returns a summary dictionary.
+    """
+    created = [] if created is None else created
+    summary = {"parent": None, "created": 0, "updated": 0, "unchanged": 0, "missing": 0, "removed": 0, "baked": None}
+    parent_empty = find_track_empties_parent(clip, tracking_object)
+    if parent_empty is None:
+        parent_empty, empties, indices = yield from iter_track_empties(collection, tracking_object, world_matrix, selected_only, created, clip)
+        summary.update(parent=parent_empty, created=len(empties))
+        if animated and empties:
+            summary["baked"] = yield from iter_bake_bundle_animation(scene, clip, tracking_object, empties, indices, created)
+        return summary
+    summary["parent"] = parent_empty
+    tracks = tracking_object.tracks
+    bundles, has_bundle, selected = read_track_bundles(tracks)
+    names = [track.name for track in tracks]
+    mapping = dict(parent_empty[TRACK_MAP_PROP].items())
+    # Tracks synced earlier stay synced even when they are no longer selected.
+    mapped = np.fromiter((name in mapping for name in names), dtype=bool, count=len(names))
+    indices = np.flatnonzero(has_bundle & (selected | mapped) if selected_only else has_bundle).tolist()
+    locations = transform_points(world_matrix, bundles[indices])
+    baked = bundle_world_locations(scene, clip, tracking_object, indices) if animated else None
+    if animated:
+        summary["baked"] = baked is not None
+    present = {names[i] for i in indices}
+    missing = [name for name, obj in mapping.items() if name not in present and is_linked_object(obj)]
+    # New Empties are created as the job runs and rolled back through `created` on cancel. Changes to existing
+    # Empties are only staged here and applied after the last yield, so a cancelled sync leaves them untouched.
+    synced = {}; moved = []; rekeyed = []; unflagged = []
+    for t, i in enumerate(indices):
+        empty = mapping.get(names[i])
+        is_new = not is_linked_object(empty)
+        if is_new:
+            empty = new_track_empty(collection, parent_empty, f"Track_{i + 1:03}", locations[t].tolist())
+            created.append(empty)
+            summary["created"] += 1
+            if baked:
+                for axis in range(3):
+                    write_fcurve_samples(empty, "location", axis, baked[0], baked[1][:, t, axis])
+                created.append(empty.animation_data.action)
+        else:
+            if "clip_tools_missing" in empty:
+                unflagged.append(empty)
+            if baked:
+                changed = baked_samples_differ(empty, baked[0], baked[1][:, t])
+                if changed:
+                    rekeyed.append((empty, t))
+            else:
+                changed = float(np.abs(np.array(empty.location, dtype=np.float64) - locations[t]).max()) > SYNC_TOLERANCE
+                if changed:
+                    moved.append((empty, t))
+            summary["updated" if changed else "unchanged"] += 1
+        synced[names[i]] = empty
+        yield t + 1, len(indices)
+    for empty in unflagged:
+        del empty["clip_tools_missing"]
+    for empty, t in moved:
+        empty.location = locations[t].tolist()
+    for empty, t in rekeyed:
+        for axis in range(3):
+            write_fcurve_samples(empty, "location", axis, baked[0], baked[1][:, t, axis])
+    removed = []
+    for name in missing:
+        empty = mapping[name]
+        if remove_missing:
+            removed.append(empty)
+        else:
+            empty["clip_tools_missing"] = True
+            synced[name] = empty
+    if removed:
+        bpy.data.batch_remove(removed)
+    summary["removed"] = len(removed); summary["missing"] = len(missing) - len(removed)
+    parent_empty[TRACK_MAP_PROP] = synced
+    return summary
+
+@instrumented
+def sync_track_empties(scene, collection, clip, tracking_object, world_matrix, animated=False, selected_only=True, remove_missing=False):
+    """Re-syncs the Empties of an earlier run with the current solve. Returns a summary dictionary."""
+    return run_job(iter_sync_track_empties(scene, collection, clip, tracking_object, world_matrix, animated, selected_only, remove_missing))
+
+@instrumented
+def create_track_point_cloud(collection, tracking_object, world_matrix, selected_only=True):
+    """Writes all (selected) bundles into one mesh object using bulk reads and a single matrix multiply."""
+    bundles, has_bundle, selected = read_track_bundles(tracking_object.tracks)
+    mask = has_bundle & selected if selected_only else has_bundle
+    if not mask.any():
+        return None
+    points = transform_points(world_matrix, bundles[mask])
+    indices = np.flatnonzero(mask)
+    mesh = bpy.data.meshes.new("Trackpoints")
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", points.astype(np.float32).ravel())
+    index_attr = mesh.attributes.new("track_index", 'INT', 'POINT')
+    index_attr.data.foreach_set("value", indices.astype(np.int32))
+    # String attributes have no foreach_set; one pass over the data items is still far cheaper than one object per track.
+    name_attr = mesh.attributes.new("track_name", 'STRING', 'POINT')
+    tracks = tracking_object.tracks
+    for item, i in zip(name_attr.data, indices.tolist()):
+        item.value = tracks[i].name
+    mesh.update()
+    point_obj = bpy.data.objects.new("Trackpoints", mesh)
+    modifier = point_obj.modifiers.new("Track Points", 'NODES')
+    modifier.node_group = get_track_points_node_group()
+    collection.objects.link(point_obj)
+    return point_obj
+
+def bundle_world_locations(scene, clip, tracking_object, track_indices):
+    """
+    World locations of the given bundles at every reconstructed frame, computed in one batch:
+    (scene frames, (F, T, 3) locations), or None when there is no solve.
+    """
+    camera = scene.camera
+    if not camera or not tracking_object.reconstruction.is_valid:
+        return None
+    frames, recon = reconstructed_camera_matrices(clip, tracking_object)
+    if not len(frames):
+        return None
+    world = camera_world_matrices(scene, camera, frames) @ np.linalg.inv(recon)
+    bundles, _, _ = read_track_bundles(tracking_object.tracks)
+    points = np.concatenate((bundles[track_indices], np.ones((len(track_indices), 1), dtype=np.float32)), axis=1)
+    # (frames x 4 x 4) @ (4 x tracks) -> frames x tracks x 4
+    return frames, np.einsum('fij,tj->fti', world, points)[..., :3]
+
+def iter_bake_bundle_animation(scene, clip, tracking_object, empties, track_indices, created=None):
+    """
+    Job behind bake_bundle_animation: transforms the bundles for all reconstructed frames in one batch,
+    then yields (done, total) after each Empty's F-curves. Returns False when there is no solve to bake from.
+    """
+    created = [] if created is None else created
+    baked = bundle_world_locations(scene, clip, tracking_object, track_indices)
+    if baked is None:
+        return False
+    frames, locations = baked
+    for t, empty in enumerate(empties):
+        for axis in range(3):
+            write_fcurve_samples(empty, "location", axis, frames, locations[:, t, axis])
+        created.append(empty.animation_data.action)
+        yield t + 1, len(empties)
+    return True
+
+@instrumented
+def bake_bundle_animation(scene, clip, tracking_object, empties, track_indices):
+    """
+    Transforms the given bundles for all reconstructed frames in one batch and bakes them to F-curves.
+    Returns False when there is no solve to bake from.
+    """
+    return run_job(iter_bake_bundle_animation(scene, clip, tracking_object, empties, track_indices))
+
+def markers_to_empty(scene, collection, clip, tracking_object, output='EMPTIES', animated=False, selected_only=True):
+    """Context-free 3D Markers to Empty. Returns the created objects (parent first for Empties)."""
+    world_matrix = get_tracking_world_matrix(scene, clip, tracking_object)
+    if output == 'POINT_CLOUD':
+        point_obj = create_track_point_cloud(collection, tracking_object, world_matrix, selected_only)
+        return [point_obj] if point_obj else []
+    parent_empty, empties, indices = create_track_empties(collection, tracking_object, world_matrix, selected_only, clip)
+    if not parent_empty:
+        return []
+    if animated:
+        bake_bundle_animation(scene, clip, tracking_object, empties, indices)
+    return [parent_empty] + empties
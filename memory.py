@@ -0,0 +1,142 @@
+# Clip_Tools - Memory
+#
+# Estimates the memory held by plate images, frees the buffers of plates that are not on screen and
+# purges the unused images, materials and node groups Clip Tools generated for clips that no longer exist.
+
+import bpy
+from collections import namedtuple
+from .instrumentation import instrumented
+
+PlateMemory = namedtuple("PlateMemory", ("image", "clip_name", "ram", "vram", "shown"))
+
+def get_clip_names_by_path():
+    """Absolute footage path -> clip name, for plate images loaded before they were tagged."""
+    return {bpy.path.abspath(clip.filepath): clip.name for clip in bpy.data.movieclips if clip.filepath}
+
+def get_image_clip_name(image, clip_names_by_path):
+    """Name of the clip a plate, proxy or ST-map image was generated for, or None for other images."""
+    clip_name = image.get("clip_tools_clip")
+    if clip_name is None and image.filepath:
+        clip_name = clip_names_by_path.get(bpy.path.abspath(image.filepath))
+    return clip_name
+
+def estimate_image_memory(image):
+    """
+    (RAM, VRAM) bytes of an image's loaded frame: the pixel buffer and, when uploaded, its GPU texture
+    (RGBA8 or half float). Images without a loaded buffer count as zero; their size is not read,
+    since reading it would load them.
+    """
+    if not image.has_data:
+        return 0, 0
+    width, height = image.size
+    ram = width * height * image.channels * (4 if image.is_float else 1)
+    vram = width * height * (8 if image.is_float else 4) if getattr(image, "bindcode", 0) else 0
+    return ram, vram
+
+def get_shown_images(scene):
+    """Images used by the materials of the scene's visible objects."""
+    shown = set()
+    for obj in scene.objects:
+        if not obj.visible_get():
+            continue
+        for slot in obj.material_slots:
+            material = slot.material
+            if material and material.node_tree:
+                shown.update(node.image for node in material.node_tree.nodes if getattr(node, "image", None))
+    return shown
+
+@instrumented
+def collect_plate_memory(scene):
+    """PlateMemory of every image Clip Tools loaded or generated for a clip, largest first."""
+    clip_names_by_path = get_clip_names_by_path()
+    shown = get_shown_images(scene)
+    plates = []
+    for image in bpy.data.images:
+        clip_name = get_image_clip_name(image, clip_names_by_path)
+        if clip_name is not None:
+            ram, vram = estimate_image_memory(image)
+            plates.append(PlateMemory(image, clip_name, ram, vram, image in shown))
+    plates.sort(key=lambda plate: plate.ram + plate.vram, reverse=True)
+    return plates
+
+def free_hidden_plates(plates):
+    """Frees the CPU buffers and GPU textures of loaded plates that are not shown. Returns (count, bytes freed)."""
+    freed = [plate for plate in plates if not plate.shown and plate.ram + plate.vram]
+    for plate in freed:
+        plate.image.buffers_free()
+    return len(freed), sum(plate.ram + plate.vram for plate in freed)
+
+def find_generated_data(clip_names):
+    """Materials and images Clip Tools generated for the given clip names."""
+    materials = [m for m in bpy.data.materials if m.get("clip_tools_clip") in clip_names]
+    images = [i for i in bpy.data.images if i.get("clip_tools_clip") in clip_names]
+    return materials, images
+
+@instrumented
+def purge_generated_data(clip_names=None):
+    """
+    Removes the unused plate, proxy and ST-map images and image plane / projection materials generated for the
+    given clip names (default: every clip that no longer exists), then the projection node groups left unused.
+    Data still used by an object, another material or a fake user stays. Returns the number of removed images,
+    materials and node groups.
+    """
+    if clip_names is None:
+        existing = {clip.name for clip in bpy.data.movieclips}
+        tagged = {id_data.get("clip_tools_clip") for id_data in list(bpy.data.materials) + list(bpy.data.images)}
+        clip_names = {name for name in tagged if name is not None and name not in existing}
+    materials, images = find_generated_data(set(clip_names))
+    materials = [material for material in materials if material.users == 0]
+    if materials:
+        bpy.data.batch_remove(materials)
+    # User counts of the images drop with the removed materials. Plates of duplicated clips and shared ST-maps
+    # that another clip's material still uses are handed over to that clip.
+    images = [image for image in images if image.users == 0]
+    for material in bpy.data.materials:
+        if not material.node_tree or "clip_tools_clip" not in material:
+            continue
+        for node in material.node_tree.nodes:
+            image = getattr(node, "image", None)
+            if image in images:
+                images.remove(image)
+                image["clip_tools_clip"] = material["clip_tools_clip"]
+    if images:
+        bpy.data.batch_remove(images)
+    used_groups = {getattr(node, "node_tree", None) for material in bpy.data.materials if material.node_tree for node in material.node_tree.nodes}
+    node_groups = [g for g in bpy.data.node_groups if "clip_tools_version" in g and g not in used_groups and not g.use_fake_user]
+    if node_groups:
+        bpy.data.batch_remove(node_groups)
+    return {"images": len(images), "materials": len(materials), "node_groups": len(node_groups)}
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+def write_memory_text(plates):
+    """Writes the per-clip and per-plate memory tables to a Text data-block and returns it."""
+    text = bpy.data.texts.get("Clip Tools Memory") or bpy.data.texts.new("Clip Tools Memory")
+    per_clip = {}
+    for plate in plates:
+        ram, vram = per_clip.get(plate.clip_name, (0, 0))
+        per_clip[plate.clip_name] = (ram + plate.ram, vram + plate.vram)
+    existing = {clip.name for clip in bpy.data.movieclips}
+    lines = ["# Estimated memory of the loaded frame of each plate", "", "clip,ram,vram,exists"]
+    lines += [f"{name},{format_bytes(ram)},{format_bytes(vram)},{name in existing}" for name, (ram, vram) in per_clip.items()]
+    lines += ["", "image,clip,ram,vram,shown"]
+    lines += [f"{p.image.name},{p.clip_name},{format_bytes(p.ram)},{format_bytes(p.vram)},{p.shown}" for p in plates]
+    text.clear(); text.write("\n".join(lines) + "\n")
+    return text
+
+def reclaim_memory(scene, free_hidden=True, purge=True, write_text=True):
+    """Runs the memory report, frees hidden plates and purges data of deleted clips. Returns a summary dictionary."""
+    purged = purge_generated_data() if purge else {"images": 0, "materials": 0, "node_groups": 0}
+    plates = collect_plate_memory(scene)
+    summary = {"plates": len(plates), "ram": sum(p.ram for p in plates), "vram": sum(p.vram for p in plates),
+               "freed": 0, "freed_bytes": 0, "purged": purged, "text": None}
+    if write_text:
+        summary["text"] = write_memory_text(plates)
+    if free_hidden:
+        summary["freed"], summary["freed_bytes"] = free_hidden_plates(plates)
+    return summary
@@ -0,0 +1,104 @@
+# Clip_Tools - Modal Jobs
+#
+# Runs long operations as generator "jobs" in time slices from a modal timer, so Blender stays
+# responsive, shows progress and can cancel with Esc. A job yields (done, total) after each unit of
+# work, returns its result, and appends every data-block it creates to a list used for rollback.
+
+import bpy
+import time
+from contextlib import nullcontext
+from .instrumentation import OperatorTiming
+
+def run_job(job):
+    """Runs a job generator to the end without a UI and returns its result."""
+    while True:
+        try:
+            next(job)
+        except StopIteration as stop:
+            return stop.value
+
+class ModalJobMixin:
+    """
+    Operator mixin: call start_job(context, job) from invoke. The operator provides job_finished(context, result),
+    which returns the operator result. Data-blocks in self.created are removed when the job is cancelled or fails.
+    When instrumentation is on, the run is timed from start_job to finish or cancel like a scripted execute().
+    """
+    time_slice = 0.05
+    job_title = "Working"
+
+    def start_job(self, context, job):
+        self.created = []; self.job = job(self.created) if callable(job) else job
+        self.done, self.total = 0, 0
+        self.timing = OperatorTiming.begin(self.bl_idname)
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(0.01, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def end_job(self, context, result=None):
+        """Removes the timer and progress display and closes the timing record. Returns the operator result."""
+        result = result or {'CANCELLED'}
+        wm = context.window_manager
+        if self.timer is not None:
+            wm.event_timer_remove(self.timer)
+            self.timer = None
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        if self.timing is not None:
+            self.timing.finish(context, result)
+            self.timing = None
+        return result
+
+    def rollback(self):
+        """Removes the data-blocks the job created, skipping any that were deleted meanwhile."""
+        alive = []
+        for id_data in self.created:
+            try:
+                id_data.name
+            except ReferenceError:
+                continue
+            alive.append(id_data)
+        if alive:
+            bpy.data.batch_remove(alive)
+        self.created.clear()
+
+    def cancel(self, context):
+        """Stops the job and undoes its partial results. Blender also calls this when the window closes mid-job."""
+        try:
+            self.job.close()
+        finally:
+            self.rollback(); self.end_job(context)
+
+    def step_job(self, context):
+        """Runs the job for one time slice. Returns the operator result once the job is done, otherwise None."""
+        deadline = time.perf_counter() + self.time_slice
+        try:
+            # At least one step per tick, so slow steps still make progress.
+            self.done, self.total = next(self.job)
+            while time.perf_counter() < deadline:
+                self.done, self.total = next(self.job)
+        except StopIteration as stop:
+            return self.job_finished(context, stop.value)
+        return None
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.cancel(context)
+            self.report({'WARNING'}, f"{self.job_title} cancelled; partial results removed.")
+            return {'CANCELLED'}
+        # Events carry no reference to their timer; this operator's modal handler only runs its own job.
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        try:
+            with self.timing.resumed() if self.timing else nullcontext():
+                result = self.step_job(context)
+        except Exception as e:
+            self.cancel(context)
+            self.report({'ERROR'}, f"{self.job_title} failed: {e}")
+            return {'CANCELLED'}
+        if result is not None:
+            return self.end_job(context, result)
+        context.window_manager.progress_update(100 * self.done // max(self.total, 1))
+        context.workspace.status_text_set(f"{self.job_title}: {self.done} / {self.total}   (Esc to cancel)")
+        return {'RUNNING_MODAL'}
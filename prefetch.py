@@ -0,0 +1,129 @@
+# Clip_Tools - Prefetch
+#
+# Read-ahead of upcoming plate frames into the OS page cache during playback. The frame change
+# handler computes file paths on the main thread; pool threads only read files, never bpy.
+
+import bpy
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+READ_CHUNK = 1 << 20
+
+# Counters shown in the Scene Setup panel. A hit is a displayed frame whose file was read ahead in time.
+prefetch_stats = {"hits": 0, "misses": 0, "prefetched": 0, "errors": 0}
+
+# File path -> True once read, False while queued, None if unreadable. Oldest entries are dropped.
+_prefetched = OrderedDict()
+_lock = threading.Lock()
+_executor = None
+_executor_workers = 0
+_last_frame = None
+_path_templates = {}
+
+def warm_file(path):
+    """Reads a file once so the OS page cache holds it when Blender loads the frame (runs on a pool thread)."""
+    try:
+        with open(path, "rb", buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            buffer = bytearray(READ_CHUNK)
+            while f.readinto(buffer):
+                pass
+        state = True
+    except OSError:
+        state = None
+    with _lock:
+        if path in _prefetched:
+            _prefetched[path] = state
+        prefetch_stats["prefetched" if state else "errors"] += 1
+
+def get_path_template(filepath):
+    """Returns a function mapping a file frame number to the sequence file path, or None."""
+    template = _path_templates.get(filepath)
+    if template is None:
+        directory, filename = os.path.split(bpy.path.abspath(filepath))
+        match = re.match(r'^(.*?)(\d+)(\.\w+)$', filename)
+        if not match:
+            return None
+        head, digits, tail = match.groups()
+        template = _path_templates[filepath] = lambda number: os.path.join(directory, f"{head}{number:0{len(digits)}}{tail}")
+    return template
+
+def image_user_file_number(image_user, scene_frame):
+    """File frame number an Image User shows at a scene frame, following Blender's cyclic/clamped mapping."""
+    length = image_user.frame_duration
+    frame = scene_frame - image_user.frame_start + 1
+    if image_user.use_cyclic and length > 0:
+        frame %= length
+        if frame == 0:
+            frame = length
+    else:
+        frame = min(max(frame, 0), length)
+    return frame + image_user.frame_offset
+
+def get_prefetch_sources():
+    """(path template, image user) of every image sequence on an image plane or projection material."""
+    sources = {}
+    for material in bpy.data.materials:
+        if "clip_tools_clip" not in material or not material.node_tree:
+            continue
+        tex_image_node = material.node_tree.nodes.get("Image Texture")
+        image = tex_image_node.image if tex_image_node else None
+        if image and image.source == 'SEQUENCE' and image.filepath_raw not in sources:
+            template = get_path_template(image.filepath_raw)
+            if template:
+                sources[image.filepath_raw] = (template, tex_image_node.image_user)
+    return list(sources.values())
+
+def _get_executor(workers):
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor, _executor_workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clip_tools_prefetch"), workers
+    return _executor
+
+def prefetch_frames(scene, window, workers):
+    """Counts a hit or miss for the current frame and queues the next `window` frames in the playback direction."""
+    global _last_frame
+    frame = scene.frame_current
+    step = -1 if _last_frame is not None and frame < _last_frame else 1
+    _last_frame = frame
+    sources = get_prefetch_sources()
+    if not sources:
+        return
+    current = [template(image_user_file_number(image_user, frame)) for template, image_user in sources]
+    upcoming = [template(image_user_file_number(image_user, frame + k * step))
+                for k in range(1, window + 1) for template, image_user in sources]
+    with _lock:
+        for path in current:
+            prefetch_stats["hits" if _prefetched.get(path) else "misses"] += 1
+        queued = [path for path in dict.fromkeys(upcoming) if path not in _prefetched]
+        for path in queued:
+            _prefetched[path] = False
+        while len(_prefetched) > max(256, 4 * window * len(sources)):
+            _prefetched.popitem(last=False)
+    executor = _get_executor(workers)
+    for path in queued:
+        executor.submit(warm_file, path)
+
+def reset_prefetch():
+    """Forgets prefetched files and zeroes the counters."""
+    global _last_frame
+    with _lock:
+        _prefetched.clear()
+        for key in prefetch_stats:
+            prefetch_stats[key] = 0
+    _path_templates.clear()
+    _last_frame = None
+
+def shutdown_prefetch():
+    """Stops the pool threads; queued reads are dropped."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    reset_prefetch()
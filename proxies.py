@@ -0,0 +1,161 @@
+# Clip_Tools - Proxies
+#
+# Half and quarter resolution copies of image sequences for viewport playback. Frames are scaled by
+# a pool of background Blender processes, each running this file as a script:
+#   blender -b --factory-startup --python proxies.py -- --scale-frames job.json
+
+import bpy
+import os
+import re
+import sys
+import json
+import tempfile
+import functools
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PROXY_LEVELS = {'HALF': 2, 'QUARTER': 4}
+
+# Clip name -> status of its running or last proxy build, shown in the Scene Setup panel.
+proxy_builds = {}
+
+def get_proxy_directory(clip, level):
+    """Cache folder holding the clip's proxy frames at 'HALF' or 'QUARTER' resolution."""
+    from .instrumentation import get_addon_preferences
+    prefs = get_addon_preferences()
+    root = (prefs.proxy_directory if prefs else "") or "//clip_tools_proxies"
+    if root.startswith("//") and not bpy.data.filepath:
+        root = os.path.join(tempfile.gettempdir(), "clip_tools_proxies")
+    return os.path.join(bpy.path.abspath(root), bpy.path.clean_name(clip.name), level.lower())
+
+def get_proxy_filepath(clip, level):
+    """Proxy counterpart of the clip's filepath; proxy frames keep the original file names and numbers."""
+    return os.path.join(get_proxy_directory(clip, level), os.path.basename(bpy.path.abspath(clip.filepath)))
+
+def list_sequence_frames(clip):
+    """Absolute paths of every existing file in the clip's image sequence, or [] for movies."""
+    from .footage import index_image_sequence
+    filepath = bpy.path.abspath(clip.filepath)
+    info = index_image_sequence(filepath) if clip.source == 'SEQUENCE' else None
+    if info is None:
+        return []
+    directory, filename = os.path.split(filepath)
+    head, _, tail = re.match(r'^(.*?)(\d+)(\.\w+)$', filename).groups()
+    missing = set(info.missing)
+    return [os.path.join(directory, f"{head}{frame:0{info.padding}}{tail}") for frame in range(info.first, info.last + 1) if frame not in missing]
+
+def _is_stale(source, proxy):
+    try:
+        return os.stat(proxy).st_mtime < os.stat(source).st_mtime
+    except OSError:
+        return True
+
+def _run_worker(blender, tasks, status):
+    """Scales one chunk of frames in a background Blender process (runs on a pool thread, no bpy access)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump(tasks, f)
+    try:
+        process = subprocess.run([blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--", "--scale-frames", f.name],
+                                 capture_output=True, text=True)
+    finally:
+        os.remove(f.name)
+    with status["lock"]:
+        status["done"] += len(tasks)
+        if process.returncode != 0:
+            status["failed"] += len(tasks); status["errors"].append(process.stderr[-1000:])
+
+def _poll_build(clip_name):
+    """Timer callback: finishes a build once all workers returned and switches materials to the new proxies."""
+    status = proxy_builds.get(clip_name)
+    if status is None:
+        return None
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'CLIP_EDITOR':
+                area.tag_redraw()
+    if not all(future.done() for future in status["futures"]):
+        return 0.5
+    status["running"] = False
+    print(f"Clip Tools: proxies for '{clip_name}' built, {status['failed']} of {status['total']} frame(s) failed.")
+    for error in status["errors"][:3]:
+        print(error)
+    apply_proxy_resolution(bpy.context.scene.clip_tools_proxy_resolution)
+    return None
+
+def start_proxy_build(clip, levels=('HALF', 'QUARTER'), workers=0, rebuild=False):
+    """
+    Starts building the clip's proxy frames in background Blender processes and returns the build status.
+    Frames whose proxies are newer than the source are skipped unless rebuild is set.
+    """
+    frames = list_sequence_frames(clip)
+    if not frames:
+        raise ValueError(f"Clip '{clip.name}' is not an image sequence; only sequences can get proxies.")
+    directories = {level: get_proxy_directory(clip, level) for level in levels}
+    for directory in directories.values():
+        os.makedirs(directory, exist_ok=True)
+    tasks = []
+    for source in frames:
+        # Half resolution first, so each worker scales the quarter proxy down from the half one.
+        outputs = [[os.path.join(directories[level], os.path.basename(source)), PROXY_LEVELS[level]]
+                   for level in sorted(levels, key=PROXY_LEVELS.get)]
+        outputs = [output for output in outputs if rebuild or _is_stale(source, output[0])]
+        if outputs:
+            tasks.append([source, outputs])
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    status = {"total": len(tasks), "done": 0, "failed": 0, "errors": [], "running": bool(tasks), "futures": [], "lock": threading.Lock()}
+    proxy_builds[clip.name] = status
+    if not tasks:
+        return status
+    # Several small chunks per worker keep the processes busy and the progress display moving.
+    chunk_size = max(1, min(50, len(tasks) // (workers * 4)))
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    # Threads only wait on their Blender subprocess; none of them touches bpy.
+    executor = ThreadPoolExecutor(max_workers=workers)
+    status["futures"] = [executor.submit(_run_worker, bpy.app.binary_path, chunk, status) for chunk in chunks]
+    executor.shutdown(wait=False)
+    bpy.app.timers.register(functools.partial(_poll_build, clip.name), first_interval=0.5)
+    return status
+
+def get_resolution_image(clip, level):
+    """The clip's Image at 'FULL', 'HALF' or 'QUARTER' resolution, falling back to full when the proxy is missing."""
+    from .footage import load_clip_image
+    if level in PROXY_LEVELS:
+        proxy_path = get_proxy_filepath(clip, level)
+        if os.path.exists(proxy_path):
+            image = bpy.data.images.load(proxy_path, check_existing=True)
+            if image.source == 'FILE' and clip.source == 'SEQUENCE':
+                image.source = 'SEQUENCE'
+            image["clip_tools_clip"] = clip.name
+            return image
+    return load_clip_image(clip)
+
+def apply_proxy_resolution(level):
+    """Points every image plane and projection material at the given resolution. Returns the number switched."""
+    from .footage import configure_image_user
+    switched = 0
+    for material in bpy.data.materials:
+        clip = bpy.data.movieclips.get(material.get("clip_tools_clip", ""))
+        tex_image_node = material.node_tree.nodes.get("Image Texture") if clip and material.node_tree else None
+        if not tex_image_node:
+            continue
+        image = get_resolution_image(clip, level)
+        if tex_image_node.image != image:
+            tex_image_node.image = image
+            configure_image_user(tex_image_node.image_user, image, clip)
+            switched += 1
+    return switched
+
+def scale_frames(tasks):
+    """Worker side: loads each source frame once and saves it scaled down by every requested factor."""
+    for source, outputs in tasks:
+        image = bpy.data.images.load(source)
+        width, height = image.size
+        for path, factor in outputs:
+            image.scale(max(1, width // factor), max(1, height // factor))
+            image.save(filepath=path)
+        bpy.data.images.remove(image)
+
+if __name__ == "__main__" and "--scale-frames" in sys.argv:
+    with open(sys.argv[sys.argv.index("--scale-frames") + 1], encoding="utf-8") as f:
+        scale_frames(json.load(f))
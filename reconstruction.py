@@ -0,0 +1,134 @@
+# Clip_Tools - Reconstruction
+#
+# Bulk access to tracks, bundles and solved camera paths.
+
+import numpy as np
+from collections import namedtuple
+from mathutils import Matrix
+from .instrumentation import instrumented
+
+def read_track_bundles(tracks):
+    """Reads every track's bundle, has_bundle and select flags in bulk as NumPy arrays."""
+    count = len(tracks)
+    bundles = np.empty(count * 3, dtype=np.float32); tracks.foreach_get("bundle", bundles)
+    has_bundle = np.empty(count, dtype=bool); tracks.foreach_get("has_bundle", has_bundle)
+    selected = np.empty(count, dtype=bool); tracks.foreach_get("select", selected)
+    return bundles.reshape(count, 3), has_bundle, selected
+
+def transform_points(matrix, points):
+    """Applies a 4x4 matrix to an (N, 3) array of points."""
+    m = np.array(matrix, dtype=np.float64)
+    return points @ m[:3, :3].T + m[:3, 3]
+
+CameraPath = namedtuple("CameraPath", ("signature", "first_frame", "matrices", "valid"))
+
+# (clip name, tracking object name) -> CameraPath
+_camera_paths = {}
+
+def _reconstruction_signature(clip, reconstruction):
+    """
+    Changes whenever the solve or the clip's start frame changes, read in O(1): a re-solve changes the
+    camera count, frames or average error; rescaling the solution moves the sampled cameras.
+    """
+    cameras = reconstruction.cameras
+    count = len(cameras)
+    samples = tuple((cameras[i].frame, tuple(v for row in cameras[i].matrix for v in row)) for i in sorted({0, count // 2, count - 1}) if count)
+    return (clip.frame_start, reconstruction.is_valid, count, reconstruction.average_error, samples)
+
+@instrumented
+def get_camera_path(clip, tracking_object):
+    """
+    Returns the cached CameraPath of a tracking object's solve: (L, 4, 4) camera matrices covering the scene
+    frames first_frame .. first_frame + L - 1 and a mask of the solved ones. Rebuilt after a re-solve or a
+    change of the clip's start frame.
+    """
+    reconstruction = tracking_object.reconstruction
+    signature = _reconstruction_signature(clip, reconstruction)
+    key = (clip.name, tracking_object.name)
+    path = _camera_paths.get(key)
+    if path is None or path.signature != signature:
+        cameras = reconstruction.cameras
+        count = len(cameras)
+        frames = np.empty(count, dtype=np.int32); cameras.foreach_get("frame", frames)
+        matrices = np.empty(count * 16, dtype=np.float32); cameras.foreach_get("matrix", matrices)
+        scene_frames = frames.astype(np.int64) + clip.frame_start - 1
+        first_frame = int(scene_frames.min()) if count else clip.frame_start
+        length = int(scene_frames.max()) - first_frame + 1 if count else 0
+        table = np.tile(np.identity(4), (length, 1, 1))
+        valid = np.zeros(length, dtype=bool)
+        # RNA stores matrices column-major; transpose to mathutils' row-major layout.
+        table[scene_frames - first_frame] = matrices.reshape(count, 4, 4).transpose(0, 2, 1)
+        valid[scene_frames - first_frame] = True
+        table.flags.writeable = False; valid.flags.writeable = False
+        path = _camera_paths[key] = CameraPath(signature, first_frame, table, valid)
+    return path
+
+def clear_camera_path_cache():
+    """Drops all cached camera paths."""
+    _camera_paths.clear()
+
+def camera_path_lookup(path, frames):
+    """(F, 4, 4) camera matrices and an (F,) solved mask at the given scene frames; identity where unsolved."""
+    indices = np.asarray(frames, dtype=np.int64) - path.first_frame
+    inside = (indices >= 0) & (indices < len(path.valid))
+    indices = np.where(inside, indices, 0)
+    if not len(path.valid):
+        return np.tile(np.identity(4), (len(indices), 1, 1)), np.zeros(len(indices), dtype=bool)
+    return path.matrices[indices], inside & path.valid[indices]
+
+def reconstructed_camera_matrices(clip, tracking_object):
+    """A tracking object's whole solve from the cached camera path: scene frame numbers and (F, 4, 4) camera matrices."""
+    path = get_camera_path(clip, tracking_object)
+    solved = np.flatnonzero(path.valid)
+    return (solved + path.first_frame).astype(np.int32), path.matrices[solved]
+
+def get_reconstructed_matrix(clip, tracking_object, frame):
+    """
+    The camera matrix at one scene frame as a Matrix, or None. Solved frames come from the cached camera path;
+    others fall back to matrix_from_frame, which interpolates between solved frames.
+    """
+    path = get_camera_path(clip, tracking_object)
+    matrices, valid = camera_path_lookup(path, (frame,))
+    if valid[0]:
+        return Matrix(matrices[0].tolist())
+    return tracking_object.reconstruction.cameras.matrix_from_frame(frame=frame - clip.frame_start + 1)
+
+def camera_world_matrices(scene, camera, frames):
+    """
+    Returns (F, 4, 4) world matrices of the camera at the given scene frames without stepping the scene.
+    A Camera Solver constraint is followed through its clip's camera reconstruction; otherwise the
+    camera is treated as static. Frames without a solved camera are looked up like the constraint does,
+    interpolated between the neighbouring solved cameras, and stay static when there is none.
+    """
+    world = np.array(camera.matrix_world, dtype=np.float64)
+    static = np.broadcast_to(world, (len(frames), 4, 4))
+    solver = next((c for c in camera.constraints if c.type == 'CAMERA_SOLVER' and c.enabled), None)
+    clip = (scene.active_clip if solver.use_active_clip else solver.clip) if solver else None
+    camera_track = next((o for o in clip.tracking.objects if o.is_camera), None) if clip else None
+    if not camera_track or not camera_track.reconstruction.is_valid:
+        return static
+    current = get_reconstructed_matrix(clip, camera_track, scene.frame_current)
+    if current is None:
+        return static
+    # The constraint result is base @ reconstruction, so recover base from the evaluated current frame.
+    base = world @ np.linalg.inv(np.array(current, dtype=np.float64))
+    frames = np.asarray(frames, dtype=np.int64)
+    recon, valid = camera_path_lookup(get_camera_path(clip, camera_track), frames)
+    result = base @ recon
+    # Gaps in the solve are rare; those frames take the per-frame interpolated lookup.
+    for f in np.flatnonzero(~valid).tolist():
+        matrix = get_reconstructed_matrix(clip, camera_track, int(frames[f]))
+        result[f] = world if matrix is None else base @ np.array(matrix, dtype=np.float64)
+    return result
+
+def get_tracking_world_matrix(scene, clip, tracking_object):
+    """Returns the matrix that maps a tracking object's bundles to world space at the current frame."""
+    camera = scene.camera
+    world_matrix = Matrix.Identity(4)
+    if camera:
+        reconstruction = tracking_object.reconstruction
+        if reconstruction and reconstruction.is_valid:
+            reconstructed_matrix = get_reconstructed_matrix(clip, tracking_object, scene.frame_current)
+            if reconstructed_matrix:
+                world_matrix = camera.matrix_world @ reconstructed_matrix.inverted()
+    return world_matrix
@@ -0,0 +1,56 @@
+# Clip_Tools - Batch Scene Setup
+#
+# Solvers, image planes and projection materials for many clip -> camera pairs in one pass,
+# without a Clip Editor.
+
+import bpy
+from .instrumentation import instrumented, timed_phase
+from .solvers import setup_camera_solver, setup_object_solver
+from .image_plane import create_image_plane
+from .projection import setup_projection
+
+SETUP_STEPS = ("camera_solver", "object_solvers", "image_plane", "projection")
+
+def guess_camera_for_clip(scene, clip):
+    """The camera already solving the clip, else a camera named like the clip, else the scene camera."""
+    cameras = [o for o in scene.objects if o.type == 'CAMERA']
+    for camera in cameras:
+        if any(c.type == 'CAMERA_SOLVER' and not c.use_active_clip and c.clip == clip for c in camera.constraints):
+            return camera
+    stem = clip.name.rsplit(".", 1)[0].lower()
+    return next((c for c in cameras if c.name.lower() in stem or stem in c.name.lower()), scene.camera)
+
+def has_image_plane(camera):
+    return any(child.name.startswith("ImagePlane_") for child in camera.children)
+
+@instrumented
+def batch_scene_setup(scene, collection, mappings, steps=SETUP_STEPS, depth=10.0, mode='BAKED'):
+    """
+    Runs the setup steps for every (clip, camera, projection objects) mapping in one pass.
+    Solvers and image planes that already exist are kept. Returns counts and per-pair errors.
+    """
+    summary = {"camera_solvers": 0, "object_solvers": 0, "image_planes": 0, "materials": 0, "errors": []}
+    # Existing Object Solvers, looked up once instead of rescanning every object per tracking object.
+    existing_object_solvers = {(c.clip, c.object) for obj in bpy.data.objects for c in obj.constraints
+                               if c.type == 'OBJECT_SOLVER' and not c.use_active_clip and c.clip}
+    for clip, camera, projection_objects in mappings:
+        try:
+            if "camera_solver" in steps and setup_camera_solver(camera, clip) is not None:
+                summary["camera_solvers"] += 1
+            if "object_solvers" in steps:
+                with timed_phase("object_solvers"):
+                    for tracking_object in clip.tracking.objects:
+                        if tracking_object.is_camera or (clip, tracking_object.name) in existing_object_solvers:
+                            continue
+                        setup_object_solver(collection, camera, clip, tracking_object)
+                        existing_object_solvers.add((clip, tracking_object.name))
+                        summary["object_solvers"] += 1
+            if "image_plane" in steps and not has_image_plane(camera):
+                create_image_plane(scene, collection, camera, clip, depth, mode)
+                summary["image_planes"] += 1
+            meshes = [o for o in projection_objects if o.type == 'MESH']
+            if "projection" in steps and meshes:
+                summary["materials"] += len(setup_projection(camera, clip, meshes, shared=True))
+        except Exception as e:
+            summary["errors"].append(f"{clip.name} -> {camera.name}: {e}")
+    return summary
@@ -0,0 +1,121 @@
+# Clip_Tools - Solve Analysis
+#
+# Reprojection errors of a solved tracking object for every track and frame, computed on whole arrays.
+
+import bpy
+import numpy as np
+from .instrumentation import instrumented
+from .export import read_track_markers
+from .lens import get_intrinsics, distort_normalized, normalized_to_pixels
+from .reconstruction import read_track_bundles, reconstructed_camera_matrices
+
+# Upper bound of tracks x frames projected at once, keeping the temporary arrays small.
+BLOCK_SIZE = 1 << 21
+
+def read_marker_grid(tracks, track_indices, frames):
+    """(N, F, 2) normalized marker positions of the given tracks at the given clip frames; NaN where disabled or missing."""
+    grid = np.full((len(track_indices), len(frames), 2), np.nan, dtype=np.float32)
+    if not len(frames):
+        return grid
+    for row, index in enumerate(track_indices):
+        data = read_track_markers(tracks[int(index)])
+        columns = np.minimum(np.searchsorted(frames, data["frame"]), len(frames) - 1)
+        valid = data["enabled"] & (frames[columns] == data["frame"])
+        grid[row, columns[valid]] = data["co"][valid]
+    return grid
+
+def project_bundles(bundles, camera_matrices, intrinsics):
+    """Projects (N, 3) bundles through (F, 4, 4) reconstructed camera matrices to (F, N, 2) pixels; NaN behind the camera."""
+    inverse = np.linalg.inv(camera_matrices)
+    points = np.einsum('fij,nj->fni', inverse[:, :3, :3], bundles) + inverse[:, None, :3, 3]
+    depth = -points[..., 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x, y = distort_normalized(points[..., 0] / depth, points[..., 1] / depth, intrinsics)
+    projected = np.stack(normalized_to_pixels(x, y, intrinsics), axis=-1)
+    projected[depth <= 0] = np.nan
+    return projected
+
+@instrumented
+def compute_reprojection_errors(clip, tracking_object):
+    """
+    Returns (track indices, clip frames, errors): errors is an (N, F) array of pixel distances between each
+    bundle's reprojection and its marker, NaN where the track has no enabled marker. Tracks without a bundle are left out.
+    """
+    tracks = tracking_object.tracks
+    bundles, has_bundle, _ = read_track_bundles(tracks)
+    track_indices = np.flatnonzero(has_bundle)
+    scene_frames, matrices = reconstructed_camera_matrices(clip, tracking_object)
+    frames = scene_frames - (clip.frame_start - 1)
+    intrinsics = get_intrinsics(clip)
+    # Like the solver, compare the bundle with the marker position plus the track's offset.
+    offsets = np.empty(len(tracks) * 2, dtype=np.float32); tracks.foreach_get("offset", offsets)
+    markers = read_marker_grid(tracks, track_indices, frames) + offsets.reshape(-1, 2)[track_indices, None, :]
+    markers *= np.array((intrinsics.width, intrinsics.height), dtype=np.float32)
+    points = bundles[track_indices].astype(np.float64)
+    errors = np.full((len(track_indices), len(frames)), np.nan, dtype=np.float32)
+    block = max(1, BLOCK_SIZE // max(1, len(track_indices)))
+    for start in range(0, len(frames), block):
+        stop = start + block
+        delta = project_bundles(points, matrices[start:stop], intrinsics).transpose(1, 0, 2) - markers[:, start:stop]
+        errors[:, start:stop] = np.hypot(delta[..., 0], delta[..., 1])
+    return track_indices, frames, errors
+
+def summarize_errors(errors, axis):
+    """Mean error, max error and marker count along an axis of the error array, NaN where there are no markers."""
+    valid = ~np.isnan(errors)
+    counts = valid.sum(axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(valid, errors, 0.0).sum(axis=axis) / counts
+    maximum = np.where(valid, errors, -np.inf).max(axis=axis, initial=-np.inf)
+    maximum[counts == 0] = np.nan
+    return mean, maximum, counts
+
+def select_tracks_above(tracks, track_indices, track_error, threshold):
+    """Selects exactly the tracks whose mean error is above the threshold."""
+    select = np.zeros(len(tracks), dtype=bool)
+    select[track_indices] = track_error > threshold
+    tracks.foreach_set("select", select)
+    return int(select.sum())
+
+def color_tracks_by_error(tracks, track_indices, track_error, threshold):
+    """Gives analyzed tracks a custom color from green (no error) over yellow to red (at or above twice the threshold)."""
+    count = len(tracks)
+    use_color = np.empty(count, dtype=bool); tracks.foreach_get("use_custom_color", use_color)
+    colors = np.empty(count * 3, dtype=np.float32); tracks.foreach_get("color", colors)
+    colors = colors.reshape(count, 3)
+    t = np.nan_to_num(track_error / (2.0 * threshold), nan=0.0).clip(0.0, 1.0)
+    colors[track_indices] = np.stack(((2.0 * t).clip(0.0, 1.0), (2.0 - 2.0 * t).clip(0.0, 1.0), np.zeros_like(t)), axis=1)
+    use_color[track_indices] = True
+    tracks.foreach_set("color", colors.ravel()); tracks.foreach_set("use_custom_color", use_color)
+
+def write_error_text(clip, tracking_object, track_names, track_table, scene_frames, frame_table):
+    """Writes the per-track (worst first) and per-frame error tables to a Text data-block and returns it."""
+    name = f"Solve Errors | {clip.name} | {tracking_object.name}"
+    text = bpy.data.texts.get(name) or bpy.data.texts.new(name)
+    lines = [f"# Reprojection error (px) of '{tracking_object.name}' in clip '{clip.name}'", "", "track,mean,max,markers"]
+    mean, maximum, counts = track_table
+    for i in np.argsort(-np.nan_to_num(mean, nan=-1.0)):
+        lines.append(f"{track_names[i]},{mean[i]:.4f},{maximum[i]:.4f},{counts[i]}")
+    lines += ["", "frame,mean,max,markers"]
+    mean, maximum, counts = frame_table
+    lines += [f"{frame},{m:.4f},{x:.4f},{c}" for frame, m, x, c in zip(scene_frames.tolist(), mean, maximum, counts)]
+    text.clear(); text.write("\n".join(lines) + "\n")
+    return text
+
+def analyze_solve(clip, tracking_object, threshold=1.0, select_outliers=True, color_tracks=False, write_text=True):
+    """Runs the reprojection analysis and applies the requested outputs. Returns a summary dictionary."""
+    tracks = tracking_object.tracks
+    track_indices, frames, errors = compute_reprojection_errors(clip, tracking_object)
+    track_table = summarize_errors(errors, axis=1)
+    frame_table = summarize_errors(errors, axis=0)
+    valid = ~np.isnan(errors)
+    summary = {"tracks": len(track_indices), "frames": len(frames), "mean": float(errors[valid].mean()) if valid.any() else float("nan"),
+               "outliers": int((track_table[0] > threshold).sum()), "text": None}
+    if select_outliers:
+        select_tracks_above(tracks, track_indices, track_table[0], threshold)
+    if color_tracks:
+        color_tracks_by_error(tracks, track_indices, track_table[0], threshold)
+    if write_text:
+        names = [tracks[int(i)].name for i in track_indices]
+        summary["text"] = write_error_text(clip, tracking_object, names, track_table, frames + clip.frame_start - 1, frame_table)
+    return summary
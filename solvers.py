@@ -0,0 +1,30 @@
+# Clip_Tools - Solvers
+#
+# Camera Solver and Object Solver constraint setup.
+
+import bpy
+
+def setup_camera_solver(camera, clip):
+    """Adds a Camera Solver constraint bound to the clip. Returns None if the camera already has one."""
+    if any(c.type == 'CAMERA_SOLVER' for c in camera.constraints):
+        return None
+    constraint = camera.constraints.new(type='CAMERA_SOLVER')
+    constraint.clip = clip
+    constraint.use_active_clip = False
+    return constraint
+
+def setup_object_solver(collection, camera, clip, tracking_object):
+    """Creates an 'ObjectTrack' Empty with an Object Solver constraint for a tracking object."""
+    new_empty = bpy.data.objects.new("ObjectTrack", None)
+    try:
+        new_empty.empty_display_type = 'PLAIN_AXES'
+        collection.objects.link(new_empty)
+        constraint = new_empty.constraints.new(type='OBJECT_SOLVER')
+        constraint.clip = clip
+        constraint.use_active_clip = False
+        constraint.object = tracking_object.name
+        constraint.camera = camera
+    except Exception:
+        bpy.data.objects.remove(new_empty, do_unlink=True)
+        raise
+    return new_empty
@@ -0,0 +1,34 @@
+# Clip_Tools - Test fixtures
+#
+# The tests run in plain Python against the benchmarks' bpy/mathutils stand-in and synthetic clips.
+
+import os
+import sys
+import pytest
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ADDON_DIR, "benchmarks"), ADDON_DIR]
+
+import fake_bpy
+fake_bpy.install()
+
+
+@pytest.fixture
+def bpy():
+    """The stand-in bpy module with fresh data and a fresh scene."""
+    fake_bpy.reset()
+    return fake_bpy.bpy_module
+
+
+@pytest.fixture
+def addon(bpy):
+    import batch
+    return batch.load_addon()
+
+
+@pytest.fixture
+def clip_editor(bpy):
+    """Puts a solved synthetic clip into a Clip Editor context and returns the context."""
+    from synthetic import make_clip
+    bpy.context.space_data = fake_bpy.Struct(type='CLIP_EDITOR', clip=make_clip(tracks=40, frames=30))
+    return bpy.context
@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+import batch
+
+
+def write_manifest(tmp_path, shots):
+    path = tmp_path / "shots.json"
+    path.write_text(json.dumps({"shots": shots}), encoding="utf-8")
+    return str(path)
+
+
+def test_manifest_rejects_shots_writing_the_same_result_file(tmp_path):
+    with pytest.raises(ValueError, match="already used"):
+        batch.load_manifest(write_manifest(tmp_path, ["sq010/shot.blend", "sq020/shot.blend"]))
+    with pytest.raises(ValueError, match="already used"):
+        batch.load_manifest(write_manifest(tmp_path, ["sq010/Summary.blend"]))
+    manifest = batch.load_manifest(write_manifest(tmp_path, [{"blend": "sq010/shot.blend", "name": "sq010"}, "sq020/shot.blend"]))
+    assert [shot["name"] for shot in manifest["shots"]] == ["sq010", "shot"]
@@ -0,0 +1,47 @@
+import numpy as np
+from fake_bpy import Struct
+
+
+class Markers(list):
+    """MovieTrackingMarkers with the calls the trim uses; counts delete_frame calls."""
+    deletes = 0
+    def foreach_get(self, attr, buf): buf[:] = np.ravel([getattr(m, attr) for m in self])
+    def foreach_set(self, attr, seq):
+        for m, value in zip(self, np.reshape(seq, (len(self), -1))):
+            setattr(m, attr, value[0] if len(value) == 1 else tuple(value))
+    def find_frame(self, frame): return next((m for m in self if m.frame == frame), None)
+    def delete_frame(self, frame):
+        self.deletes += 1
+        self.remove(self.find_frame(frame))
+
+
+def marker(frame):
+    return Struct(frame=frame, co=(frame / 100, 0.5), pattern_corners=((-0.1, -0.1), (0.1, -0.1), (0.1, 0.1), (-0.1, 0.1)),
+                  search_min=(-0.2, -0.2), search_max=(0.2, 0.2), mute=False, is_keyed=frame % 2 == 0)
+
+
+def tracking_object(*frame_lists):
+    tracks = [Struct(markers=Markers(marker(f) for f in frames)) for frames in frame_lists]
+    return Struct(tracks=tracks)
+
+
+def test_trim_deletes_markers_outside_range_in_clip_frames(bpy, addon):
+    from clip_tools_batch.clips import trim_tracks_to_frame_range
+    obj = tracking_object(range(1, 21), range(15, 19))
+    clip = Struct(frame_start=1001)
+    # Scene frames 1005-1010 are clip frames 5-10.
+    assert trim_tracks_to_frame_range(bpy.context.scene, clip, obj, 1005, 1010) == 14 + 3
+    assert [m.frame for m in obj.tracks[0].markers] == list(range(5, 11))
+    # A track entirely outside the range keeps its nearest marker, muted.
+    assert [(m.frame, m.mute) for m in obj.tracks[1].markers] == [(15, True)]
+    assert bpy.context.scene.frame_current == 1
+
+
+def test_trim_moves_kept_marker_data_and_skips_covered_tracks(bpy, addon):
+    from clip_tools_batch.clips import trim_tracks_to_frame_range
+    obj = tracking_object(range(1, 21), range(6, 9))
+    assert trim_tracks_to_frame_range(bpy.context.scene, Struct(frame_start=1), obj, 5, 10) == 14
+    markers = obj.tracks[0].markers
+    assert [(m.frame, m.co[0], m.is_keyed) for m in markers] == [(f, np.float32(f / 100), f % 2 == 0) for f in range(5, 11)]
+    assert markers.deletes == 14
+    assert obj.tracks[1].markers.deletes == 0 and [m.frame for m in obj.tracks[1].markers] == [6, 7, 8]
@@ -0,0 +1,28 @@
+import csv
+import numpy as np
+from synthetic import make_clip
+
+
+def test_csv_export_keeps_percent_in_names(bpy, addon, tmp_path):
+    clip = make_clip(tracks=3, frames=5)
+    tracking_object = clip.tracking.objects.active
+    tracks = tracking_object.tracks
+    tracks.names[1] = '50% grey, "card"'
+    path = tmp_path / "markers.csv"
+    rows = addon.export_markers(str(path), clip, 'CSV')
+    with open(path, newline="", encoding="utf-8") as f:
+        table = list(csv.reader(f))
+    assert len(table) == rows + 1
+    assert {row[1] for row in table[1:]} == set(tracks.names)
+    assert all(len(row) == len(table[0]) for row in table)
+
+
+def test_csv_rows_match_printf_formatting(addon):
+    from clip_tools_batch.export import format_csv_rows
+    rng = np.random.default_rng(1)
+    values = np.concatenate((rng.uniform(-3.0, 3.0, 200), [0.0, -0.0, 1e-9, -1e-9, 0.9999996, 12345.5, -0.5]))
+    frames = np.arange(-3, len(values) - 3)
+    text = format_csv_rows([b"a,", b"", b"c,"], [5, 2, len(values) - 7], [(frames, 0), (values, 6), (values > 0, 0)]).decode()
+    prefixes = ["a,"] * 5 + [""] * 2 + ["c,"] * (len(values) - 7)
+    expected = "".join(f"{p}{f:d},{v:.6f},{int(v > 0)}\n" for p, f, v in zip(prefixes, frames, values)).replace("-0.000000", "0.000000")
+    assert text == expected
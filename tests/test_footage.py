@@ -0,0 +1,15 @@
+import pytest
+from fake_bpy import Struct
+
+
+@pytest.mark.parametrize("frame_offset, frame_start, image_offset, duration", [(0, 1, 1000, 10), (3, 1, 1003, 7), (-2, 3, 1000, 10)])
+def test_image_user_applies_clip_frame_offset(bpy, addon, tmp_path, frame_offset, frame_start, image_offset, duration):
+    from clip_tools_batch.footage import configure_image_user
+    for frame in range(1001, 1011):
+        (tmp_path / f"plate.{frame}.exr").touch()
+    addon.clear_sequence_index_cache()
+    image = Struct(source='SEQUENCE', filepath_raw=str(tmp_path / "plate.1001.exr"))
+    clip = Struct(frame_start=1, frame_offset=frame_offset, frame_duration=10)
+    img_user = Struct()
+    configure_image_user(img_user, image, clip)
+    assert (img_user.frame_start, img_user.frame_offset, img_user.frame_duration) == (frame_start, image_offset, duration)
@@ -0,0 +1,21 @@
+import sys
+
+
+def test_unknown_attribute_imports_nothing(addon):
+    loaded = set(sys.modules)
+    assert not hasattr(addon, "bl_info")
+    assert not hasattr(addon, "no_such_function")
+    assert not {name for name in sys.modules if name.startswith(addon.__name__ + ".")} - loaded
+
+
+def test_attribute_imports_only_its_module(addon):
+    sys.modules.pop(f"{addon.__name__}.solvers", None)
+    sys.modules.pop(f"{addon.__name__}.memory", None)
+    assert callable(addon.setup_camera_solver)
+    assert f"{addon.__name__}.solvers" in sys.modules
+    assert f"{addon.__name__}.memory" not in sys.modules
+
+
+def test_every_lazy_attribute_resolves(addon):
+    for name in addon._LAZY_ATTRIBUTES:
+        assert callable(getattr(addon, name)), name
@@ -0,0 +1,14 @@
+import numpy as np
+
+
+def test_nuke_distortion_inverts_nukes_undistort_formula(bpy, addon):
+    from clip_tools_batch.lens import Intrinsics, distort_normalized
+    intrinsics = Intrinsics(1920, 1080, 1500.0, (960.0, 540.0), 1.0, 'NUKE', (-0.05, 0.01))
+    x, y = np.meshgrid(np.linspace(-0.7, 0.7, 15), np.linspace(-0.4, 0.4, 9))
+    xd, yd = distort_normalized(x, y, intrinsics)
+    # Nuke undistorts in pixels from the center over half the longest side: ru = rd / (1 + k1 rd^2 + k2 rd^4).
+    scale = 1500.0 / 960.0
+    rd2 = (xd * scale) ** 2 + (yd * scale) ** 2
+    radial = 1.0 - 0.05 * rd2 + 0.01 * rd2 * rd2
+    np.testing.assert_allclose((xd / radial, yd / radial), (x, y), atol=1e-12)
+    assert np.all(np.abs(xd[:, 0]) < 0.7)
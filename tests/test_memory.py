@@ -0,0 +1,16 @@
+def test_purge_keeps_generated_data_that_is_still_used(bpy, addon):
+    from clip_tools_batch.memory import purge_generated_data
+    on_object, unused = bpy.data.materials.new("Plane | Shot"), bpy.data.materials.new("Projection | Shot")
+    plate, st_map = bpy.data.images.new("Shot", 4, 4), bpy.data.images.new("ST-Map", 4, 4)
+    for id_data in (on_object, unused, plate, st_map):
+        id_data["clip_tools_clip"] = "Shot"
+    unused.users = plate.users = 0
+    counts = purge_generated_data({"Shot"})
+    assert counts["materials"] == 1 and counts["images"] == 1
+    assert on_object.name in bpy.data.materials and unused.name not in bpy.data.materials
+    assert st_map.name in bpy.data.images and plate.name not in bpy.data.images
+
+
+def test_delete_clip_keeps_generated_data_by_default(bpy, addon):
+    # The stand-in keeps a property's default as its annotation.
+    assert addon.CLIP_OT_delete_active_movieclip.__annotations__["purge_generated"] is False
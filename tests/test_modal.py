@@ -0,0 +1,68 @@
+from fake_bpy import Struct
+
+
+def run_modal(operator, context):
+    result = {'RUNNING_MODAL'}
+    while result == {'RUNNING_MODAL'}:
+        result = operator.modal(context, Struct(type='TIMER'))
+    return result
+
+
+def new_markers_operator(addon, **options):
+    operator = addon.CLIP_OT_3d_markers_to_empty()
+    operator.output, operator.animated, operator.sync, operator.missing = 'EMPTIES', False, False, 'FLAG'
+    operator.time_slice = 0.0
+    for key, value in options.items():
+        setattr(operator, key, value)
+    return operator
+
+
+def test_markers_to_empty_runs_on_timer_events(bpy, addon, clip_editor):
+    operator = new_markers_operator(addon)
+    assert operator.invoke(clip_editor, Struct(type='LEFTMOUSE')) == {'RUNNING_MODAL'}
+    assert operator.modal(clip_editor, Struct(type='MOUSEMOVE')) == {'PASS_THROUGH'}
+    assert run_modal(operator, clip_editor) == {'FINISHED'}
+    assert [o for o in bpy.data.objects if o.parent is not None]
+    assert clip_editor.window_manager.timers == [] and clip_editor.window_manager.progress is None
+
+
+def test_esc_rolls_back_and_removes_timer(bpy, addon, clip_editor):
+    operator = new_markers_operator(addon)
+    operator.invoke(clip_editor, Struct(type='LEFTMOUSE'))
+    assert operator.modal(clip_editor, Struct(type='TIMER')) == {'RUNNING_MODAL'}
+    assert operator.modal(clip_editor, Struct(type='ESC')) == {'CANCELLED'}
+    assert list(bpy.data.objects) == []
+    assert clip_editor.window_manager.timers == []
+
+
+def test_failing_job_rolls_back(bpy, addon):
+    from clip_tools_batch.modal import ModalJobMixin
+
+    class FailingJob(ModalJobMixin, bpy.types.Operator):
+        bl_idname = "test.failing_job"
+        time_slice = 0.0
+
+        def job(self, created):
+            created.append(bpy.data.objects.new("Partial", None))
+            yield 1, 2
+            raise RuntimeError("broken")
+
+    operator = FailingJob()
+    operator.start_job(bpy.context, operator.job)
+    assert operator.modal(bpy.context, Struct(type='TIMER')) == {'RUNNING_MODAL'}
+    assert operator.modal(bpy.context, Struct(type='TIMER')) == {'CANCELLED'}
+    assert list(bpy.data.objects) == [] and bpy.context.window_manager.timers == []
+    assert operator.reports[-1][1].endswith("broken")
+
+
+def test_modal_run_is_timed(bpy, addon, clip_editor, monkeypatch, tmp_path):
+    from clip_tools_batch.instrumentation import timing_records
+    monkeypatch.setenv("CLIP_TOOLS_INSTRUMENT", "1")
+    monkeypatch.setenv("CLIP_TOOLS_TIMING_LOG", str(tmp_path / "timing.log"))
+    operator = new_markers_operator(addon)
+    operator.invoke(clip_editor, Struct(type='LEFTMOUSE'))
+    run_modal(operator, clip_editor)
+    record = timing_records[0]
+    assert record["operator"] == operator.bl_idname and record["result"] == ['FINISHED']
+    assert record["created"]["objects"] == len(bpy.data.objects) > 0
+    assert (tmp_path / "timing.log").read_text().count("\n") == 1
@@ -0,0 +1,24 @@
+import importlib
+from fake_bpy import Struct, UILayout
+
+
+def draw(panel_class, context):
+    panel = panel_class()
+    panel.layout = UILayout()
+    panel.draw(context)
+    return panel.layout.items
+
+
+def test_scene_setup_panel_draws(bpy, addon, clip_editor):
+    items = draw(addon.CLIP_PT_tools_scenesetup, clip_editor)
+    assert ("operator", addon.CLIP_OT_build_proxies.bl_idname) in items
+    assert ("operator", addon.CLIP_OT_reclaim_memory.bl_idname) in items
+
+
+def test_scene_setup_panel_shows_prefetch_counters(bpy, addon, clip_editor):
+    prefetch = importlib.import_module(f"{addon.__name__}.prefetch")
+    prefetch.prefetch_stats.update(hits=3, misses=1)
+    clip_editor.preferences.addons[addon.__name__] = Struct(preferences=Struct(prefetch_enabled=True))
+    items = draw(addon.CLIP_PT_tools_scenesetup, clip_editor)
+    assert ("label", "Prefetch: 3 hits, 1 misses") in items
+    assert ("operator", addon.CLIP_OT_reset_prefetch_stats.bl_idname) in items
@@ -0,0 +1,11 @@
+from fake_bpy import Struct
+
+
+def test_batch_projection_without_selected_meshes_cancels(bpy, addon, clip_editor):
+    clip_editor.active_object = Struct(name="Ground", type='MESH')
+    clip_editor.selected_objects = []
+    clip_editor.scene.camera = Struct(name="Camera")
+    operator = addon.PROJECTION_OT_setup_shader()
+    operator.batch = True
+    assert operator.execute(clip_editor) == {'CANCELLED'}
+    assert operator.reports == [({'WARNING'}, "No mesh objects selected")]
@@ -0,0 +1,27 @@
+import numpy as np
+from fake_bpy import Struct
+from synthetic import make_clip, SyntheticCameras
+
+
+def solver_camera(clip):
+    solver = Struct(type='CAMERA_SOLVER', enabled=True, use_active_clip=False, clip=clip)
+    return Struct(matrix_world=np.identity(4), constraints=[solver])
+
+
+def test_camera_world_matrices_only_use_exact_solved_frames(bpy, addon):
+    clip = make_clip(tracks=10, frames=30)
+    cameras = clip.tracking.objects.active.reconstruction.cameras
+    matrices = cameras._matrices
+    solved = np.r_[1:10, 13:31]
+    clip.tracking.objects.active.reconstruction.cameras = SyntheticCameras(solved, matrices[solved - 1])
+    addon.clear_camera_path_cache()
+    scene = bpy.context.scene
+    scene.frame_current = 1
+    base = np.linalg.inv(matrices[0])
+    from clip_tools_batch.reconstruction import camera_world_matrices
+    world = camera_world_matrices(scene, solver_camera(clip), [5, 11, 13, 40])
+    np.testing.assert_allclose(world[0], base @ matrices[4], atol=1e-5)
+    np.testing.assert_allclose(world[2], base @ matrices[12], atol=1e-5)
+    # The stand-in's matrix_from_frame does not interpolate, so gaps and frames past the solve stay static.
+    np.testing.assert_allclose(world[1], np.identity(4))
+    np.testing.assert_allclose(world[3], np.identity(4))
@@ -0,0 +1,49 @@
+import importlib
+import pytest
+
+
+@pytest.fixture
+def plate_levels(addon, bpy, monkeypatch):
+    """Records the plate resolutions the handlers switch to; the scene's viewport resolution is Half."""
+    proxies = importlib.import_module(f"{addon.__name__}.proxies")
+    levels = []
+    monkeypatch.setattr(proxies, "apply_proxy_resolution", levels.append)
+    bpy.context.scene.clip_tools_proxy_resolution = 'HALF'
+    addon._rendering_scenes.clear()
+    return levels
+
+
+def test_cancelled_render_restores_viewport_plates(addon, bpy, plate_levels):
+    scene = bpy.context.scene
+    addon.use_full_resolution_for_render(scene)
+    addon.restore_viewport_resolution(scene)
+    assert plate_levels == ['FULL', 'HALF']
+
+
+def test_saving_mid_render_writes_viewport_plates(addon, bpy, plate_levels):
+    scene = bpy.context.scene
+    addon.use_full_resolution_for_render(scene)
+    addon.save_viewport_resolution()
+    addon.resume_render_resolution()
+    addon.restore_viewport_resolution(scene)
+    addon.save_viewport_resolution()
+    addon.resume_render_resolution()
+    assert plate_levels == ['FULL', 'HALF', 'FULL', 'HALF']
+
+
+def test_loading_restores_viewport_plates(addon, bpy, plate_levels):
+    addon.use_full_resolution_for_render(bpy.context.scene)
+    addon.load_viewport_resolution()
+    addon.save_viewport_resolution()
+    assert plate_levels == ['FULL', 'HALF']
+
+
+def test_handlers_are_registered(addon, bpy):
+    handlers = bpy.app.handlers
+    addon.register()
+    try:
+        assert addon.restore_viewport_resolution in handlers.render_cancel
+        assert addon.save_viewport_resolution in handlers.save_pre and addon.load_viewport_resolution in handlers.load_post
+    finally:
+        addon.unregister()
+    assert addon.save_viewport_resolution not in handlers.save_pre
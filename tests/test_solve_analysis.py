@@ -0,0 +1,15 @@
+import numpy as np
+from synthetic import make_clip
+
+
+def test_reprojection_errors_include_track_offset(bpy, addon):
+    from clip_tools_batch.solve_analysis import compute_reprojection_errors
+    clip = make_clip(tracks=20, frames=10)
+    tracking_object = clip.tracking.objects.active
+    _, _, before = compute_reprojection_errors(clip, tracking_object)
+    # Markers placed 0.01 left of the feature with a matching offset reproject exactly as before.
+    tracks = tracking_object.tracks
+    tracks._marker_co[:5] -= np.array((0.01, 0.0), dtype=np.float32)
+    tracks.offset[:5] = (0.01, 0.0)
+    _, _, after = compute_reprojection_errors(clip, tracking_object)
+    np.testing.assert_allclose(after, before, atol=1e-3, equal_nan=True)
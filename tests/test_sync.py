@@ -0,0 +1,44 @@
+import numpy as np
+from fake_bpy import Struct
+from test_modal import new_markers_operator, run_modal
+
+
+def prepare_resync(bpy, addon, context):
+    """Creates Empties for the selected tracks, then changes the solve: moved bundles, new and lost tracks."""
+    scene, clip = context.scene, context.space_data.clip
+    tracking_object = clip.tracking.objects.active
+    world_matrix = addon.get_tracking_world_matrix(scene, clip, tracking_object)
+    parent = addon.sync_track_empties(scene, scene.collection, clip, tracking_object, world_matrix)["parent"]
+    tracks = tracking_object.tracks
+    tracks.bundles += 0.5
+    tracks.has_bundle[np.flatnonzero(tracks.has_bundle & tracks.select)[:3]] = False
+    tracks.select[:] = True
+    return parent
+
+
+def snapshot(bpy, parent):
+    return ({obj.name for obj in bpy.data.objects}, {o.name: tuple(o.location) for o in parent.children},
+            dict(parent["clip_tools_tracks"]), [o.name for o in parent.children if "clip_tools_missing" in o])
+
+
+def test_cancelled_sync_leaves_existing_empties_untouched(bpy, addon, clip_editor):
+    parent = prepare_resync(bpy, addon, clip_editor)
+    before = snapshot(bpy, parent)
+    operator = new_markers_operator(addon, sync=True, missing='REMOVE')
+    operator.invoke(clip_editor, Struct(type='LEFTMOUSE'))
+    for _ in range(5):
+        assert operator.modal(clip_editor, Struct(type='TIMER')) == {'RUNNING_MODAL'}
+    assert operator.modal(clip_editor, Struct(type='ESC')) == {'CANCELLED'}
+    assert snapshot(bpy, parent) == before
+
+
+def test_finished_sync_applies_staged_changes(bpy, addon, clip_editor):
+    parent = prepare_resync(bpy, addon, clip_editor)
+    mapped = len(parent["clip_tools_tracks"])
+    operator = new_markers_operator(addon, sync=True, missing='FLAG')
+    operator.invoke(clip_editor, Struct(type='LEFTMOUSE'))
+    assert run_modal(operator, clip_editor) == {'FINISHED'}
+    tracks = clip_editor.space_data.clip.tracking.objects.active.tracks
+    assert len(parent["clip_tools_tracks"]) == int(tracks.has_bundle.sum()) + 3
+    assert len([o for o in parent.children if "clip_tools_missing" in o]) == 3
+    assert "updated" in operator.reports[-1][1] and mapped < len(parent["clip_tools_tracks"])